@@ -0,0 +1,26 @@
+"""
+Production entry point: python -m app
+
+Runs uvicorn with WEB_CONCURRENCY worker processes and without the file
+watcher. For development with auto-reload, run python app/main.py instead.
+"""
+
+import uvicorn
+
+from app.config import DEBUG, HOST, KEEP_ALIVE_TIMEOUT, PORT, WEB_CONCURRENCY
+
+
+def main() -> None:
+    uvicorn.run(
+        "app.main:app",
+        host=HOST,
+        port=PORT,
+        workers=max(1, WEB_CONCURRENCY),
+        timeout_keep_alive=KEEP_ALIVE_TIMEOUT,
+        log_level="debug" if DEBUG else "info",
+        reload=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,149 @@ import os
 APP_NAME = "Subtitles Extractor"
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
 
+# Production server (python -m app)
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Worker processes; each has its own caches, executor and in-memory rate limits
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+# Seconds an idle keep-alive connection stays open
+KEEP_ALIVE_TIMEOUT = int(os.getenv("KEEP_ALIVE_TIMEOUT", "5"))
+# Loading of yt-dlp, googletrans and the shared clients at start-up:
+# "background" (after the worker starts serving), "startup" (before) or "off" (on first use)
+WARMUP = os.getenv("WARMUP", "background").lower()
+
 # Static and templates directory
 STATIC_DIR = "static"
 TEMPLATES_DIR = "templates"
+
+# Video metadata cache (shared by every SubtitleService entry point)
+METADATA_CACHE_SIZE = int(os.getenv("METADATA_CACHE_SIZE", "512"))
+METADATA_CACHE_TTL = float(os.getenv("METADATA_CACHE_TTL", "900"))
+METADATA_CACHE_NEGATIVE_TTL = float(os.getenv("METADATA_CACHE_NEGATIVE_TTL", "60"))
+
+# Blocking work (yt-dlp, subtitle downloads) runs on a bounded thread pool
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "16"))
+DISCONNECT_POLL_INTERVAL = float(os.getenv("DISCONNECT_POLL_INTERVAL", "0.5"))
+
+# Per-stage timeouts in seconds
+METADATA_TIMEOUT = float(os.getenv("METADATA_TIMEOUT", "30"))
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "60"))
+SUBTITLE_DOWNLOAD_TIMEOUT = float(os.getenv("SUBTITLE_DOWNLOAD_TIMEOUT", "20"))
+YTDLP_SOCKET_TIMEOUT = float(os.getenv("YTDLP_SOCKET_TIMEOUT", "15"))
+
+# Persistent subtitle store
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///subtitles.db")
+SUBTITLE_STORE_ENABLED = os.getenv("SUBTITLE_STORE_ENABLED", "True").lower() in ("true", "1", "t")
+# Seconds before a stored track is downloaded again (0 keeps tracks forever)
+SUBTITLE_STORE_MAX_AGE = float(os.getenv("SUBTITLE_STORE_MAX_AGE", "604800"))
+
+# Bytes read from the subtitle response per parser step
+SUBTITLE_CHUNK_SIZE = int(os.getenv("SUBTITLE_CHUNK_SIZE", "65536"))
+
+# Shared HTTP client for subtitle downloads
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "8"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_BACKOFF_JITTER = float(os.getenv("HTTP_BACKOFF_JITTER", "0.5"))
+# Longest wait before a retry, in seconds; longer Retry-After values are cut to this
+HTTP_RETRY_MAX_WAIT = float(os.getenv("HTTP_RETRY_MAX_WAIT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+
+# Batch extraction
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+BATCH_MAX_VIDEOS = int(os.getenv("BATCH_MAX_VIDEOS", "500"))
+
+# Multi-language bundles (/process_bundle/)
+BUNDLE_CONCURRENCY = int(os.getenv("BUNDLE_CONCURRENCY", "8"))
+BUNDLE_MAX_LANGUAGES = int(os.getenv("BUNDLE_MAX_LANGUAGES", "50"))
+
+# Streamed transcripts (/stream_subtitles/)
+STREAM_CUES_PER_EVENT = int(os.getenv("STREAM_CUES_PER_EVENT", "200"))
+# Seconds without events before a keep-alive comment is sent
+STREAM_HEARTBEAT_INTERVAL = float(os.getenv("STREAM_HEARTBEAT_INTERVAL", "15"))
+
+# Admission control
+# Per-client token buckets, as "path=requests/seconds" pairs: each client may send
+# that many requests to the path at once and regains them over the given seconds
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() in ("true", "1", "t")
+RATE_LIMITS = os.getenv(
+    "RATE_LIMITS",
+    "/check_languages/=30/60,/tracks/=30/60,/process_video/=20/60,/subtitles/=60/60,"
+    "/download_subtitles/=20/60,/stream_subtitles/=20/60,/vocabulary/=20/60,/process_bundle/=5/60,"
+    "/process_batch/=2/60",
+)
+# "memory" keeps buckets per process; "database" shares them through DATABASE_URL (SQLite only)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+# Identify clients by the first X-Forwarded-For address (only behind a trusted proxy)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "False").lower() in ("true", "1", "t")
+# Concurrent yt-dlp extractions and caption downloads per process (0 for no cap),
+# how many may wait for a free slot, and for how long. Waiting extractions hold a
+# blocking pool thread, so the cap plus the queue should not exceed BLOCKING_POOL_SIZE
+EXTRACTION_MAX_CONCURRENCY = int(os.getenv("EXTRACTION_MAX_CONCURRENCY", "8"))
+EXTRACTION_QUEUE_SIZE = int(os.getenv("EXTRACTION_QUEUE_SIZE", "8"))
+EXTRACTION_QUEUE_TIMEOUT = float(os.getenv("EXTRACTION_QUEUE_TIMEOUT", "10"))
+
+# Background jobs
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+# Longest a GET /jobs/{id}?wait=... long-poll may block, in seconds
+JOB_MAX_WAIT = float(os.getenv("JOB_MAX_WAIT", "30"))
+
+# Transcript translation (texts longer than the translator limit)
+TRANSCRIPT_PARALLELISM = int(os.getenv("TRANSCRIPT_PARALLELISM", "4"))
+TRANSCRIPT_RATE_LIMIT = float(os.getenv("TRANSCRIPT_RATE_LIMIT", "5"))
+TRANSCRIPT_CHUNK_RETRIES = int(os.getenv("TRANSCRIPT_CHUNK_RETRIES", "2"))
+TRANSCRIPT_TRANSLATION_TIMEOUT = float(os.getenv("TRANSCRIPT_TRANSLATION_TIMEOUT", "300"))
+
+# Word translation (/translate_words/): local dictionaries, one directory per
+# language pair, built with scripts/build_dictionary.py
+DICTIONARIES_DIR = os.getenv("DICTIONARIES_DIR", "app/data/dictionaries")
+TRANSLATE_WORDS_MAX = int(os.getenv("TRANSLATE_WORDS_MAX", "1000"))
+
+# Translation cache
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "10000"))
+TRANSLATION_CACHE_PERSISTENT = os.getenv("TRANSLATION_CACHE_PERSISTENT", "False").lower() in ("true", "1", "t")
+
+# Shared translator client
+TRANSLATOR_SERVICE_URLS = [
+    url.strip()
+    for url in os.getenv("TRANSLATOR_SERVICE_URLS", "translate.google.com").split(",")
+    if url.strip()
+]
+TRANSLATOR_TIMEOUT = float(os.getenv("TRANSLATOR_TIMEOUT", "10"))
+TRANSLATOR_MAX_CONCURRENCY = int(os.getenv("TRANSLATOR_MAX_CONCURRENCY", "8"))
+TRANSLATION_TIMEOUT = float(os.getenv("TRANSLATION_TIMEOUT", "30"))
+
+# Full-text search over extracted transcripts (needs SQLite with FTS5)
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "True").lower() in ("true", "1", "t")
+# Consecutive cues are indexed together in passages of about this many milliseconds
+SEARCH_PASSAGE_MS = int(os.getenv("SEARCH_PASSAGE_MS", "30000"))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", "50"))
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "10"))
+
+# Vocabulary analysis (/vocabulary/): word frequency tables, one directory per
+# language, built with scripts/build_word_frequencies.py
+VOCABULARY_TABLES_DIR = os.getenv("VOCABULARY_TABLES_DIR", "app/data/word_frequencies")
+VOCABULARY_MAX_WORDS = int(os.getenv("VOCABULARY_MAX_WORDS", "500"))
+
+# Transcript normalization stages, applied in order to every caption segment
+# (see app/services/normalization.py for the available stages). Stored tracks
+# cleaned with other stages are downloaded again
+NORMALIZATION_STAGES = [
+    name.strip()
+    for name in os.getenv("NORMALIZATION_STAGES", "credits,whitespace").split(",")
+    if name.strip()
+]
+
+# HTTP caching of subtitle responses
+# Seconds clients and shared caches may reuse a transcript response (0 makes them revalidate)
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "3600"))
+
+# Response compression (brotli needs the optional brotli package; gzip is always available)
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
@@ -0,0 +1,73 @@
+"""
+HTTP caching helpers for transcript responses.
+
+ETags are derived from the content hash of the subtitle track, and for timed
+formats from the cue timings too, so they stay the same across workers and
+restarts for as long as the content of the response does. They are weak because the compression middleware may change the bytes on
+the wire without changing the content.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.config import HTTP_CACHE_MAX_AGE
+from app.services.cue_track import CueTrack
+
+
+def make_etag(content_hash: str, representation: str, cues: Optional[CueTrack] = None) -> str:
+    """
+    Build the ETag of one representation (JSON, plain text, ...) of a track.
+
+    Args:
+        content_hash: Content hash of the subtitle track, which covers only its text
+        representation: Name of the response format
+        cues: Timed cues, for representations that include their timings
+
+    Returns:
+        str: A weak ETag header value
+    """
+    digest = content_hash[:32]
+    if cues is not None:
+        digest = hashlib.sha256(digest.encode("ascii") + cues.to_bytes()).hexdigest()[:32]
+    return f'W/"{digest}-{representation}"'
+
+
+def cache_headers(etag: str) -> dict:
+    """Headers that let clients and shared caches reuse a transcript response"""
+    if HTTP_CACHE_MAX_AGE > 0:
+        cache_control = f"public, max-age={HTTP_CACHE_MAX_AGE}"
+    else:
+        cache_control = "no-cache"
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether a GET request's If-None-Match already names this ETag.
+
+    Other methods are never answered with 304.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" name the same content
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """A 304 response for a matching conditional request"""
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
@@ -9,10 +11,43 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/.."))
 
 
+from app.middleware import (
+    CompressionMiddleware,
+    RateLimitMiddleware,
+    ServerTimingMiddleware,
+    too_many_requests,
+)
 from app.routes import router
-from app.config import STATIC_DIR, TEMPLATES_DIR
+from app.config import RATE_LIMIT_ENABLED, STATIC_DIR, TEMPLATES_DIR, WARMUP
+from app.services.admission import UpstreamBusyError
+from app.services.executor import (
+    StageTimeoutError,
+    ClientDisconnectedError,
+    shutdown_executor,
+)
+from app.services.http_client import http_client
+from app.services.job_service import job_manager
+from app.services.translation_service import close_shared_translation_service
+from app.services.warmup import start_warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_warm_up(WARMUP)
+    job_manager.start()
+    yield
+    job_manager.stop()
+    shutdown_executor()
+    http_client.close()
+    close_shared_translation_service()
 
-app = FastAPI(title="Subtitles Extractor")
+
+app = FastAPI(title="Subtitles Extractor", lifespan=lifespan)
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+# The middleware added last runs outermost, so the Server-Timing total includes compression
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ServerTimingMiddleware)
 
 # Configure static files and templates
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
@@ -22,6 +57,22 @@ templates = Jinja2Templates(directory=TEMPLATES_DIR)
 app.include_router(router)
 
 
+@app.exception_handler(StageTimeoutError)
+async def stage_timeout_handler(request: Request, exc: StageTimeoutError):
+    return JSONResponse(status_code=504, content={"error": str(exc)})
+
+
+@app.exception_handler(UpstreamBusyError)
+async def upstream_busy_handler(request: Request, exc: UpstreamBusyError):
+    return too_many_requests(str(exc), exc.retry_after)
+
+
+@app.exception_handler(ClientDisconnectedError)
+async def client_disconnected_handler(request: Request, exc: ClientDisconnectedError):
+    # Nobody is listening any more; 499 mirrors nginx's "client closed request"
+    return Response(status_code=499)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -30,4 +81,5 @@ async def home(request: Request):
 if __name__ == "__main__":
     import uvicorn
 
+    # Development server with auto-reload; production runs python -m app
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,255 @@
+import math
+import time
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from app.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MINIMUM_SIZE,
+    RATE_LIMIT_TRUST_FORWARDED,
+)
+from app.services.admission import (
+    OVERLOAD_REJECTED,
+    RATE_LIMITED,
+    client_id,
+    extraction_gate,
+    rate_limiter,
+)
+from app.services.metrics import (
+    HTTP_REQUEST_SECONDS,
+    end_request_trace,
+    server_timing_header,
+    start_request_trace,
+)
+
+try:
+    import brotli
+except ImportError:  # Listed in requirements.txt; without it responses are only gzip-compressed
+    brotli = None
+
+# Content types worth compressing; event streams are left alone so each event is sent at once
+COMPRESSIBLE_TYPES = (
+    "text/plain",
+    "text/html",
+    "text/css",
+    "text/vtt",
+    "application/json",
+    "application/javascript",
+    "text/javascript",
+    "application/x-subrip",
+)
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header with the request's per-stage breakdown and
+    records the request duration by route.
+
+    A plain ASGI middleware, so streamed responses pass through untouched; the
+    header holds the stages finished by the time the response starts.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        token, timings = start_request_trace()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing_header(timings, time.perf_counter() - started)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request_trace(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, scope["method"], route, str(status)
+            )
+
+
+def _accepted_encodings(header: str) -> dict:
+    """Parse an Accept-Encoding header into {coding: q}"""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate_encoding(header: str) -> str:
+    """
+    Pick the response coding for an Accept-Encoding header.
+
+    Returns:
+        str: "br", "gzip", or "" to send the body as it is
+    """
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return ""
+
+
+class _Compressor:
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+            self.compress = self._compressor.process
+            self.finish = self._compressor.finish
+        else:
+            # wbits=31 writes the gzip header and trailer
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self.compress = self._compressor.compress
+            self.finish = self._compressor.flush
+
+
+class CompressionMiddleware:
+    """
+    Compresses text and JSON responses with brotli or gzip, as negotiated
+    through Accept-Encoding.
+
+    Bodies below the minimum size and responses that already have a
+    Content-Encoding are sent unchanged. Streamed bodies are compressed
+    chunk by chunk. Compressible responses always get Vary: Accept-Encoding,
+    so shared caches keep the encodings apart.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type not in COMPRESSIBLE_TYPES or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if not coding or message["status"] in (204, 304):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Held back until the first body chunk shows whether compression pays off
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                headers = MutableHeaders(scope=start_message)
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(coding)
+                headers["Content-Encoding"] = coding
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                if not more_body:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+                start_message = None
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def too_many_requests(message: str, retry_after: float) -> JSONResponse:
+    """A 429 response telling the client when to retry"""
+    return JSONResponse(
+        status_code=429,
+        content={"error": message},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Answers 429 with Retry-After before a request reaches its route when the
+    client is over its rate limit for the path, or when the extraction queue
+    is already full. Only paths with a rate limit rule are checked.
+    """
+
+    def __init__(self, app, limiter=rate_limiter, gate=extraction_gate, trust_forwarded=RATE_LIMIT_TRUST_FORWARDED):
+        self.app = app
+        self.limiter = limiter
+        self.gate = gate
+        self.trust_forwarded = trust_forwarded
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not self.limiter.applies(path):
+            await self.app(scope, receive, send)
+            return
+
+        client = client_id(scope, self.trust_forwarded)
+        if self.limiter.buckets.shared:
+            # The shared buckets are a database round trip
+            wait = await run_in_threadpool(self.limiter.check, client, path)
+        else:
+            wait = self.limiter.check(client, path)
+        if wait > 0:
+            RATE_LIMITED.inc(path)
+            response = too_many_requests("Too many requests. Please slow down and try again later.", wait)
+        elif self.gate.saturated():
+            OVERLOAD_REJECTED.inc(path)
+            response = too_many_requests(
+                "The server is busy with other videos. Please try again shortly.", self.gate.retry_after()
+            )
+        else:
+            await self.app(scope, receive, send)
+            return
+        await response(scope, receive, send)
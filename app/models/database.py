@@ -0,0 +1,44 @@
+from functools import lru_cache
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_engine(database_url: str) -> Engine:
+    """
+    Get the process-wide SQLAlchemy engine for a database URL, tuned for
+    sharing a SQLite file across workers.
+
+    Args:
+        database_url: SQLAlchemy database URL
+
+    Returns:
+        Engine: The configured engine
+    """
+    if not database_url.startswith("sqlite"):
+        return create_engine(database_url, pool_pre_ping=True)
+
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # WAL lets readers in other worker processes run alongside a writer
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+    return engine
+
+
+def create_session_factory(engine: Engine, *models: type) -> sessionmaker:
+    """Create the tables of the given models if needed and return a session factory bound to engine"""
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in models])
+    return sessionmaker(bind=engine, expire_on_commit=False)
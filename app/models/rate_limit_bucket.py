@@ -0,0 +1,14 @@
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket of one client on one endpoint, shared by every worker"""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(320), primary_key=True)  # "<client> <path>"
+    tokens: Mapped[float] = mapped_column(Float)
+    updated_at: Mapped[float] = mapped_column(Float)  # Unix timestamp of the last refill
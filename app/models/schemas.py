@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -19,3 +21,28 @@ class VideoRequest(BaseModel):
 
 class ErrorResponse(BaseModel):
     error: str
+
+
+class BatchRequest(BaseModel):
+    video_urls: List[str] = []  # Explicit list of video URLs
+    playlist_url: Optional[str] = None  # Playlist or channel to expand
+    language_code: str = "en"
+    concurrency: Optional[int] = None  # Defaults to BATCH_CONCURRENCY
+
+
+class BundleRequest(BaseModel):
+    video_url: str
+    language_codes: List[str] = []  # Empty for every manual and auto-generated language
+    output: str = "json"  # "json" or "zip"
+    format: str = "txt"  # File format inside the ZIP archive
+
+
+class ExtractJobRequest(BaseModel):
+    video_url: str
+    language_code: str = "en"
+
+
+class TranslateJobRequest(BaseModel):
+    text: str
+    source_lang: str = "en"
+    target_lang: str = "uk"
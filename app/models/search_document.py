@@ -0,0 +1,20 @@
+from typing import Optional
+
+from sqlalchemy import Float, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database import Base
+
+
+class SearchDocument(Base):
+    """A transcript in the search index; its passages live in the search_passages FTS5 table"""
+
+    __tablename__ = "search_documents"
+    __table_args__ = (UniqueConstraint("video_id", "language_code"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    video_id: Mapped[str] = mapped_column(String(64))
+    language_code: Mapped[str] = mapped_column(String(32))
+    title: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    content_hash: Mapped[str] = mapped_column(String(64))  # sha256 of the indexed text
+    indexed_at: Mapped[float] = mapped_column(Float)  # Unix timestamp
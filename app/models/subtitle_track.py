@@ -0,0 +1,20 @@
+from sqlalchemy import Float, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database import Base
+
+
+class SubtitleTrack(Base):
+    """A downloaded subtitle track, keyed by (video_id, language_code, kind)"""
+
+    __tablename__ = "subtitle_tracks"
+
+    video_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    language_code: Mapped[str] = mapped_column(String(32), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)  # "manual" or "auto"
+    text: Mapped[bytes] = mapped_column(LargeBinary)  # zlib-compressed cleaned text
+    events: Mapped[bytes] = mapped_column(LargeBinary)  # zlib-compressed serialized CueTrack
+    content_hash: Mapped[str] = mapped_column(String(64))  # sha256 of the cleaned text
+    fetched_at: Mapped[float] = mapped_column(Float)  # Unix timestamp
+    # Signature of the normalization pipeline that cleaned the text
+    normalization: Mapped[str] = mapped_column(String(255), default="", server_default="")
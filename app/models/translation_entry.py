@@ -0,0 +1,16 @@
+from sqlalchemy import Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database import Base
+
+
+class TranslationEntry(Base):
+    """A cached translation, keyed by a hash of (source_lang, target_lang, normalized text)"""
+
+    __tablename__ = "translation_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    source_lang: Mapped[str] = mapped_column(String(16))
+    target_lang: Mapped[str] = mapped_column(String(16))
+    translated: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[float] = mapped_column(Float)  # Unix timestamp
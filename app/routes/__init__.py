@@ -1,8 +1,20 @@
 from fastapi import APIRouter
 from .subtitle_routes import router as subtitle_router
 from .translation_routes import router as translation_router
+from .batch_routes import router as batch_router
+from .job_routes import router as job_router
+from .search_routes import router as search_router
+from .metrics_routes import router as metrics_router
+from .stream_routes import router as stream_router
+from .vocabulary_routes import router as vocabulary_router
 
 router = APIRouter()
 
 router.include_router(subtitle_router)
 router.include_router(translation_router)
+router.include_router(batch_router)
+router.include_router(job_router)
+router.include_router(search_router)
+router.include_router(metrics_router)
+router.include_router(stream_router)
+router.include_router(vocabulary_router)
@@ -0,0 +1,202 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.config import (
+    BATCH_CONCURRENCY,
+    BATCH_MAX_CONCURRENCY,
+    BATCH_MAX_VIDEOS,
+    BUNDLE_CONCURRENCY,
+    BUNDLE_MAX_LANGUAGES,
+    EXTRACT_TIMEOUT,
+    METADATA_TIMEOUT,
+)
+from app.models.schemas import BatchRequest, BundleRequest
+from app.services.admission import UpstreamBusyError
+from app.services.executor import run_blocking, StageTimeoutError
+from app.services.subtitle_formats import FORMATS, write_zip
+from app.services.subtitle_service import BARE_VIDEO_ID_PATTERN, SubtitleService
+
+router = APIRouter()
+
+
+@router.post("/process_batch/")
+async def process_batch(request: Request, batch: BatchRequest):
+    """
+    Extract subtitles for many videos, streaming one NDJSON line per video as it completes.
+
+    Accepts an explicit list of video URLs, a playlist/channel URL, or both.
+    A failed video is reported in its own line and does not stop the batch;
+    the last line is a summary.
+    """
+    video_urls = list(batch.video_urls)
+    if batch.playlist_url:
+        playlist_urls, error_message = await run_blocking(
+            SubtitleService.expand_playlist,
+            batch.playlist_url,
+            stage="playlist expansion",
+            timeout=METADATA_TIMEOUT,
+            request=request,
+        )
+        if error_message:
+            return JSONResponse(status_code=400, content={"error": error_message})
+        video_urls.extend(playlist_urls)
+
+    if not video_urls:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Provide video_urls or a playlist_url"},
+        )
+    if len(video_urls) > BATCH_MAX_VIDEOS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"A batch can contain at most {BATCH_MAX_VIDEOS} videos"},
+        )
+
+    concurrency = min(max(batch.concurrency or BATCH_CONCURRENCY, 1), BATCH_MAX_CONCURRENCY)
+    return StreamingResponse(
+        _stream_results(video_urls, batch.language_code, concurrency),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_results(video_urls: list, language_code: str, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process(index: int, video_url: str) -> dict:
+        async with semaphore:
+            try:
+                subtitle_text, error_message = await run_blocking(
+                    SubtitleService.extract_subtitles,
+                    video_url,
+                    language_code,
+                    stage="subtitle extraction",
+                    timeout=EXTRACT_TIMEOUT,
+                )
+            except (StageTimeoutError, UpstreamBusyError) as e:
+                subtitle_text, error_message = None, str(e)
+        return {
+            "index": index,
+            "video_url": video_url,
+            "video_id": SubtitleService.get_video_id(video_url),
+            "language_code": language_code,
+            "subtitle_text": subtitle_text,
+            "error": error_message,
+        }
+
+    tasks = [
+        asyncio.ensure_future(process(index, video_url))
+        for index, video_url in enumerate(video_urls)
+    ]
+    failed = 0
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            if result["error"]:
+                failed += 1
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+        yield json.dumps({"done": True, "total": len(tasks), "failed": failed}) + "\n"
+    finally:
+        # Stop queued work if the client goes away mid-batch
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/process_bundle/")
+async def process_bundle(request: Request, bundle: BundleRequest):
+    """
+    Extract several subtitle languages of one video in one request.
+
+    The track list is read once (through the shared metadata cache) and the
+    tracks are downloaded concurrently over the shared connection pool, so
+    the request takes about as long as the slowest track. Without
+    language_codes, every manual and auto-generated language is included.
+    A language that fails is reported under "errors" and does not fail the
+    bundle.
+
+    Returns:
+        JSON with one transcript per language, or a streamed ZIP archive with
+        one file per language when output is "zip"
+    """
+    if bundle.output not in ("json", "zip"):
+        return JSONResponse(status_code=400, content={"error": 'output must be "json" or "zip"'})
+    if bundle.format not in FORMATS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unsupported subtitle format: {bundle.format}. Choose one of: {', '.join(FORMATS)}."},
+        )
+
+    language_codes = list(dict.fromkeys(bundle.language_codes))
+    if not language_codes:
+        languages, error_message = await run_blocking(
+            SubtitleService.get_available_languages,
+            bundle.video_url,
+            stage="language lookup",
+            timeout=METADATA_TIMEOUT,
+            request=request,
+        )
+        if error_message:
+            return JSONResponse(status_code=400, content={"error": error_message})
+        language_codes = list(languages)
+    if len(language_codes) > BUNDLE_MAX_LANGUAGES:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"A bundle can contain at most {BUNDLE_MAX_LANGUAGES} languages"},
+        )
+
+    semaphore = asyncio.Semaphore(BUNDLE_CONCURRENCY)
+
+    async def fetch(language_code: str) -> tuple:
+        async with semaphore:
+            try:
+                return await run_blocking(
+                    SubtitleService.get_track,
+                    bundle.video_url,
+                    language_code,
+                    stage="subtitle extraction",
+                    timeout=EXTRACT_TIMEOUT,
+                    request=request,
+                )
+            except (StageTimeoutError, UpstreamBusyError) as e:
+                return None, str(e)
+
+    results = await asyncio.gather(*(fetch(language_code) for language_code in language_codes))
+    tracks = {}
+    errors = {}
+    for language_code, (track, error_message) in zip(language_codes, results):
+        if error_message:
+            errors[language_code] = error_message
+        else:
+            tracks[language_code] = track
+
+    if not tracks:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "None of the requested languages could be extracted.", "errors": errors},
+        )
+
+    video_id = SubtitleService.get_video_id(bundle.video_url)
+    if bundle.output == "zip":
+        # A URL without a recognizable video ID never ends up in file names or headers
+        name = video_id if BARE_VIDEO_ID_PATTERN.match(video_id) else "subtitles"
+        return StreamingResponse(
+            write_zip(
+                {language_code: track.cues for language_code, track in tracks.items()},
+                video_id,
+                bundle.format,
+                errors,
+                name=name,
+            ),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{name}_subtitles.zip"'},
+        )
+    return {
+        "video_id": video_id,
+        "tracks": [
+            {"language_code": language_code, "subtitle_text": track.text}
+            for language_code, track in tracks.items()
+        ],
+        "errors": errors,
+    }
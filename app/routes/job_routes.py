@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from app.config import JOB_MAX_WAIT
+from app.models.schemas import ExtractJobRequest, TranslateJobRequest
+from app.services.job_service import job_manager, JobQueueFullError
+
+router = APIRouter()
+
+# How often a long-poll re-checks the job while waiting
+POLL_INTERVAL = 0.1
+
+
+def _submit(kind: str, params: dict) -> JSONResponse:
+    try:
+        job = job_manager.submit(kind, params)
+    except JobQueueFullError as e:
+        return JSONResponse(status_code=503, content={"error": str(e)})
+    return JSONResponse(status_code=202, content=job.to_dict())
+
+
+@router.post("/jobs/extract")
+async def submit_extract_job(job_request: ExtractJobRequest):
+    """Queue a subtitle extraction and return its job ID immediately"""
+    return _submit(
+        "extract",
+        {"video_url": job_request.video_url, "language_code": job_request.language_code},
+    )
+
+
+@router.post("/jobs/translate")
+async def submit_translate_job(job_request: TranslateJobRequest):
+    """Queue a translation and return its job ID immediately"""
+    return _submit(
+        "translate",
+        {
+            "text": job_request.text,
+            "source_lang": job_request.source_lang,
+            "target_lang": job_request.target_lang,
+        },
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = Query(0, ge=0)):
+    """
+    Get a job's status, progress and result.
+
+    Args:
+        job_id: ID returned when the job was submitted
+        wait: Seconds to long-poll for the job to finish (capped at JOB_MAX_WAIT)
+
+    Returns:
+        JSON object describing the job
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+
+    deadline = time.monotonic() + min(wait, JOB_MAX_WAIT)
+    while not job.done.is_set() and time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+
+    return job.to_dict()
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from fastapi import APIRouter, Request, Query
+from fastapi.responses import JSONResponse
+
+from app.config import SEARCH_MAX_PAGE_SIZE, SEARCH_TIMEOUT
+from app.services.executor import run_blocking
+from app.services.subtitle_service import SubtitleService
+
+router = APIRouter()
+
+
+@router.get("/search/")
+async def search(
+    request: Request,
+    q: str = Query(...),
+    language_code: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1),
+):
+    """
+    Search every transcript extracted so far.
+
+    Args:
+        q: Words to find; double-quoted parts are matched as phrases
+        language_code: Only search transcripts in this language
+        page: 1-based page number
+        page_size: Number of videos per page
+
+    Returns:
+        JSON object with ranked videos, each with timestamped hits and snippets
+    """
+    results, error_message = await run_blocking(
+        SubtitleService.search_transcripts,
+        q,
+        language_code,
+        page,
+        min(page_size, SEARCH_MAX_PAGE_SIZE),
+        stage="search",
+        timeout=SEARCH_TIMEOUT,
+        request=request,
+    )
+    if error_message:
+        return JSONResponse(status_code=400, content={"error": error_message})
+    return results
@@ -0,0 +1,188 @@
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
+
+from app.config import (
+    EXTRACT_TIMEOUT,
+    STREAM_CUES_PER_EVENT,
+    STREAM_HEARTBEAT_INTERVAL,
+    TRANSCRIPT_TRANSLATION_TIMEOUT,
+)
+from app.services.admission import UpstreamBusyError
+from app.services.executor import (
+    iterate_blocking,
+    run_blocking,
+    StageTimeoutError,
+    ClientDisconnectedError,
+)
+from app.services.subtitle_service import SubtitleService
+from app.services.translation_service import get_shared_translation_service, googletrans
+from app.services.vocabulary import has_frequency_table
+
+router = APIRouter()
+
+# YouTube caption codes whose googletrans code is not their base language
+_TRANSLATOR_CODES = {"zh-hans": "zh-cn", "zh-hant": "zh-tw", "zh-tw": "zh-tw", "zh-hk": "zh-tw"}
+
+
+@router.get("/stream_subtitles/")
+async def stream_subtitles(
+    request: Request,
+    video_url: str = Query(...),
+    language_code: str = Query("en"),
+    translate_to: Optional[str] = Query(None),
+):
+    """
+    Stream a video's transcript as Server-Sent Events while it is extracted.
+
+    Events, in order: title and languages once the video info is fetched,
+    cues for every batch of parsed captions, translation right behind each
+    batch when translate_to is given, then done. A failure ends the stream
+    with a failed event; translation_failed only stops the translations.
+
+    Args:
+        video_url: The YouTube video URL
+        language_code: Language code of the subtitles
+        translate_to: Language code to translate the transcript into (optional)
+    """
+    return StreamingResponse(
+        _events(request, video_url, language_code, translate_to),
+        media_type="text/event-stream",
+        # Proxies must not buffer or cache the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _translator_code(language_code: str) -> str:
+    """The googletrans code for a caption language code ("en-US" -> "en")"""
+    code = language_code.lower()
+    if code in _TRANSLATOR_CODES:
+        return _TRANSLATOR_CODES[code]
+    if code in googletrans.LANGUAGES:
+        return code
+    return code.split("-")[0]
+
+
+async def _events(request: Request, video_url: str, language_code: str, translate_to: Optional[str]):
+    # Events ready to send; each task puts None when it is finished
+    output: asyncio.Queue = asyncio.Queue()
+    # Cue batches waiting to be translated; None ends the translations
+    batches: asyncio.Queue = asyncio.Queue()
+    result = {}
+
+    async def extract() -> None:
+        sent = 0
+        try:
+            async for event, data in iterate_blocking(
+                SubtitleService.iter_track,
+                video_url,
+                language_code,
+                STREAM_CUES_PER_EVENT,
+                stage="subtitle extraction",
+                timeout=EXTRACT_TIMEOUT,
+                request=request,
+            ):
+                if event == "info":
+                    await output.put(_event("title", {"title": data["title"]}))
+                    await output.put(_event("languages", {"languages": data["languages"]}))
+                elif event == "cues":
+                    await output.put(
+                        _event(
+                            "cues",
+                            {
+                                "first": sent,
+                                "cues": [
+                                    {"start_ms": start, "duration_ms": duration, "text": text}
+                                    for start, duration, text in data
+                                ],
+                            },
+                        )
+                    )
+                    batches.put_nowait((sent, len(data), " ".join(text for _, _, text in data)))
+                    sent += len(data)
+                elif event == "track":
+                    result["track"] = data
+                else:
+                    await output.put(_event("failed", {"error": data}))
+        except UpstreamBusyError as e:
+            await output.put(_event("failed", {"error": str(e), "retry_after": e.retry_after}))
+        except StageTimeoutError as e:
+            await output.put(_event("failed", {"error": str(e)}))
+        except ClientDisconnectedError:
+            pass
+        finally:
+            batches.put_nowait(None)
+            await output.put(None)
+
+    async def translate() -> None:
+        service = get_shared_translation_service()
+        try:
+            source_language = _translator_code(language_code)
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+                first, count, text = batch
+                translated = await run_blocking(
+                    service.translate_transcript,
+                    text,
+                    source_language,
+                    translate_to,
+                    stage="transcript translation",
+                    timeout=TRANSCRIPT_TRANSLATION_TIMEOUT,
+                    request=request,
+                )
+                await output.put(
+                    _event("translation", {"first": first, "count": count, "text": translated["translated"]})
+                )
+        except HTTPException as e:
+            await output.put(_event("translation_failed", {"error": e.detail}))
+        except StageTimeoutError as e:
+            await output.put(_event("translation_failed", {"error": str(e)}))
+        except ClientDisconnectedError:
+            pass
+        except Exception as e:
+            await output.put(_event("translation_failed", {"error": f"Error translating text: {str(e)}"}))
+        finally:
+            await output.put(None)
+
+    tasks = [asyncio.ensure_future(extract())]
+    if translate_to:
+        tasks.append(asyncio.ensure_future(translate()))
+    try:
+        running = len(tasks)
+        while running:
+            try:
+                item = await asyncio.wait_for(output.get(), STREAM_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                # A comment line keeps idle proxies from closing the connection
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                running -= 1
+            else:
+                yield item
+
+        track = result.get("track")
+        if track is not None:
+            yield _event(
+                "done",
+                {
+                    "video_id": SubtitleService.get_video_id(video_url),
+                    "language_code": language_code,
+                    "cues": len(track.cues),
+                    "content_hash": track.content_hash,
+                    # Whether /vocabulary/ can rank the words of this language
+                    "vocabulary": has_frequency_table(language_code),
+                },
+            )
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -1,10 +1,18 @@
 from fastapi import APIRouter, Request, Form, HTTPException, Body, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
-import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from app.services.subtitle_service import SubtitleService
+from app.config import METADATA_TIMEOUT, EXTRACT_TIMEOUT
+from app.http_cache import cache_headers, is_not_modified, make_etag, not_modified
+from app.services.executor import (
+    run_blocking,
+    StageTimeoutError,
+    ClientDisconnectedError,
+)
+from app.services.subtitle_formats import FORMATS
+from app.services.subtitle_service import BARE_VIDEO_ID_PATTERN, SubtitleService
+from app.services.vocabulary import has_frequency_table
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
@@ -31,7 +39,13 @@ async def check_languages(request: Request, video_url: str = Form(None)):
                 status_code=400, content={"error": "Missing video URL parameter"}
             )
 
-    languages_dict, error_message = SubtitleService.get_available_languages(video_url)
+    languages_dict, error_message = await run_blocking(
+        SubtitleService.get_available_languages,
+        video_url,
+        stage="language lookup",
+        timeout=METADATA_TIMEOUT,
+        request=request,
+    )
 
     # Check if this is an AJAX request
     is_ajax = (
@@ -65,6 +79,30 @@ async def check_languages(request: Request, video_url: str = Form(None)):
         )
 
 
+@router.get("/tracks/")
+async def get_tracks(request: Request, video_url: str = Query(...)):
+    """
+    List every caption track of a video, manual and automatic.
+
+    Args:
+        video_url: The YouTube video URL
+
+    Returns:
+        JSON object with the tracks, each with its language, kind and formats
+    """
+    tracks, error_message = await run_blocking(
+        SubtitleService.get_available_tracks,
+        video_url,
+        stage="language lookup",
+        timeout=METADATA_TIMEOUT,
+        request=request,
+    )
+    if error_message:
+        return JSONResponse(status_code=400, content={"error": error_message})
+
+    return {"video_id": SubtitleService.get_video_id(video_url), "tracks": tracks}
+
+
 @router.post("/process_video/")
 async def process_video(
     request: Request, video_url: str = Form(None), language_code: str = Form(None)
@@ -81,9 +119,15 @@ async def process_video(
                 status_code=400, content={"error": "Missing required parameters"}
             )
 
-    subtitle_text, error_message = SubtitleService.extract_subtitles(
-        video_url, language_code
+    track, error_message = await run_blocking(
+        SubtitleService.get_track,
+        video_url,
+        language_code,
+        stage="subtitle extraction",
+        timeout=EXTRACT_TIMEOUT,
+        request=request,
     )
+    subtitle_text = track.text if track else None
 
     # Check if this is an AJAX request
     is_ajax = (
@@ -91,52 +135,156 @@ async def process_video(
         or request.headers.get("Accept") == "application/json"
     )
 
-    # Get available languages to include in the response
-    available_languages, _ = SubtitleService.get_available_languages(video_url)
-
-    # Add more descriptive error messages if there's an issue
-    if error_message:
-        if is_ajax:
-            return JSONResponse(status_code=400, content={"error": error_message})
-        else:
-            return templates.TemplateResponse(
-                "index.html",
-                {
-                    "request": request,
-                    "error_message": error_message,
-                    "video_url": video_url,
-                    "languages": available_languages,
-                },
-            )
-
     if is_ajax:
+        if error_message:
+            return JSONResponse(status_code=400, content={"error": error_message})
         return JSONResponse(
             content={
                 "subtitle_text": subtitle_text,
                 "video_url": video_url,
                 "language_code": language_code,
-            }
+            },
+            headers=cache_headers(make_etag(track.content_hash, "json")),
         )
-    else:
+
+    # Get available languages to include in the page (only pages show the selector)
+    available_languages, _ = await run_blocking(
+        SubtitleService.get_available_languages,
+        video_url,
+        stage="language lookup",
+        timeout=METADATA_TIMEOUT,
+        request=request,
+    )
+
+    # Add more descriptive error messages if there's an issue
+    if error_message:
         return templates.TemplateResponse(
             "index.html",
             {
                 "request": request,
-                "subtitle_text": subtitle_text,
+                "error_message": error_message,
                 "video_url": video_url,
-                "language_code": language_code,
-                "languages": available_languages,  # Include languages in response
+                "languages": available_languages,
             },
         )
 
+    return templates.TemplateResponse(
+        "index.html",
+        {
+            "request": request,
+            "subtitle_text": subtitle_text,
+            "video_url": video_url,
+            "language_code": language_code,
+            "languages": available_languages,  # Include languages in response
+            "vocabulary_available": has_frequency_table(language_code),
+        },
+    )
+
+
+@router.get("/subtitles/")
+async def get_subtitles(
+    request: Request, video_url: str = Query(...), language_code: str = Query("en")
+):
+    """
+    Get a video's transcript; the cacheable counterpart of /process_video/.
+
+    Responses carry an ETag and Cache-Control. A request whose If-None-Match
+    names the stored track's ETag gets a 304 without the track being loaded.
+
+    Args:
+        video_url: The YouTube video URL
+        language_code: Language code for subtitles
+
+    Returns:
+        JSON object with the subtitle text
+    """
+    if request.headers.get("if-none-match"):
+        content_hash = await run_blocking(
+            SubtitleService.get_content_hash,
+            video_url,
+            language_code,
+            stage="subtitle lookup",
+            timeout=METADATA_TIMEOUT,
+            request=request,
+        )
+        if content_hash and is_not_modified(request, make_etag(content_hash, "json")):
+            return not_modified(make_etag(content_hash, "json"))
+
+    track, error_message = await run_blocking(
+        SubtitleService.get_track,
+        video_url,
+        language_code,
+        stage="subtitle extraction",
+        timeout=EXTRACT_TIMEOUT,
+        request=request,
+    )
+    if error_message:
+        return JSONResponse(status_code=400, content={"error": error_message})
+
+    etag = make_etag(track.content_hash, "json")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return JSONResponse(
+        content={
+            "subtitle_text": track.text,
+            "video_url": video_url,
+            "language_code": language_code,
+        },
+        headers=cache_headers(etag),
+    )
+
 
 @router.post("/download_subtitles/")
 async def download_subtitles(
-    video_url: str = Form(...), language_code: str = Form("en")
+    request: Request,
+    video_url: str = Form(...),
+    language_code: str = Form("en"),
+    format: str = Form("txt"),
 ):
-    """Download subtitles in the specified language"""
-    subtitle_text, error_message = SubtitleService.extract_subtitles(
-        video_url, language_code
+    """
+    Download subtitles in the specified language and format.
+
+    The file is formatted from the track's timed cues while it is streamed.
+    POST responses cannot be revalidated, so they carry no ETag; see
+    GET /download_subtitles/ for the cacheable form.
+
+    Args:
+        video_url: The YouTube video URL
+        language_code: Language code for subtitles
+        format: "srt", "vtt", "json" (timed cues) or "txt" (plain transcript)
+    """
+    return await _download(request, video_url, language_code, format, cacheable=False)
+
+
+@router.get("/download_subtitles/")
+async def download_subtitles_cacheable(
+    request: Request,
+    video_url: str = Query(...),
+    language_code: str = Query("en"),
+    format: str = Query("txt"),
+):
+    """
+    Download subtitles like POST /download_subtitles/, with an ETag and
+    Cache-Control. A request whose If-None-Match names the file's ETag gets
+    a 304.
+    """
+    return await _download(request, video_url, language_code, format, cacheable=True)
+
+
+async def _download(request: Request, video_url: str, language_code: str, format: str, cacheable: bool):
+    if format not in FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported subtitle format: {format}. Choose one of: {', '.join(FORMATS)}.",
+        )
+
+    track, error_message = await run_blocking(
+        SubtitleService.get_track,
+        video_url,
+        language_code,
+        stage="subtitle extraction",
+        timeout=EXTRACT_TIMEOUT,
+        request=request,
     )
 
     # More detailed error handling
@@ -146,28 +294,27 @@ async def download_subtitles(
             detail=f"Failed to extract {language_code} subtitles for the video. {error_message}",
         )
 
-    # Create a temporary file for download
-    try:
-        path, filename = SubtitleService.create_subtitles_file(
-            subtitle_text, video_url, language_code
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"An error occurred while creating the subtitle file: {str(e)}. Please try again later.",
+    headers = {}
+    if cacheable:
+        # Timed formats change with the cue timings, even when the text does not
+        etag = make_etag(
+            track.content_hash, f"download-{format}", track.cues if format != "txt" else None
         )
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers = cache_headers(etag)
 
-    # Return the file as a download
-    return FileResponse(
-        path,
-        media_type="text/plain",
-        filename=filename,
-        background=lambda: os.remove(path),  # Delete the temporary file after download
+    video_id = SubtitleService.get_video_id(video_url)
+    writer, media_type, extension = FORMATS[format]
+    filename = f"{video_id if BARE_VIDEO_ID_PATTERN.match(video_id) else 'subtitles'}_{language_code}_subtitles.{extension}"
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        writer(track.cues, video_id, language_code), media_type=media_type, headers=headers
     )
 
 
 @router.get("/get_video_title/")
-async def get_video_title(video_url: str = Query(...)):
+async def get_video_title(request: Request, video_url: str = Query(...)):
     """
     Fetch the title of a YouTube video by its URL.
 
@@ -178,9 +325,58 @@ async def get_video_title(video_url: str = Query(...)):
         JSON object with the video title
     """
     try:
-        video_title = SubtitleService.get_video_title(video_url)
+        video_title = await run_blocking(
+            SubtitleService.get_video_title,
+            video_url,
+            stage="title lookup",
+            timeout=METADATA_TIMEOUT,
+            request=request,
+        )
         return {"title": video_title}
+    except (StageTimeoutError, ClientDisconnectedError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching video title: {str(e)}"
         )
+
+
+@router.get("/cues/")
+async def get_cues(
+    request: Request,
+    video_url: str = Query(...),
+    language_code: str = Query("en"),
+    start_ms: int = Query(0, ge=0),
+    end_ms: Optional[int] = Query(None, ge=0),
+):
+    """
+    Get the timed subtitle cues that overlap a time range of the video.
+
+    Args:
+        video_url: The YouTube video URL
+        language_code: Language code for subtitles
+        start_ms: Start of the range in milliseconds
+        end_ms: End of the range in milliseconds (default: end of the video)
+
+    Returns:
+        JSON object with the matching cues and the total cue count of the track
+    """
+    cues, error_message = await run_blocking(
+        SubtitleService.get_cues,
+        video_url,
+        language_code,
+        stage="subtitle extraction",
+        timeout=EXTRACT_TIMEOUT,
+        request=request,
+    )
+    if error_message:
+        return JSONResponse(status_code=400, content={"error": error_message})
+
+    if end_ms is None:
+        end_ms = 2**62
+    return {
+        "video_id": SubtitleService.get_video_id(video_url),
+        "language_code": language_code,
+        "total": len(cues),
+        "cues": [cues.cue(index) for index in cues.window(start_ms, end_ms)],
+    }
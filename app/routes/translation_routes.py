@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Depends
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from app.services.translation_service import TranslationService
+from app.config import TRANSCRIPT_TRANSLATION_TIMEOUT, TRANSLATE_WORDS_MAX, TRANSLATION_TIMEOUT
+from app.services.executor import run_blocking
+from app.services.translation_service import (
+    TranslationService,
+    get_shared_translation_service,
+)
 
 router = APIRouter()
 
@@ -17,20 +24,52 @@ class TranslationResponse(BaseModel):
     original: str
 
 
+class TranscriptTranslationRequest(BaseModel):
+    text: str
+    source_lang: str
+    target_lang: str
+
+
+class TranscriptTranslationResponse(BaseModel):
+    translated: str
+    original: str
+    chunks: int
+
+
+class WordTranslationRequest(BaseModel):
+    words: List[str]
+    source_lang: str
+    target_lang: str
+
+
+class WordTranslation(BaseModel):
+    original: str
+    translated: str
+    source: str  # "dictionary" or "translator"
+
+
+class WordTranslationResponse(BaseModel):
+    translations: List[WordTranslation]
+    dictionary_hits: int
+    chunks: int
+
+
 def get_translation_service():
-    return TranslationService()
+    return get_shared_translation_service()
 
 
 @router.post("/translate/", response_model=TranslationResponse)
 async def translate_api(
+    http_request: Request,
     request: TranslationRequest,
     translation_service: TranslationService = Depends(get_translation_service),
 ):
     # Use the translate method with parameters from the request
-    result = translation_service.translate(
+    result = await translation_service.translate_async(
         request.text,
         source_language=request.source_lang,
         target_language=request.target_lang,
+        request=http_request,
     )
 
     # If your translation service returns a dictionary with 'original' and 'translated' keys
@@ -42,3 +81,44 @@ async def translate_api(
     # If result is something else unexpected
     else:
         return {"original": request.text, "translated": str(result) if result else ""}
+
+
+@router.post("/translate_transcript/", response_model=TranscriptTranslationResponse)
+async def translate_transcript_api(
+    http_request: Request,
+    request: TranscriptTranslationRequest,
+    translation_service: TranslationService = Depends(get_translation_service),
+):
+    """Translate a full transcript, splitting it into sentence-aligned chunks"""
+    return await run_blocking(
+        translation_service.translate_transcript,
+        request.text,
+        request.source_lang,
+        request.target_lang,
+        stage="transcript translation",
+        timeout=TRANSCRIPT_TRANSLATION_TIMEOUT,
+        request=http_request,
+    )
+
+
+@router.post("/translate_words/", response_model=WordTranslationResponse)
+async def translate_words_api(
+    http_request: Request,
+    request: WordTranslationRequest,
+    translation_service: TranslationService = Depends(get_translation_service),
+):
+    """Translate a list of words, from the local dictionary where possible"""
+    if len(request.words) > TRANSLATE_WORDS_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Please send at most {TRANSLATE_WORDS_MAX} words at a time.",
+        )
+    return await run_blocking(
+        translation_service.translate_words,
+        request.words,
+        request.source_lang,
+        request.target_lang,
+        stage="word translation",
+        timeout=TRANSLATION_TIMEOUT,
+        request=http_request,
+    )
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Request, Query
+from fastapi.responses import JSONResponse
+
+from app.config import EXTRACT_TIMEOUT, VOCABULARY_MAX_WORDS
+from app.services.executor import run_blocking
+from app.services.subtitle_service import SubtitleService
+
+router = APIRouter()
+
+
+@router.get("/vocabulary/")
+async def vocabulary(
+    request: Request,
+    video_url: str = Query(...),
+    language_code: str = Query("en"),
+    limit: int = Query(50, ge=1),
+    max_zipf: float = Query(5.0),
+    min_count: int = Query(2, ge=1),
+    include_unknown: bool = Query(False),
+    phrases: int = Query(20, ge=0),
+):
+    """
+    Get the words of a video's transcript worth learning, best first.
+
+    Args:
+        video_url: The YouTube video URL
+        language_code: Language code of the subtitles
+        limit: Number of words to return
+        max_zipf: Leave out words at least this common in the language
+            (Zipf scale: 7 for "the", 5 for "house", 3 for "transformer")
+        min_count: Leave out words used fewer times in the video
+        include_unknown: Also rank words missing from the frequency table
+        phrases: Number of multi-word key phrases to return
+
+    Returns:
+        JSON object with the transcript's token counts, the ranked words and the key phrases
+    """
+    result, error_message = await run_blocking(
+        SubtitleService.get_vocabulary,
+        video_url,
+        language_code,
+        min(limit, VOCABULARY_MAX_WORDS),
+        max_zipf,
+        min_count,
+        include_unknown,
+        min(phrases, VOCABULARY_MAX_WORDS),
+        stage="vocabulary analysis",
+        timeout=EXTRACT_TIMEOUT,
+        request=request,
+    )
+    if error_message:
+        return JSONResponse(status_code=400, content={"error": error_message})
+    return result
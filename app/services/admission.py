@@ -0,0 +1,353 @@
+"""
+Admission control: per-client rate limits and a cap on upstream extractions.
+
+- RateLimiter keeps a token bucket per (client, path) for the paths listed in
+  RATE_LIMITS. Buckets live in process memory, or in the database when
+  several workers must share them.
+- ExtractionGate caps the yt-dlp extractions and caption downloads running at
+  once in this process. Extra callers wait in a bounded queue; when it is
+  full, or a caller waits too long, UpstreamBusyError is raised and the app
+  answers 429 with Retry-After.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import (
+    DATABASE_URL,
+    EXTRACTION_MAX_CONCURRENCY,
+    EXTRACTION_QUEUE_SIZE,
+    EXTRACTION_QUEUE_TIMEOUT,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_MAX_CLIENTS,
+    RATE_LIMITS,
+)
+from app.models.database import get_engine, create_session_factory
+from app.models.rate_limit_bucket import RateLimitBucket
+from app.services.metrics import REGISTRY, register_stats
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITED = REGISTRY.counter(
+    "subtitles_rate_limited_total", "Requests rejected by the per-client rate limit", ("path",)
+)
+OVERLOAD_REJECTED = REGISTRY.counter(
+    "subtitles_overload_rejected_total", "Requests rejected because the extraction queue was full", ("path",)
+)
+
+
+class UpstreamBusyError(Exception):
+    """Raised when an upstream extraction cannot get a slot"""
+
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(
+            f"The server is busy with other videos. Please try again in {retry_after} seconds."
+        )
+
+
+def parse_rate_limits(spec: str) -> dict:
+    """
+    Parse "path=requests/seconds" pairs separated by commas.
+
+    Returns:
+        dict: path -> (requests, seconds)
+
+    Raises:
+        ValueError: If a pair is malformed
+    """
+    rules = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        path, _, limit = item.rpartition("=")
+        requests, _, seconds = limit.partition("/")
+        try:
+            rules[path.strip()] = (float(requests), float(seconds))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit {item!r}, expected path=requests/seconds") from None
+        if not path.strip() or rules[path.strip()][0] <= 0 or rules[path.strip()][1] <= 0:
+            raise ValueError(f"Invalid rate limit {item!r}, expected path=requests/seconds")
+    return rules
+
+
+class MemoryBuckets:
+    """Token buckets in process memory, the least recently used dropped past max_keys"""
+
+    shared = False
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_CLIENTS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, burst: float, rate: float, cost: float = 1.0) -> float:
+        """
+        Take cost tokens from a bucket holding at most burst and refilled at rate per second.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise seconds until they would be available
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+# One statement, so concurrent workers cannot both spend the same tokens
+_TAKE = text(
+    """
+    INSERT INTO rate_limit_buckets (key, tokens, updated_at) VALUES (:key, :burst - :cost, :now)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = MIN(:burst, tokens + (:now - updated_at) * :rate) - :cost,
+        updated_at = :now
+    WHERE MIN(:burst, tokens + (:now - updated_at) * :rate) >= :cost
+    RETURNING tokens
+    """
+)
+_PEEK = text("SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = :key")
+_PRUNE = text("DELETE FROM rate_limit_buckets WHERE updated_at < :cutoff")
+
+
+class DatabaseBuckets:
+    """
+    Token buckets in a shared SQLite database, for several worker processes.
+
+    Database errors are logged and let the request through, so the limiter
+    never takes the service down.
+    """
+
+    shared = True
+    # Takes between sweeps of buckets idle for longer than idle_ttl
+    PRUNE_EVERY = 1000
+
+    def __init__(self, database_url: str, idle_ttl: float = 3600):
+        self.database_url = database_url
+        self.idle_ttl = idle_ttl
+        self._session_factory = None
+        self._lock = threading.Lock()
+        self._takes = 0
+
+    def take(self, key: str, burst: float, rate: float, cost: float = 1.0) -> float:
+        """Like MemoryBuckets.take()"""
+        now = time.time()
+        try:
+            with self._session() as session:
+                taken = session.execute(
+                    _TAKE, {"key": key, "burst": burst, "rate": rate, "cost": cost, "now": now}
+                ).first()
+                wait = 0.0
+                if taken is None:
+                    tokens, updated_at = session.execute(_PEEK, {"key": key}).one()
+                    tokens = min(burst, tokens + (now - updated_at) * rate)
+                    wait = max((cost - tokens) / rate, 0.0)
+                self._takes += 1
+                if self._takes % self.PRUNE_EVERY == 0:
+                    session.execute(_PRUNE, {"cutoff": now - self.idle_ttl})
+                session.commit()
+                return wait
+        except SQLAlchemyError as e:
+            logger.warning("Rate limit check failed for %s: %s", key, e)
+            return 0.0
+
+    def _session(self):
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    self._session_factory = create_session_factory(
+                        get_engine(self.database_url), RateLimitBucket
+                    )
+        return self._session_factory()
+
+
+class RateLimiter:
+    """Per-client token buckets for the configured paths"""
+
+    def __init__(self, rules: dict, buckets):
+        self.rules = rules
+        self.buckets = buckets
+        self.allowed = 0
+        self.limited = 0
+
+    def applies(self, path: str) -> bool:
+        return path in self.rules
+
+    def check(self, client: str, path: str) -> float:
+        """
+        Count a request of a client to a path.
+
+        Returns:
+            float: 0 if it is allowed, otherwise seconds until the client may retry
+        """
+        rule = self.rules.get(path)
+        if rule is None:
+            return 0.0
+        requests, seconds = rule
+        wait = self.buckets.take(f"{client} {path}", requests, requests / seconds)
+        if wait > 0:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "limited": self.limited, "rules": len(self.rules)}
+
+
+class ExtractionGate:
+    """
+    Caps concurrent upstream work, with a bounded queue of waiting callers.
+
+    Retry-After hints come from a moving average of how long a slot is held.
+    """
+
+    def __init__(self, max_concurrency: int, queue_size: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.queued = 0
+        self.resuming = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._hold_seconds = 1.0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, resume: bool = False) -> Iterator[None]:
+        """
+        Hold a slot while the block runs, waiting in the queue if needed.
+
+        Args:
+            resume: The caller continues work it was already admitted for. It
+                waits for a slot however long it takes, ahead of new callers
+
+        Raises:
+            UpstreamBusyError: If the queue is full or no slot freed up in time,
+                for new work only
+        """
+        if self.max_concurrency <= 0:
+            yield
+            return
+        self._acquire(resume)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    def saturated(self) -> bool:
+        """Check whether a new caller would be rejected right away"""
+        return 0 < self.max_concurrency <= self.active and self.queued >= self.queue_size
+
+    def retry_after(self) -> int:
+        """Seconds a rejected caller should wait, from the queue length and average hold time"""
+        if self.max_concurrency <= 0:
+            return 1
+        return max(1, math.ceil(self._hold_seconds * (self.queued + 1) / self.max_concurrency))
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "resuming": self.resuming,
+            "max_concurrency": self.max_concurrency,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def _acquire(self, resume: bool) -> None:
+        with self._condition:
+            if self.active < self.max_concurrency and not self.queued and not self.resuming:
+                self.active += 1
+                # Only new work counts as admitted, not every read of a download
+                self.admitted += not resume
+                return
+            if resume:
+                # Work already under way is never rejected: it waits without a
+                # deadline, and freed slots go to it before new callers
+                self.resuming += 1
+                try:
+                    while self.active >= self.max_concurrency:
+                        self._condition.wait()
+                finally:
+                    self.resuming -= 1
+                self.active += 1
+                return
+            if self.queued >= self.queue_size:
+                self.rejected += 1
+                raise UpstreamBusyError(self.retry_after())
+
+            self.queued += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self.active >= self.max_concurrency or self.resuming:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        raise UpstreamBusyError(self.retry_after())
+                    self._condition.wait(remaining)
+            finally:
+                self.queued -= 1
+            self.active += 1
+            self.admitted += 1
+
+    def _release(self, held: float) -> None:
+        with self._condition:
+            self.active -= 1
+            self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held
+            # Both resumed and new callers may be waiting, and only some of them can go ahead
+            self._condition.notify_all()
+
+
+def client_id(scope: dict, trust_forwarded: bool = False) -> str:
+    """Identify the client of an ASGI request by its address"""
+    if trust_forwarded:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _create_buckets(backend: str, rules: dict):
+    if backend == "database":
+        if DATABASE_URL.startswith("sqlite"):
+            # A bucket idle for its longest window is full again, so its row can go
+            idle_ttl = max((seconds for _, seconds in rules.values()), default=3600)
+            return DatabaseBuckets(DATABASE_URL, idle_ttl=idle_ttl)
+        logger.warning("The database rate limit backend needs SQLite; using in-process buckets")
+    elif backend != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND {backend!r}, expected memory or database")
+    return MemoryBuckets()
+
+
+_rules = parse_rate_limits(RATE_LIMITS)
+rate_limiter = RateLimiter(_rules, _create_buckets(RATE_LIMIT_BACKEND, _rules))
+extraction_gate = ExtractionGate(
+    EXTRACTION_MAX_CONCURRENCY, EXTRACTION_QUEUE_SIZE, EXTRACTION_QUEUE_TIMEOUT
+)
+
+register_stats("rate_limiter", rate_limiter.stats, counters=("allowed", "limited"))
+register_stats("extraction_gate", extraction_gate.stats, counters=("admitted", "rejected", "timed_out"))
@@ -0,0 +1,124 @@
+import json
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+
+# Serialized layout: magic, cue count, then starts, durations, text offsets and UTF-8 text
+_MAGIC = b"CUE1"
+_HEADER = struct.Struct("<4sI")
+
+
+class CueTrack:
+    """
+    Timed subtitle cues in a compact, array-backed layout.
+
+    Cues are kept sorted by start time in parallel int arrays (start and
+    duration in milliseconds) with all cue texts in one string addressed by
+    offsets, instead of one dict per cue. A running maximum of cue end times
+    makes window lookups a pair of binary searches.
+    """
+
+    __slots__ = ("starts", "durations", "_max_ends", "_text", "_offsets")
+
+    def __init__(self, starts: array, durations: array, text: str, offsets: array):
+        self.starts = starts
+        self.durations = durations
+        self._text = text
+        self._offsets = offsets
+
+        self._max_ends = array("q")
+        running = -1
+        for start, duration in zip(starts, durations):
+            running = max(running, start + duration)
+            self._max_ends.append(running)
+
+    @classmethod
+    def from_events(cls, events: Iterable) -> "CueTrack":
+        """
+        Build a track from (start_ms, duration_ms, text) triples.
+
+        Whitespace inside each text is collapsed and cues without text are
+        dropped; cues are sorted by start time if they are not already.
+        """
+        cues = []
+        for start, duration, text in events:
+            text = " ".join(text.split())
+            if text:
+                cues.append((int(start), max(int(duration), 0), text))
+        if any(cues[i][0] > cues[i + 1][0] for i in range(len(cues) - 1)):
+            cues.sort(key=lambda cue: cue[0])
+
+        starts = array("i", (cue[0] for cue in cues))
+        durations = array("i", (cue[1] for cue in cues))
+        offsets = array("I", [0])
+        for cue in cues:
+            offsets.append(offsets[-1] + len(cue[2]))
+        return cls(starts, durations, "".join(cue[2] for cue in cues), offsets)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, index: int) -> str:
+        return self._text[self._offsets[index] : self._offsets[index + 1]]
+
+    def cue(self, index: int) -> dict:
+        return {
+            "start_ms": self.starts[index],
+            "duration_ms": self.durations[index],
+            "text": self.text(index),
+        }
+
+    def transcript(self) -> str:
+        """Return the cue texts joined with spaces"""
+        return " ".join(self.text(i) for i in range(len(self)))
+
+    def window(self, start_ms: int, end_ms: int) -> Iterator[int]:
+        """
+        Yield the indices of cues overlapping [start_ms, end_ms], in O(log n + k).
+
+        A cue overlaps when it starts before end_ms and ends after start_ms.
+        """
+        first = bisect_right(self._max_ends, start_ms)
+        last = bisect_left(self.starts, end_ms)
+        for index in range(first, last):
+            if self.starts[index] + self.durations[index] > start_ms:
+                yield index
+
+    def to_events(self) -> list:
+        """Return the cues as [start_ms, duration_ms, text] triples"""
+        return [
+            [self.starts[i], self.durations[i], self.text(i)] for i in range(len(self))
+        ]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the track into a compact binary form"""
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, len(self)),
+                self.starts.tobytes(),
+                self.durations.tobytes(),
+                self._offsets.tobytes(),
+                self._text.encode("utf-8"),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CueTrack":
+        """Load a track written by to_bytes(), or a JSON list of event triples"""
+        if data[:1] == b"[":
+            return cls.from_events(json.loads(data))
+
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized cue track")
+        position = _HEADER.size
+        arrays = []
+        for typecode, length in (("i", count), ("i", count), ("I", count + 1)):
+            values = array(typecode)
+            size = values.itemsize * length
+            values.frombytes(data[position : position + size])
+            arrays.append(values)
+            position += size
+        starts, durations, offsets = arrays
+        return cls(starts, durations, data[position:].decode("utf-8"), offsets)
@@ -0,0 +1,219 @@
+"""
+Local bilingual dictionaries, answering word translations without the
+remote translator.
+
+A dictionary covers one language pair and lives in
+DICTIONARIES_DIR/<source>-<target>/ as three .npy files, written by
+scripts/build_dictionary.py:
+
+- keys.npy: an open-addressing hash table of 64-bit word hashes (0 marks an
+  empty slot), at most half full so probe sequences stay short;
+- entries.npy: for every slot, the number of its translation;
+- offsets.npy and text.npy: the translations, UTF-8 encoded back to back,
+  and where each one starts.
+
+Words themselves are not stored, only their hashes, which keeps a 100k-word
+dictionary to a few megabytes. The files are memory-mapped when a dictionary
+is first used (or at warm-up), and a batch of words is looked up with
+vectorized probes: O(1) per word, whatever the dictionary size.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Optional
+
+from app.config import DICTIONARIES_DIR
+from app.services.lazy_import import lazy_import
+from app.services.translation_cache import normalize_text
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+KEYS_FILE = "keys.npy"
+ENTRIES_FILE = "entries.npy"
+OFFSETS_FILE = "offsets.npy"
+TEXT_FILE = "text.npy"
+INFO_FILE = "info.json"
+
+
+def normalize_word(word: str) -> str:
+    """The form words are looked up by: normalized whitespace, lower case"""
+    return normalize_text(word).lower()
+
+
+def word_hash(word: str) -> int:
+    """64-bit hash of a normalized word; never 0, which marks empty slots"""
+    value = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+    return value or 1
+
+
+class DictionaryIndex:
+    """Translations of one language pair, looked up by word hash"""
+
+    def __init__(self, keys, entries, offsets, text, info: dict = None):
+        self.keys = keys
+        self.entries = entries
+        self.offsets = offsets
+        self.text = text
+        self.info = info or {}
+        self._mask = len(keys) - 1
+
+    @classmethod
+    def load(cls, directory: str) -> "DictionaryIndex":
+        """Memory-map a dictionary written by build()"""
+        arrays = [
+            np.load(os.path.join(directory, name), mmap_mode="r")
+            for name in (KEYS_FILE, ENTRIES_FILE, OFFSETS_FILE, TEXT_FILE)
+        ]
+        keys, entries = arrays[0], arrays[1]
+        if len(keys) & (len(keys) - 1) or keys.shape != entries.shape:
+            raise ValueError(f"{directory}: not a dictionary index")
+        info = {}
+        info_path = os.path.join(directory, INFO_FILE)
+        if os.path.exists(info_path):
+            with open(info_path, encoding="utf-8") as file:
+                info = json.load(file)
+        return cls(*arrays, info)
+
+    @staticmethod
+    def build(translations: dict, directory: str, source: str = "") -> "DictionaryIndex":
+        """
+        Write a dictionary and load it.
+
+        The files are replaced one by one, so rebuild a dictionary while no
+        server is starting, and restart servers to pick it up.
+
+        Args:
+            translations: Translation by word; words are normalized with normalize_word()
+            directory: Where to write the dictionary
+            source: Description of the word list, kept in info.json
+
+        Returns:
+            DictionaryIndex: The dictionary just written
+        """
+        merged = {}
+        for word, translated in translations.items():
+            word = normalize_word(word)
+            translated = translated.strip()
+            if word and translated:
+                merged.setdefault(word, translated)
+        if not merged:
+            raise ValueError("No translations to write")
+
+        # At most half full, and a power of two so a mask finds the first slot
+        size = 1 << max(4, (2 * len(merged) - 1).bit_length())
+        mask = size - 1
+        keys = [0] * size
+        entries = [0] * size
+        offsets = [0]
+        encoded = []
+        for number, (word, translated) in enumerate(merged.items()):
+            key = word_hash(word)
+            slot = key & mask
+            while keys[slot]:
+                slot = (slot + 1) & mask
+            keys[slot] = key
+            entries[slot] = number
+            data = translated.encode("utf-8")
+            encoded.append(data)
+            offsets.append(offsets[-1] + len(data))
+
+        arrays = {
+            KEYS_FILE: np.array(keys, dtype=np.uint64),
+            ENTRIES_FILE: np.array(entries, dtype=np.uint32),
+            OFFSETS_FILE: np.array(offsets, dtype=np.uint64),
+            TEXT_FILE: np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        }
+        info = {"words": len(merged), "slots": size, "source": source, "built_at": time.time()}
+
+        os.makedirs(directory, exist_ok=True)
+        for name, array in arrays.items():
+            partial = os.path.join(directory, name + ".part")
+            with open(partial, "wb") as file:
+                np.save(file, array)
+            os.replace(partial, os.path.join(directory, name))
+        with open(os.path.join(directory, INFO_FILE), "w", encoding="utf-8") as file:
+            json.dump(info, file)
+        return DictionaryIndex.load(directory)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def lookup(self, words: list) -> list:
+        """
+        Translate many words at once.
+
+        Args:
+            words: Words to look up, in any case
+
+        Returns:
+            list: The translation of each word, or None where the dictionary has none
+        """
+        if not words:
+            return []
+        hashes = np.fromiter(
+            (word_hash(normalize_word(word)) for word in words), dtype=np.uint64, count=len(words)
+        )
+        slots = (hashes & np.uint64(self._mask)).astype(np.int64)
+        matched = np.full(len(words), -1, dtype=np.int64)
+        pending = np.arange(len(words))
+        # Every word probes its run of slots in step with the others, until it
+        # meets its hash or an empty slot; the table is never full, so this ends
+        while len(pending):
+            found = self.keys[slots[pending]]
+            hit = found == hashes[pending]
+            matched[pending[hit]] = slots[pending[hit]]
+            pending = pending[(found != 0) & ~hit]
+            slots[pending] = (slots[pending] + 1) & self._mask
+
+        results = [None] * len(words)
+        hits = np.flatnonzero(matched >= 0)
+        numbers = self.entries[matched[hits]].astype(np.int64)
+        starts = self.offsets[numbers].tolist()
+        ends = self.offsets[numbers + 1].tolist()
+        for index, start, end in zip(hits.tolist(), starts, ends):
+            results[index] = self.text[start:end].tobytes().decode("utf-8")
+        return results
+
+
+def _directories() -> list:
+    if not os.path.isdir(DICTIONARIES_DIR):
+        return []
+    return sorted(
+        name
+        for name in os.listdir(DICTIONARIES_DIR)
+        if os.path.exists(os.path.join(DICTIONARIES_DIR, name, KEYS_FILE))
+    )
+
+
+@lru_cache(maxsize=None)
+def _load(name: str) -> Optional[DictionaryIndex]:
+    directory = os.path.join(DICTIONARIES_DIR, name)
+    if not os.path.exists(os.path.join(directory, KEYS_FILE)):
+        return None
+    try:
+        return DictionaryIndex.load(directory)
+    except (OSError, ValueError) as e:
+        # Words are still translated, only remotely
+        logger.warning("Dictionary %s could not be loaded: %s", name, e)
+        return None
+
+
+def get_dictionary(source_language: str, target_language: str) -> Optional[DictionaryIndex]:
+    """
+    Get the dictionary of a language pair, mapping it on first use.
+
+    Returns:
+        DictionaryIndex: The dictionary, or None if there is none for the pair
+    """
+    return _load(f"{source_language.lower()}-{target_language.lower()}")
+
+
+def preload_dictionaries() -> int:
+    """Map every dictionary in DICTIONARIES_DIR now; returns their total word count"""
+    return sum(len(dictionary) for dictionary in map(_load, _directories()) if dictionary is not None)
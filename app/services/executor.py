@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from fastapi import Request
+
+from app.config import BLOCKING_POOL_SIZE, DISCONNECT_POLL_INTERVAL
+
+
+class StageTimeoutError(Exception):
+    """Raised when a blocking stage does not finish within its timeout"""
+
+    def __init__(self, stage: str, timeout: float):
+        self.stage = stage
+        self.timeout = timeout
+        super().__init__(
+            f"The {stage} step took longer than {timeout:g} seconds. Please try again later."
+        )
+
+
+class ClientDisconnectedError(Exception):
+    """Raised when the client goes away while a blocking stage is running"""
+
+
+# Bounded pool for yt-dlp and subtitle downloads, so slow videos never run on the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=BLOCKING_POOL_SIZE, thread_name_prefix="subtitles-worker"
+)
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args: Any,
+    stage: str = "request",
+    timeout: Optional[float] = None,
+    request: Optional[Request] = None,
+) -> Any:
+    """
+    Run a blocking call on the shared thread pool and await its result.
+
+    Args:
+        func: The synchronous callable to run
+        *args: Positional arguments for func
+        stage: Human-readable name of the stage, used in timeout errors
+        timeout: Seconds to wait before giving up (None waits forever)
+        request: If given, stop waiting as soon as this client disconnects
+
+    Returns:
+        The return value of func
+
+    Raises:
+        StageTimeoutError: If the call did not finish in time
+        ClientDisconnectedError: If the client disconnected first
+
+    Note:
+        Threads cannot be interrupted, so a call that has already started keeps
+        running to completion; a call still waiting in the queue is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context (e.g. the request's stage timings) into the worker thread
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(_executor, functools.partial(context.run, func, *args))
+    watcher = (
+        asyncio.ensure_future(_wait_for_disconnect(request))
+        if request is not None
+        else None
+    )
+
+    try:
+        waiters = {future} if watcher is None else {future, watcher}
+        done, _ = await asyncio.wait(
+            waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if future in done:
+            return future.result()
+
+        future.cancel()
+        if watcher is not None and watcher in done:
+            raise ClientDisconnectedError()
+        raise StageTimeoutError(stage, timeout)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+# Marks the end of an iterate_blocking() stream
+_END = object()
+
+
+async def iterate_blocking(
+    func: Callable[..., Iterable],
+    *args: Any,
+    stage: str = "request",
+    timeout: Optional[float] = None,
+    request: Optional[Request] = None,
+) -> AsyncIterator[Any]:
+    """
+    Run a blocking generator on the shared thread pool and yield its items as
+    they are produced.
+
+    The generator runs in one worker thread from start to end, so context
+    managers inside it (HTTP responses, extraction slots) behave as usual.
+
+    Args:
+        func: Callable returning the iterable to run
+        *args: Positional arguments for func
+        stage: Human-readable name of the stage, used in timeout errors
+        timeout: Seconds allowed for the whole iteration (None waits forever)
+        request: If given, stop as soon as this client disconnects
+
+    Raises:
+        StageTimeoutError: If the iteration did not finish in time
+        ClientDisconnectedError: If the client disconnected first
+        Exception: Whatever the generator raised
+
+    Note:
+        If the consumer stops early, the generator is closed after the item it
+        is producing, in its own thread.
+    """
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def publish(item: Any, error: Optional[BaseException] = None) -> None:
+        try:
+            loop.call_soon_threadsafe(items.put_nowait, (item, error))
+        except RuntimeError:
+            # The event loop is closed; nobody is listening any more
+            pass
+
+    def produce() -> None:
+        iterator = iter(func(*args))
+        try:
+            for item in iterator:
+                if stop.is_set():
+                    break
+                publish(item)
+        except Exception as e:
+            publish(_END, e)
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        publish(_END)
+
+    # Carry the caller's context (e.g. the request's stage timings) into the worker thread
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(_executor, functools.partial(context.run, produce))
+    deadline = None if timeout is None else loop.time() + timeout
+    watcher = (
+        asyncio.ensure_future(_wait_for_disconnect(request))
+        if request is not None
+        else None
+    )
+
+    try:
+        while True:
+            getter = asyncio.ensure_future(items.get())
+            waiters = {getter} if watcher is None else {getter, watcher}
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait(
+                waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if getter not in done:
+                getter.cancel()
+                if watcher is not None and watcher in done:
+                    raise ClientDisconnectedError()
+                raise StageTimeoutError(stage, timeout)
+
+            item, error = getter.result()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        future.cancel()
+        if watcher is not None:
+            watcher.cancel()
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+
+def shutdown_executor() -> None:
+    """Stop accepting work and drop queued calls (used on application shutdown)"""
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,198 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import (
+    HTTP_POOL_SIZE,
+    HTTP_PER_HOST_LIMIT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_BACKOFF_JITTER,
+    HTTP_RETRY_MAX_WAIT,
+    HTTP_CONNECT_TIMEOUT,
+    SUBTITLE_DOWNLOAD_TIMEOUT,
+)
+from app.services.metrics import register_stats
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _CappedRetry(Retry):
+    """Retry policy that never sleeps longer than max_wait, whatever Retry-After asks for"""
+
+    def __init__(self, *args, max_wait: float = 10.0, **kwargs):
+        kwargs.setdefault("backoff_max", max_wait)
+        super().__init__(*args, **kwargs)
+        self.max_wait = max_wait
+
+    def new(self, **kwargs) -> "_CappedRetry":
+        retry = super().new(**kwargs)
+        retry.max_wait = self.max_wait
+        return retry
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        # A "Retry-After: 3600" would otherwise hold a worker and an extraction slot for an hour
+        return min(retry_after, self.max_wait)
+
+
+class HttpClient:
+    """
+    Process-wide HTTP client for subtitle track downloads.
+
+    Keeps connections alive in a shared pool, retries 429/5xx responses and
+    connection errors with jittered exponential backoff (honouring Retry-After
+    up to max_retry_wait seconds), and caps the number of concurrent requests per host.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 32,
+        per_host_limit: int = 8,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        max_retry_wait: float = 10.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 20.0,
+    ):
+        self.per_host_limit = per_host_limit
+        self.timeout = (connect_timeout, read_timeout)
+
+        retry = _CappedRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            max_wait=max_retry_wait,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._host_slots: dict = {}
+        self._in_flight: dict = {}
+        self._requests = 0
+        self._retries = 0
+        self._errors = 0
+
+    @contextmanager
+    def stream(self, url: str, timeout: Optional[float] = None) -> Iterator[requests.Response]:
+        """
+        GET a URL and yield the streamed response, holding one of the host's
+        connection slots until the block exits.
+
+        Args:
+            url: URL to fetch
+            timeout: Read timeout override in seconds
+
+        Yields:
+            requests.Response: The response, with the body not yet read
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors, timeouts
+                or when no host slot frees up within the connect timeout
+        """
+        host = urlsplit(url).netloc
+        slots = self._slots_for(host)
+        if not slots.acquire(timeout=self.timeout[0]):
+            raise requests.exceptions.ConnectionError(
+                f"Too many concurrent connections to {host}"
+            )
+
+        with self._lock:
+            self._requests += 1
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        try:
+            response = self.session.get(
+                url,
+                stream=True,
+                timeout=(self.timeout[0], timeout or self.timeout[1]),
+            )
+            retries = getattr(response.raw, "retries", None)
+            if retries is not None and retries.history:
+                with self._lock:
+                    self._retries += len(retries.history)
+            with response:
+                yield response
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight[host] -= 1
+            slots.release()
+
+    def get(self, url: str, timeout: Optional[float] = None) -> requests.Response:
+        """GET a URL and return the response with its body fully read"""
+        with self.stream(url, timeout=timeout) as response:
+            response.content  # Read the body before the host slot is released
+            return response
+
+    def stats(self) -> dict:
+        """Return request counters and per-host connection pool statistics"""
+        pools = {}
+        for key in list(self._adapter.poolmanager.pools.keys()):
+            pool = self._adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            pools[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": sum(
+                    1 for conn in list(pool.pool.queue) if conn is not None
+                )
+                if pool.pool is not None
+                else 0,
+            }
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "errors": self._errors,
+                "in_flight": {host: n for host, n in self._in_flight.items() if n},
+                "pools": pools,
+            }
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        self.session.close()
+
+    def _slots_for(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slots
+            return slots
+
+
+http_client = HttpClient(
+    pool_size=HTTP_POOL_SIZE,
+    per_host_limit=HTTP_PER_HOST_LIMIT,
+    max_retries=HTTP_MAX_RETRIES,
+    backoff_factor=HTTP_BACKOFF_FACTOR,
+    backoff_jitter=HTTP_BACKOFF_JITTER,
+    max_retry_wait=HTTP_RETRY_MAX_WAIT,
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    read_timeout=SUBTITLE_DOWNLOAD_TIMEOUT,
+)
+register_stats("http_client", http_client.stats, counters=("requests", "retries", "errors"))
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
+from app.config import JOB_WORKERS, JOB_QUEUE_SIZE, JOB_RESULT_TTL
+from app.services.metrics import register_stats
+from app.services.subtitle_service import SubtitleService
+from app.services.translation_service import get_shared_translation_service
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Progress of an extraction job at each stage it reaches
+METADATA_FETCHED = 0.3
+CAPTION_DOWNLOADING = 0.6
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: dict
+    key: str
+    status: str = QUEUED
+    progress: float = 0.0
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def _run_extract(job: Job) -> dict:
+    # A stored track skips straight to the end; a new one reports the video
+    # info, then the first parsed cues, then completion once it is stored
+    for event, data in SubtitleService.iter_track(
+        job.params["video_url"], job.params["language_code"], batch_size=500, with_info=False
+    ):
+        if event == "info":
+            job.progress = max(job.progress, METADATA_FETCHED)
+        elif event == "cues":
+            job.progress = max(job.progress, CAPTION_DOWNLOADING)
+        elif event == "error":
+            raise RuntimeError(data)
+        elif event == "track":
+            break
+    else:
+        raise RuntimeError("An unexpected error occurred. Please try again later or contact support.")
+    return {
+        "subtitle_text": data.text,
+        "video_url": job.params["video_url"],
+        "language_code": job.params["language_code"],
+    }
+
+
+def _run_translate(job: Job) -> dict:
+    return get_shared_translation_service().translate(
+        job.params["text"],
+        source_language=job.params["source_lang"],
+        target_language=job.params["target_lang"],
+    )
+
+
+JOB_HANDLERS: dict = {
+    "extract": _run_extract,
+    "translate": _run_translate,
+}
+
+
+class JobManager:
+    """
+    In-process job queue with a pool of worker threads.
+
+    Identical submissions (same kind and parameters) share one job while it is
+    queued, running or holding a successful result. Finished jobs are kept for
+    result_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue: int = 100,
+        result_ttl: float = 3600.0,
+        handlers: Optional[dict] = None,
+    ):
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.handlers: dict = handlers if handlers is not None else JOB_HANDLERS
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._jobs: dict = {}
+        self._by_key: dict = {}
+        self._lock = threading.Lock()
+        self._threads: list = []
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        if self._threads:
+            return
+        # Each start gets its own stop flag, so workers of an earlier start
+        # that are still finishing a job exit instead of joining this pool
+        self._stopping = threading.Event()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, args=(self._stopping,), name=f"job-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """
+        Ask every worker to exit once its current job is done, without waiting.
+
+        Jobs still queued are not run: they fail with an error saying so.
+        """
+        self._stopping.set()
+        cancelled = []
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                cancelled.append(job)
+        for job in cancelled:
+            job.error = "The server stopped before the job could run. Please submit it again."
+            self._finish(job, FAILED)
+        for _ in self._threads:
+            # Wakes an idle worker; busy ones see the stop flag when their job is done
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        self._threads = []
+
+    def submit(self, kind: str, params: dict) -> Job:
+        """
+        Queue a job, or return the existing job for identical parameters.
+
+        Raises:
+            KeyError: If kind has no registered handler
+            JobQueueFullError: If the queue is at capacity
+        """
+        if kind not in self.handlers:
+            raise KeyError(kind)
+
+        key = hashlib.sha256(
+            json.dumps([kind, params], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        with self._lock:
+            self._purge_expired()
+            existing = self._jobs.get(self._by_key.get(key))
+            if existing is not None:
+                return existing
+
+            job = Job(id=uuid.uuid4().hex, kind=kind, params=params, key=key)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise JobQueueFullError(
+                    "Too many jobs are waiting. Please try again later."
+                )
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, or None if it is unknown or expired"""
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """Return queue depth, worker count and jobs by status"""
+        with self._lock:
+            by_status: dict = {}
+            for job in self._jobs.values():
+                by_status[job.status] = by_status.get(job.status, 0) + 1
+            return {
+                "queue_depth": self._queue.qsize(),
+                "workers": len(self._threads),
+                "jobs": by_status,
+            }
+
+    def _work(self, stopping: threading.Event) -> None:
+        while not stopping.is_set():
+            job = self._queue.get()
+            if job is None:
+                # A wake-up from stop(); one left over from an earlier stop() is skipped
+                continue
+
+            job.status = RUNNING
+            handler: Callable[[Job], Any] = self.handlers[job.kind]
+            try:
+                job.result = handler(job)
+                job.progress = 1.0
+                status = SUCCEEDED
+            except HTTPException as e:
+                job.error = str(e.detail)
+                status = FAILED
+            except Exception as e:
+                job.error = str(e)
+                status = FAILED
+            self._finish(job, status)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        if status == FAILED:
+            # Let an identical submission retry instead of replaying the failure
+            with self._lock:
+                if self._by_key.get(job.key) == job.id:
+                    del self._by_key[job.key]
+        job.done.set()
+
+    def _purge_expired(self) -> None:
+        # Caller must hold self._lock
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job
+            for job in self._jobs.values()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job in expired:
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) == job.id:
+                del self._by_key[job.key]
+
+
+job_manager = JobManager(
+    workers=JOB_WORKERS, max_queue=JOB_QUEUE_SIZE, result_ttl=JOB_RESULT_TTL
+)
+register_stats("jobs", job_manager.stats)
@@ -0,0 +1,124 @@
+"""
+Incremental parsing of YouTube json3 subtitle tracks.
+
+The json3 body is consumed chunk by chunk and only the current event is ever
+decoded, so peak memory stays proportional to the cleaned transcript instead
+of a multiple of the raw track.
+"""
+
+import codecs
+import json
+import re
+from typing import Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+# Drop already-consumed input once this many characters have been parsed
+_COMPACT_THRESHOLD = 1 << 16
+
+
+class _StreamReader:
+    """Character buffer over a stream of UTF-8 byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer; return False at end of stream"""
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_THRESHOLD:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of stream)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos : self.pos + 1]
+
+    def next_char(self) -> str:
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def expect(self, expected: str) -> None:
+        char = self.next_char()
+        if char != expected:
+            raise ValueError(f"Malformed json3 track: expected {expected!r}, got {char!r}")
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut off at the end of the buffer may continue in the next chunk
+            if (
+                end < len(self.buffer) and self.buffer[end] not in _NUMBER_CHARS
+            ) or not self.fill():
+                self.pos = end
+                return value
+
+
+def iter_json3_events(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Yield the entries of a json3 track's "events" array one at a time.
+
+    Args:
+        chunks: The raw response body as an iterable of byte chunks
+
+    Yields:
+        dict: One json3 event
+
+    Raises:
+        ValueError: If the body is not a well-formed json3 document
+    """
+    reader = _StreamReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "events" and reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    separator = reader.next_char()
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError("Malformed json3 track: bad events array")
+        else:
+            reader.value()
+
+        separator = reader.next_char()
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError("Malformed json3 track: bad top-level object")
+
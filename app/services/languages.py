@@ -0,0 +1,42 @@
+"""
+Display names for subtitle language codes.
+
+The table in app/data/languages.json covers every ISO 639-1 language plus the
+regional, script and legacy codes YouTube uses for caption tracks (pt-BR,
+zh-Hans, es-419, iw, fil, ...). It is read once, on the first lookup.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+LANGUAGES_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "languages.json")
+
+
+@lru_cache(maxsize=1)
+def _language_table() -> dict:
+    with open(LANGUAGES_FILE, encoding="utf-8") as file:
+        names = json.load(file)
+    # YouTube is not consistent about case ("zh-Hans", "zh-CN", "zh-cn")
+    return {code.lower(): name for code, name in names.items()}
+
+
+def language_name(language_code: str) -> str:
+    """
+    Get the display name of a language code.
+
+    Unknown regional variants fall back to their base language, and unknown
+    languages to the upper-cased code.
+
+    Args:
+        language_code: Language code as listed by YouTube, e.g. "en", "pt-BR"
+
+    Returns:
+        str: The language name
+    """
+    table = _language_table()
+    code = language_code.lower()
+    name = table.get(code)
+    if name is None:
+        name = table.get(code.split("-")[0], language_code.upper())
+    return name
@@ -0,0 +1,56 @@
+"""
+Deferred imports of heavy dependencies.
+
+yt-dlp and googletrans take a noticeable part of the start-up time of a
+worker, yet most requests (pages, stored transcripts, search) never touch
+them. lazy_import() returns a stand-in that imports the module the first
+time one of its attributes is used; the warm-up hook loads them all ahead of
+the first request.
+"""
+
+import importlib
+from types import ModuleType
+
+# Every stand-in handed out, by module name
+_registry: dict = {}
+
+
+class LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    # The stand-in's own names are underscored so they never shadow the module's (numpy.load)
+    def _import(self) -> ModuleType:
+        """Import the module now if it was not imported yet"""
+        if self._module is None:
+            # The import system serializes concurrent imports of one module
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def _imported(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._import(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._imported else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Get the stand-in for a module, shared by every caller"""
+    if name not in _registry:
+        _registry[name] = LazyModule(name)
+    return _registry[name]
+
+
+def load_all() -> list:
+    """Import every module handed out by lazy_import(); returns their names"""
+    for module in list(_registry.values()):
+        module._import()
+    return list(_registry)
@@ -0,0 +1,139 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional
+
+
+class MetadataCache:
+    """
+    Thread-safe LRU cache with TTL expiry, short-lived negative entries and
+    single-flight loading: concurrent lookups of the same missing key share
+    one call to the loader instead of each starting their own.
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 900.0, negative_ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # key -> (expires_at, value, error)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._in_flight: dict = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        is_negative: Optional[Callable[[Any], bool]] = None,
+        is_cacheable_error: Optional[Callable[[Exception], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the value
+            is_negative: Returns True for values that should only be cached
+                for the negative TTL (e.g. a video without subtitles)
+            is_cacheable_error: Returns True for loader errors that should be
+                remembered for the negative TTL (e.g. a private video)
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            Exception: The loader's error, either fresh or from a negative entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, error = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    if error is not None:
+                        raise _fresh(error)
+                    return value
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self._misses += 1
+                owner = True
+
+        if not owner:
+            error = future.exception()
+            if error is not None:
+                raise _fresh(error)
+            return future.result()
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                if is_cacheable_error is not None and is_cacheable_error(e):
+                    self._store(key, None, _fresh(e), self.negative_ttl)
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        negative = is_negative is not None and is_negative(value)
+        with self._lock:
+            self._store(key, value, None, self.negative_ttl if negative else self.ttl)
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry from the cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size of the cache"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._in_flight),
+            }
+
+    def _store(self, key: Hashable, value: Any, error: Optional[Exception], ttl: float) -> None:
+        # Caller must hold self._lock
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value, error)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def _fresh(error: Exception) -> Exception:
+    """
+    A copy of a shared error for one caller to raise.
+
+    Raising the same instance from every hit and every thread would keep
+    growing its __traceback__ and let concurrent raisers mutate it.
+    """
+    try:
+        return copy.copy(error)
+    except Exception:
+        # An exception that cannot be rebuilt from its args is shared as before
+        return error
@@ -0,0 +1,266 @@
+"""
+In-process metrics in the Prometheus text format, and per-request stage timings.
+
+Counters, gauges and histograms live in REGISTRY and are rendered by the
+/metrics endpoint. stage() times one step of a request: it feeds the stage
+histogram, error counter and in-flight gauge, and records the duration for
+the request's Server-Timing header. Components that already keep their own
+counters (caches, the HTTP client, the job queue) expose them through
+register_stats() instead of being instrumented again.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Iterator, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in values]
+
+
+class Gauge(Counter):
+    """A value per label set that can go up and down"""
+
+    kind = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    """Observations counted in cumulative buckets, with their sum and count"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues) -> None:
+        # Buckets are stored non-cumulatively and summed up when rendered
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            values = sorted((labels, (list(counts), total, count)) for labels, (counts, total, count) in self._values.items())
+        lines = []
+        for labels, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(float(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the application's metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: list = []
+        self._collectors: list = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collect: Callable[[], Iterable[tuple]]) -> None:
+        """
+        Register a callable run at every scrape.
+
+        It returns (name, kind, help, value) tuples, where kind is "counter" or "gauge".
+        """
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for name, kind, help_text, value in collect():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "subtitles_stage_duration_seconds", "Time spent in each processing stage", ("stage",)
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "subtitles_stage_errors_total", "Errors raised inside a processing stage, by type", ("stage", "error")
+)
+STAGE_IN_FLIGHT = REGISTRY.gauge(
+    "subtitles_stage_in_flight", "Processing stages currently running", ("stage",)
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "subtitles_http_request_duration_seconds",
+    "Time to the end of the response, by route",
+    ("method", "route", "status"),
+)
+
+# Stage timings of the current request: stage name -> [seconds, calls]
+_request_timings: ContextVar[Optional[dict]] = ContextVar("request_timings", default=None)
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    """Record a stage duration measured by the caller"""
+    STAGE_SECONDS.observe(seconds, name)
+    timings = _request_timings.get()
+    if timings is not None:
+        entry = timings.get(name)
+        if entry is None:
+            timings[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a processing stage and count the errors raised inside it"""
+    STAGE_IN_FLIGHT.inc(name)
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        STAGE_ERRORS.inc(name, type(e).__name__)
+        raise
+    finally:
+        STAGE_IN_FLIGHT.dec(name)
+        observe_stage(name, time.perf_counter() - started)
+
+
+def start_request_trace() -> tuple:
+    """
+    Start collecting stage timings for the current request.
+
+    Returns:
+        tuple: (token for end_request_trace(), dict filled with {stage: [seconds, calls]})
+    """
+    timings = {}
+    return _request_timings.set(timings), timings
+
+
+def end_request_trace(token) -> None:
+    """Stop collecting stage timings for the current request"""
+    _request_timings.reset(token)
+
+
+def server_timing_header(timings: dict, total: float) -> str:
+    """Format stage timings as a Server-Timing header value"""
+    entries = []
+    for name, (seconds, calls) in timings.items():
+        entry = f"{name};dur={seconds * 1000:.1f}"
+        if calls > 1:
+            entry += f';desc="{calls} calls"'
+        entries.append(entry)
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def register_stats(prefix: str, stats: Callable[[], dict], counters: tuple = ()) -> None:
+    """
+    Expose a component's stats() dict at every scrape.
+
+    Numeric keys become gauges named subtitles_<prefix>_<key>, or counters
+    with a _total suffix for the keys listed in counters. Non-numeric values
+    are skipped. If the stats have "hits" and "misses", a hit_ratio gauge is
+    added.
+    """
+
+    def collect() -> Iterator[tuple]:
+        values = stats()
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key in counters:
+                yield f"subtitles_{prefix}_{key}_total", "counter", f"{prefix} {key}", value
+            else:
+                yield f"subtitles_{prefix}_{key}", "gauge", f"{prefix} {key}", value
+        if "hits" in values and "misses" in values:
+            lookups = values["hits"] + values.get("persistent_hits", 0) + values["misses"]
+            hits = lookups - values["misses"]
+            yield (
+                f"subtitles_{prefix}_hit_ratio",
+                "gauge",
+                f"{prefix} share of lookups served from the cache",
+                hits / lookups if lookups else 0.0,
+            )
+
+    REGISTRY.register_collector(collect)
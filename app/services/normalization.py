@@ -0,0 +1,184 @@
+"""
+Transcript normalization as a pipeline of precompiled stages.
+
+A pipeline runs its stages over one caption segment (the text of one json3
+event) at a time, in a single pass: each segment goes through every stage
+before the next one is read, and a stage that leaves nothing drops the
+segment. Stages are looked up by name in STAGES, so the pipeline used for
+extraction is configured with NORMALIZATION_STAGES and new rules are added
+by registering another stage.
+
+Tracks are stored normalized, along with the signature of the pipeline that
+cleaned them, so changing the stages (or the version of a stage) makes the
+stored tracks stale.
+"""
+
+import re
+from typing import Callable, Iterable, Iterator, Optional
+
+from app.config import NORMALIZATION_STAGES
+
+CREDIT_MARKERS = ("Transcriber:", "Reviewer:")
+
+
+class Stage:
+    """A normalization rule applied to each segment"""
+
+    name = ""
+    # Bump when a change to the rule changes its output, so stored tracks are re-normalized
+    version = 1
+    # Track kinds ("manual", "auto") the stage applies to; None for every track
+    kinds: Optional[tuple] = None
+
+    def start(self) -> Callable[[str], str]:
+        """Return the function applied to the segments of one track"""
+        return self.apply
+
+    def apply(self, text: str) -> str:
+        raise NotImplementedError
+
+
+class RegexStage(Stage):
+    """Replaces every match of a pattern compiled once, when the stage is created"""
+
+    def __init__(self, name: str, pattern: str, replacement: str = ""):
+        self.name = name
+        self.pattern = re.compile(pattern)
+        self.replacement = replacement
+
+    def apply(self, text: str) -> str:
+        return self.pattern.sub(self.replacement, text)
+
+
+class WhitespaceStage(RegexStage):
+    """Collapses whitespace runs, newlines included, into single spaces and strips the segment"""
+
+    def __init__(self):
+        super().__init__("whitespace", r"\s+", " ")
+
+    def apply(self, text: str) -> str:
+        return self.pattern.sub(" ", text).strip()
+
+
+class RollingCaptionStage(Stage):
+    """
+    Drops lines repeated from the previous segment, as in roll-up captions
+    where each cue shows the last line again ("A\\nB", "B\\nC", ...) or grows
+    the previous line word by word ("Hello there", "Hello there world").
+
+    Only automatic captions roll up, so manual tracks are left alone. A
+    segment that only repeats earlier lines is kept ("No." answered with
+    "No."), and a line only counts as grown from the previous one when that
+    one has at least MIN_PREFIX_WORDS words ("I", "I think so" is kept).
+    """
+
+    name = "rolling_dedupe"
+    version = 2
+    kinds = ("auto",)
+    MIN_PREFIX_WORDS = 2
+
+    def start(self) -> Callable[[str], str]:
+        previous = []
+
+        def apply(text: str) -> str:
+            nonlocal previous
+            lines = [line.strip() for line in text.split("\n")]
+            lines = [line for line in lines if line]
+            if not lines:
+                return ""
+
+            overlap = min(len(lines), len(previous))
+            while overlap and lines[:overlap] != previous[-overlap:]:
+                overlap -= 1
+            if overlap == len(lines):
+                # Nothing new: the speaker said the same thing again
+                overlap = 0
+            remaining = lines[overlap:]
+            if previous and not overlap:
+                last = previous[-1]
+                if len(last.split()) >= self.MIN_PREFIX_WORDS and remaining[0].startswith(last + " "):
+                    remaining[0] = remaining[0][len(last) + 1 :]
+
+            previous = lines
+            return "\n".join(remaining)
+
+        return apply
+
+
+STAGES: dict = {
+    # A credit runs to the end of its line, which inside a segment is the end of the segment at the latest
+    "credits": lambda: RegexStage(
+        "credits",
+        "(?:" + "|".join(re.escape(marker) for marker in CREDIT_MARKERS) + r")[^\n]*\n?",
+    ),
+    # Non-speech annotations such as [Music], [Applause] and music notes
+    "sound_tags": lambda: RegexStage("sound_tags", r"\[[^\[\]\n]*\]|[♪♫]+"),
+    "rolling_dedupe": RollingCaptionStage,
+    "whitespace": WhitespaceStage,
+}
+
+
+class NormalizationPipeline:
+    """An ordered list of stages run over each segment of a track"""
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages = list(stages)
+
+    @property
+    def signature(self) -> str:
+        """The stages and their versions, e.g. "credits.1,whitespace.1", stored with every track"""
+        return ",".join(f"{stage.name}.{stage.version}" for stage in self.stages)
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> "NormalizationPipeline":
+        """
+        Build a pipeline from stage names registered in STAGES.
+
+        Raises:
+            ValueError: If a name is not registered
+        """
+        stages = []
+        for name in names:
+            if name not in STAGES:
+                raise ValueError(
+                    f"Unknown normalization stage {name!r}; available: {', '.join(STAGES)}"
+                )
+            stages.append(STAGES[name]())
+        return cls(stages)
+
+    def start(self, kind: Optional[str] = None) -> Callable[[str], str]:
+        """
+        Return a function normalizing the segments of one track, in order.
+
+        Stages may keep state between the segments of a track, so call
+        start() again for every track. The function returns "" for a
+        segment that should be dropped.
+
+        Args:
+            kind: "manual" or "auto"; stages limited to other kinds are skipped
+        """
+        steps = [
+            stage.start()
+            for stage in self.stages
+            if kind is None or stage.kinds is None or kind in stage.kinds
+        ]
+
+        def normalize(text: str) -> str:
+            for step in steps:
+                text = step(text)
+                if not text:
+                    return ""
+            return text
+
+        return normalize
+
+    def normalize(self, segments: Iterable[str], kind: Optional[str] = None) -> Iterator[str]:
+        """Yield the normalized, non-empty segments of one track"""
+        normalize = self.start(kind)
+        for text in segments:
+            text = normalize(text)
+            if text:
+                yield text
+
+
+default_pipeline = NormalizationPipeline.from_names(NORMALIZATION_STAGES)
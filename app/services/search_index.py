@@ -0,0 +1,290 @@
+import html
+import logging
+import re
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import DATABASE_URL, SEARCH_INDEX_ENABLED, SEARCH_PASSAGE_MS
+from app.models.database import get_engine, create_session_factory
+from app.models.search_document import SearchDocument
+from app.services.cue_track import CueTrack
+
+logger = logging.getLogger(__name__)
+
+# Passage rowids are (document id << PASSAGE_BITS) | passage number, so all
+# passages of a document form one rowid range
+PASSAGE_BITS = 20
+MAX_PASSAGES = 1 << PASSAGE_BITS
+
+_CREATE_PASSAGES = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_passages USING fts5("
+    "text, start_ms UNINDEXED, end_ms UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+_RANK_DOCUMENTS = text(
+    f"""
+    SELECT d.id, d.video_id, d.language_code, d.title, hits.best, hits.matches
+    FROM (
+        SELECT rowid >> {PASSAGE_BITS} AS document_id, MIN(rank) AS best, COUNT(*) AS matches
+        FROM search_passages WHERE search_passages MATCH :query
+        GROUP BY document_id
+    ) AS hits
+    JOIN search_documents AS d ON d.id = hits.document_id
+    WHERE :language_code IS NULL OR d.language_code = :language_code
+    ORDER BY hits.best, d.id
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+_DOCUMENT_HITS = text(
+    """
+    SELECT start_ms, end_ms, snippet(search_passages, 0, char(2), char(3), '…', 16)
+    FROM search_passages
+    WHERE search_passages MATCH :query AND rowid BETWEEN :first AND :last
+    ORDER BY rank
+    LIMIT :limit
+    """
+)
+
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+# snippet() marks matches with control characters that never occur in
+# captions, so the text can be escaped before the marks become HTML
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+
+def highlight(snippet: str) -> str:
+    """Turn a snippet from _DOCUMENT_HITS into HTML, with matches in <mark> tags"""
+    escaped = html.escape(snippet, quote=False)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def to_match_query(query: str) -> Optional[str]:
+    """
+    Turn user input into an FTS5 query that matches passages containing every
+    term. Double-quoted parts are kept together as phrases; FTS5 operators and
+    punctuation in the input are treated as plain text.
+
+    Returns:
+        str: The FTS5 query, or None if the input has no terms
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(query):
+        term = (phrase or word).replace('"', "").strip()
+        if term:
+            terms.append(f'"{term}"')
+    return " ".join(terms) or None
+
+
+def build_passages(cues: CueTrack, passage_ms: int = SEARCH_PASSAGE_MS) -> list:
+    """
+    Group consecutive cues into passages spanning about passage_ms each.
+
+    Returns:
+        list: (start_ms, end_ms, text) tuples in time order
+    """
+    passages = []
+    texts = []
+    start = end = 0
+    for index in range(len(cues)):
+        cue_start = cues.starts[index]
+        if texts and cue_start - start >= passage_ms:
+            passages.append((start, end, " ".join(texts)))
+            texts = []
+        if not texts:
+            start = end = cue_start
+        texts.append(cues.text(index))
+        end = max(end, cue_start + cues.durations[index])
+    if texts:
+        passages.append((start, end, " ".join(texts)))
+    return passages
+
+
+class SearchIndex:
+    """
+    Full-text index of extracted transcripts in an SQLite FTS5 table.
+
+    Each transcript is split into timed passages so hits carry timestamps.
+    Indexing is incremental: a transcript whose content hash has not changed
+    is skipped, and a changed one replaces only its own passages. Database
+    errors while indexing are logged, so indexing never breaks an extraction.
+    """
+
+    enabled = True
+
+    def __init__(self, database_url: str, passage_ms: int = SEARCH_PASSAGE_MS):
+        self.database_url = database_url
+        self.passage_ms = passage_ms
+        self._session_factory = None
+        self._lock = threading.Lock()
+
+    def index_track(
+        self,
+        video_id: str,
+        language_code: str,
+        cues: CueTrack,
+        content_hash: str,
+        title: Optional[str] = None,
+    ) -> bool:
+        """
+        Add or update the passages of a transcript.
+
+        Args:
+            video_id: YouTube video ID
+            language_code: Language code of the transcript
+            cues: Timed cues of the transcript
+            content_hash: Hash of the transcript text, used to skip unchanged transcripts
+            title: Video title, if known
+
+        Returns:
+            bool: True if the index changed
+        """
+        try:
+            with self._session() as session:
+                document = session.scalar(
+                    select(SearchDocument).where(
+                        SearchDocument.video_id == video_id,
+                        SearchDocument.language_code == language_code,
+                    )
+                )
+                if document is not None and document.content_hash == content_hash:
+                    if title and document.title != title:
+                        document.title = title
+                        session.commit()
+                    return False
+
+                if document is None:
+                    document = SearchDocument(video_id=video_id, language_code=language_code)
+                    session.add(document)
+                document.content_hash = content_hash
+                document.indexed_at = time.time()
+                if title:
+                    document.title = title
+                session.flush()
+
+                first = document.id << PASSAGE_BITS
+                session.execute(
+                    text("DELETE FROM search_passages WHERE rowid BETWEEN :first AND :last"),
+                    {"first": first, "last": first + MAX_PASSAGES - 1},
+                )
+                passages = build_passages(cues, self.passage_ms)[:MAX_PASSAGES]
+                if passages:
+                    session.execute(
+                        text(
+                            "INSERT INTO search_passages (rowid, text, start_ms, end_ms) "
+                            "VALUES (:rowid, :text, :start_ms, :end_ms)"
+                        ),
+                        [
+                            {"rowid": first + number, "text": body, "start_ms": start, "end_ms": end}
+                            for number, (start, end, body) in enumerate(passages)
+                        ],
+                    )
+                session.commit()
+            return True
+        except SQLAlchemyError as e:
+            logger.warning("Search indexing failed for %s/%s: %s", video_id, language_code, e)
+            return False
+
+    def search(
+        self,
+        query: str,
+        language_code: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        hits_per_video: int = 3,
+    ) -> list:
+        """
+        Find the transcripts matching a query, best match first.
+
+        Args:
+            query: FTS5 query, see to_match_query()
+            language_code: Only search transcripts in this language
+            limit: Maximum number of videos returned
+            offset: Number of videos to skip, for paging
+            hits_per_video: Maximum number of timed hits returned per video
+
+        Returns:
+            list: One dict per video with its best timed hits and snippets
+
+        Raises:
+            SQLAlchemyError: If the index cannot be queried
+        """
+        results = []
+        with self._session() as session:
+            documents = session.execute(
+                _RANK_DOCUMENTS,
+                {"query": query, "language_code": language_code, "limit": limit, "offset": offset},
+            ).all()
+            for document_id, video_id, language, title, best, matches in documents:
+                first = document_id << PASSAGE_BITS
+                hits = session.execute(
+                    _DOCUMENT_HITS,
+                    {
+                        "query": query,
+                        "first": first,
+                        "last": first + MAX_PASSAGES - 1,
+                        "limit": hits_per_video,
+                    },
+                ).all()
+                results.append(
+                    {
+                        "video_id": video_id,
+                        "language_code": language,
+                        "title": title,
+                        # FTS5 rank (bm25) is lower for better matches
+                        "score": -best,
+                        "matches": matches,
+                        "hits": [
+                            {
+                                "start_ms": start_ms,
+                                "end_ms": end_ms,
+                                "snippet": highlight(snippet),
+                                "url": f"https://www.youtube.com/watch?v={video_id}&t={start_ms // 1000}s",
+                            }
+                            for start_ms, end_ms, snippet in hits
+                        ],
+                    }
+                )
+        return results
+
+    def _session(self):
+        # Connect lazily so importing the service never touches the database
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    engine = get_engine(self.database_url)
+                    session_factory = create_session_factory(engine, SearchDocument)
+                    with engine.begin() as connection:
+                        connection.execute(text(_CREATE_PASSAGES))
+                    self._session_factory = session_factory
+        return self._session_factory()
+
+
+class _DisabledIndex:
+    enabled = False
+
+    def index_track(
+        self,
+        video_id: str,
+        language_code: str,
+        cues: CueTrack,
+        content_hash: str,
+        title: Optional[str] = None,
+    ) -> bool:
+        return False
+
+    def search(self, query: str, *args, **kwargs) -> list:
+        return []
+
+
+search_index = (
+    SearchIndex(DATABASE_URL)
+    if SEARCH_INDEX_ENABLED and DATABASE_URL.startswith("sqlite")
+    else _DisabledIndex()
+)
@@ -0,0 +1,128 @@
+"""
+Subtitle download formats, written on the fly from a track's timed cues.
+
+Each writer is a generator of text chunks, so a download is streamed as it
+is formatted instead of being written to a file first. Cues are formatted
+in batches to keep the number of chunks (and of sends to the client) low.
+"""
+
+import io
+import json
+import zipfile
+from typing import Iterator, Optional
+
+from app.services.cue_track import CueTrack
+
+# Cues formatted per chunk
+CUES_PER_CHUNK = 512
+
+
+def _timestamp(ms: int, separator: str) -> str:
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+
+def _batches(cues: CueTrack) -> Iterator[range]:
+    for first in range(0, len(cues), CUES_PER_CHUNK):
+        yield range(first, min(first + CUES_PER_CHUNK, len(cues)))
+
+
+def write_srt(cues: CueTrack, video_id: str, language_code: str) -> Iterator[str]:
+    starts, durations = cues.starts, cues.durations
+    for batch in _batches(cues):
+        yield "".join(
+            f"{i + 1}\n{_timestamp(starts[i], ',')} --> {_timestamp(starts[i] + durations[i], ',')}\n"
+            f"{cues.text(i)}\n\n"
+            for i in batch
+        )
+
+
+def write_vtt(cues: CueTrack, video_id: str, language_code: str) -> Iterator[str]:
+    yield f"WEBVTT\nKind: captions\nLanguage: {language_code}\n\n"
+    starts, durations = cues.starts, cues.durations
+    for batch in _batches(cues):
+        yield "".join(
+            f"{_timestamp(starts[i], '.')} --> {_timestamp(starts[i] + durations[i], '.')}\n"
+            # Cue text may hold markup in WebVTT; captions are plain text
+            f"{cues.text(i).replace('&', '&amp;').replace('<', '&lt;')}\n\n"
+            for i in batch
+        )
+
+
+def write_json(cues: CueTrack, video_id: str, language_code: str) -> Iterator[str]:
+    yield json.dumps({"video_id": video_id, "language_code": language_code})[:-1] + ', "cues": ['
+    starts, durations = cues.starts, cues.durations
+    for batch in _batches(cues):
+        yield ("," if batch.start else "") + ",".join(
+            json.dumps({"start_ms": starts[i], "duration_ms": durations[i], "text": cues.text(i)})
+            for i in batch
+        )
+    yield "]}"
+
+
+def write_txt(cues: CueTrack, video_id: str, language_code: str) -> Iterator[str]:
+    # The same text as the transcript shown in the page
+    for batch in _batches(cues):
+        yield (" " if batch.start else "") + " ".join(cues.text(i) for i in batch)
+
+
+# Format name -> (writer, media type, file extension)
+FORMATS = {
+    "srt": (write_srt, "application/x-subrip; charset=utf-8", "srt"),
+    "vtt": (write_vtt, "text/vtt", "vtt"),
+    "json": (write_json, "application/json", "json"),
+    "txt": (write_txt, "text/plain", "txt"),
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that collects what zipfile writes until it is taken"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def write_zip(
+    tracks: dict, video_id: str, format: str, errors: Optional[dict] = None, name: Optional[str] = None
+) -> Iterator[bytes]:
+    """
+    Stream a ZIP archive with one file per track.
+
+    The archive is written to an unseekable sink, so zipfile puts each
+    entry's sizes after its data and nothing has to be buffered beyond the
+    chunk being compressed.
+
+    Args:
+        tracks: Language code -> CueTrack
+        video_id: Video ID, used in the file names
+        format: Name of the file format in FORMATS
+        errors: Language code -> error message, added as errors.json if not empty
+        name: Prefix of the file names (default: video_id)
+    """
+    writer, _, extension = FORMATS[format]
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for language_code, cues in tracks.items():
+            with archive.open(f"{name or video_id}_{language_code}.{extension}", "w") as entry:
+                for chunk in writer(cues, video_id, language_code):
+                    entry.write(chunk.encode("utf-8"))
+                    data = sink.take()
+                    if data:
+                        yield data
+        if errors:
+            archive.writestr("errors.json", json.dumps(errors, ensure_ascii=False, indent=2))
+    yield sink.take()
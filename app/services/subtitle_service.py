@@ -1,75 +1,289 @@
 import re
-import os
-import tempfile
+import time
+from contextlib import ExitStack
+from typing import Optional
 import requests
-import yt_dlp
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import (
+    METADATA_CACHE_SIZE,
+    METADATA_CACHE_TTL,
+    METADATA_CACHE_NEGATIVE_TTL,
+    SUBTITLE_CHUNK_SIZE,
+    YTDLP_SOCKET_TIMEOUT,
+)
+from app.services.admission import UpstreamBusyError, extraction_gate
+from app.services.http_client import http_client
+from app.services.json3_parser import iter_json3_events
+from app.services.lazy_import import lazy_import
+from app.services.languages import language_name
+from app.services.metadata_cache import MetadataCache
+from app.services.metrics import observe_stage, register_stats, stage
+from app.services.normalization import default_pipeline
+from app.services.cue_track import CueTrack
+from app.services.search_index import search_index, to_match_query
+from app.services.subtitle_store import StoredTrack, subtitle_store
+from app.services.vocabulary import analyze, get_frequency_table
+
+VIDEO_ID_PATTERN = re.compile(
+    r"(?:v=|youtu\.be/|/shorts/|/embed/|/live/|/v/)([A-Za-z0-9_-]{11})"
+)
+BARE_VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+# YouTube lists the automatic captions of the spoken language again as "<code>-orig"
+ORIGINAL_SUFFIX = "-orig"
+
+# Imported on first use, or by the warm-up hook
+yt_dlp = lazy_import("yt_dlp")
+
+# One cache for every entry point, keyed by the canonical video ID
+_metadata_cache = MetadataCache(
+    max_size=METADATA_CACHE_SIZE,
+    ttl=METADATA_CACHE_TTL,
+    negative_ttl=METADATA_CACHE_NEGATIVE_TTL,
+)
+
+register_stats("metadata_cache", _metadata_cache.stats, counters=("hits", "misses", "coalesced"))
+
+
+class _DownloadSlot:
+    """
+    The extraction slot of one caption download.
+
+    It is kept across consecutive reads of the body and only handed back while
+    cues are yielded to the caller, so a slow caller does not hold it.
+    """
+
+    def __init__(self):
+        self._stack = ExitStack()
+        self.held = False
+
+    def hold(self, resume: bool = True) -> None:
+        if not self.held:
+            self._stack.enter_context(extraction_gate.slot(resume=resume))
+            self.held = True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self._stack.close()
+
+
+def _gated(chunks, slot: _DownloadSlot):
+    """Yield from chunks, reading each one while holding the download's slot"""
+    iterator = iter(chunks)
+    while True:
+        # Resumed, so a download already under way waits instead of being rejected
+        slot.hold()
+        chunk = next(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _timed(chunks, elapsed: list):
+    """Yield from chunks, adding the time spent waiting for each one to elapsed[0]"""
+    iterator = iter(chunks)
+    while True:
+        started = time.perf_counter()
+        chunk = next(iterator, None)
+        elapsed[0] += time.perf_counter() - started
+        if chunk is None:
+            return
+        yield chunk
 
 
 class SubtitleService:
     @staticmethod
-    def get_available_languages(video_url: str) -> tuple[dict, str]:
+    def ydl_factory(options: dict):
+        """Build the yt-dlp client; offline benchmarks swap in a stand-in with the same interface"""
+        return yt_dlp.YoutubeDL(options)
+
+    @staticmethod
+    def get_video_id(video_url: str) -> str:
         """
-        Get available subtitle languages for a YouTube video URL.
+        Get the canonical video ID for a YouTube URL or bare video ID.
 
         Args:
-            video_url: URL of the YouTube video
+            video_url: URL of the YouTube video or its 11-character ID
 
         Returns:
-            tuple: (languages_dict, error_message)
-                languages_dict: Dictionary with language codes as keys and language names as values
-                error_message: Error message if any
+            str: The video ID, or the stripped input if no ID could be found
         """
-        try:
+        video_url = video_url.strip()
+        if BARE_VIDEO_ID_PATTERN.match(video_url):
+            return video_url
+        match = VIDEO_ID_PATTERN.search(video_url)
+        return match.group(1) if match else video_url
+
+    @staticmethod
+    def _get_video_info(video_url: str) -> dict:
+        """
+        Get the yt-dlp info dict for a video, served from the shared metadata cache.
+
+        Only the video page is fetched: yt-dlp does not resolve the formats
+        (no DASH/HLS manifests, no player JS), so the dict holds the title,
+        the manual and automatic caption tracks and the unprocessed formats.
+        Concurrent calls for the same video share one in-flight extraction.
+        Private/unavailable videos and videos without any caption track are
+        cached for a shorter negative TTL.
+
+        Raises:
+            yt_dlp.DownloadError: If yt-dlp could not extract the video info
+        """
+        video_id = SubtitleService.get_video_id(video_url)
+        if BARE_VIDEO_ID_PATTERN.match(video_id):
+            # Drops playlist and timestamp parameters, which unprocessed extraction would follow
+            video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+        def load() -> dict:
             ydl_opts = {
-                "listsubtitles": True,
+                "quiet": True,
+                "no_warnings": True,
                 "skip_download": True,
+                "socket_timeout": YTDLP_SOCKET_TIMEOUT,
+                "extractor_args": {"youtube": {"skip": ["dash", "hls"], "player_skip": ["js"]}},
             }
+            with extraction_gate.slot(), stage("ytdlp_extract"), SubtitleService.ydl_factory(ydl_opts) as ydl:
+                return ydl.extract_info(video_url, download=False, process=False)
+
+        # Every lookup is timed, so repeated lookups in one request show up as calls
+        with stage("metadata"):
+            return _metadata_cache.get_or_load(
+                video_id,
+                load,
+                is_negative=lambda info: not info.get("subtitles") and not info.get("automatic_captions"),
+                is_cacheable_error=SubtitleService._is_permanent_error,
+            )
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-
-            available_subtitles = info.get("subtitles", {})
-
-            if not available_subtitles:
-                return {}, "No subtitles are available for this video."
-
-            # Language codes mapping (this is a simplified version, could be expanded)
-            language_names = {
-                "en": "English",
-                "es": "Spanish",
-                "fr": "French",
-                "de": "German",
-                "it": "Italian",
-                "pt": "Portuguese",
-                "ru": "Russian",
-                "ja": "Japanese",
-                "ko": "Korean",
-                "zh": "Chinese",
-                "ar": "Arabic",
-                "hi": "Hindi",
-                # Add more language codes as needed
-            }
+    @staticmethod
+    def _is_permanent_error(error: Exception) -> bool:
+        """Check whether a yt-dlp error is worth remembering (private/unavailable video)"""
+        if not isinstance(error, yt_dlp.DownloadError):
+            return False
+        message = str(error)
+        return any(
+            marker in message
+            for marker in ("Private video", "This video is unavailable", "Video unavailable")
+        )
+
+    @staticmethod
+    def _select_track(info: dict, language_code: str) -> tuple[str, list]:
+        """
+        Pick the caption track for a language: the manual one if the video has
+        it, otherwise the automatic captions.
 
-            # Create a dictionary of available languages with their names
-            languages_dict = {}
-            for lang_code in available_subtitles.keys():
-                languages_dict[lang_code] = language_names.get(
-                    lang_code, lang_code.upper()
+        Returns:
+            tuple: (kind, formats), kind being "manual", "auto" or None if there is no track
+        """
+        formats = (info.get("subtitles") or {}).get(language_code)
+        if formats:
+            return "manual", formats
+        automatic = info.get("automatic_captions") or {}
+        # The spoken language may only be listed as "<code>-orig"
+        formats = automatic.get(language_code) or automatic.get(f"{language_code}{ORIGINAL_SUFFIX}")
+        if formats:
+            return "auto", formats
+        return None, []
+
+    @staticmethod
+    def _list_tracks(info: dict) -> list:
+        """List the caption tracks of an info dict, manual tracks first"""
+        tracks = []
+        for kind, key in (("manual", "subtitles"), ("auto", "automatic_captions")):
+            for lang_code, formats in (info.get(key) or {}).items():
+                if not formats:
+                    continue
+                tracks.append(
+                    {
+                        "language_code": lang_code,
+                        "name": language_name(lang_code),
+                        "kind": kind,
+                        # Automatic captions machine-translated from the spoken language
+                        "translated": any("tlang=" in f.get("url", "") for f in formats),
+                        "formats": [f.get("ext") for f in formats if f.get("ext")],
+                    }
                 )
+        return tracks
 
-            return languages_dict, None
+    @staticmethod
+    def get_available_tracks(video_url: str) -> tuple[list, str]:
+        """
+        Get every caption track of a YouTube video, manual and automatic.
 
+        Args:
+            video_url: URL of the YouTube video
+
+        Returns:
+            tuple: (tracks, error_message)
+                tracks: List of dicts with language_code, name, kind ("manual" or
+                "auto"), translated and formats (the available file extensions)
+                error_message: Error message if any
+        """
+        try:
+            tracks = SubtitleService._list_tracks(SubtitleService._get_video_info(video_url))
+            if not tracks:
+                return [], "No subtitles are available for this video."
+            return tracks, None
+
+        except UpstreamBusyError:
+            # Answered with 429 and Retry-After by the app
+            raise
         except yt_dlp.DownloadError as e:
             return (
-                {},
+                [],
                 f"An error occurred while extracting video info: {str(e)}. Please check the video URL.",
             )
         except Exception as e:
             return (
-                {},
+                [],
                 f"An unexpected error occurred: {str(e)}. Please try again later.",
             )
 
+    @staticmethod
+    def _language_names(tracks: list) -> dict:
+        """Language code -> display name for the tracks of _list_tracks()"""
+        languages_dict = {}
+        for track in tracks:
+            if track["translated"]:
+                continue
+            language_code = track["language_code"]
+            if language_code.endswith(ORIGINAL_SUFFIX):
+                # The captions of the spoken language, listed again under their base code
+                language_code = language_code[: -len(ORIGINAL_SUFFIX)]
+            # Manual tracks come first and win over automatic captions
+            if language_code in languages_dict:
+                continue
+            name = language_name(language_code)
+            if track["kind"] == "auto":
+                name = f"{name} (auto-generated)"
+            languages_dict[language_code] = name
+        return languages_dict
+
+    @staticmethod
+    def get_available_languages(video_url: str) -> tuple[dict, str]:
+        """
+        Get available subtitle languages for a YouTube video URL.
+
+        Languages with only automatic captions are included and marked as
+        auto-generated; machine-translated captions are left out.
+
+        Args:
+            video_url: URL of the YouTube video
+
+        Returns:
+            tuple: (languages_dict, error_message)
+                languages_dict: Dictionary with language codes as keys and language names as values
+                error_message: Error message if any
+        """
+        tracks, error_message = SubtitleService.get_available_tracks(video_url)
+        if error_message:
+            return {}, error_message
+
+        languages_dict = SubtitleService._language_names(tracks)
+        if not languages_dict:
+            return {}, "No subtitles are available for this video."
+        return languages_dict, None
+
     @staticmethod
     def extract_subtitles(video_url: str, language_code: str = "en") -> tuple[str, str]:
         """
@@ -82,104 +296,320 @@ class SubtitleService:
         Returns:
             tuple: (subtitle_text, error_message)
         """
-        try:
-            ydl_opts = {
-                "writesubtitles": True,
-                "subtitleslangs": [language_code],
-                "skip_download": True,
-            }
+        track, error_message = SubtitleService._load_track(video_url, language_code)
+        return (track.text if track else None), error_message
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
+    @staticmethod
+    def get_track(video_url: str, language_code: str = "en") -> tuple[StoredTrack, str]:
+        """
+        Get a video's subtitle track in the specified language: its text, timed
+        cues and content hash.
 
-            subtitles = info.get("subtitles", {}).get(language_code, [])
-            if not subtitles:
-                return (
-                    None,
-                    f"No subtitles in {language_code} are available for this video. Please try another language.",
-                )
+        Args:
+            video_url: URL of the YouTube video
+            language_code: Language code for subtitles (default: "en" for English)
 
-            subtitle_url = subtitles[0]["url"]
-            response = requests.get(subtitle_url)
-            if response.status_code != 200:
-                return (
-                    None,
-                    f"Failed to retrieve subtitles (HTTP {response.status_code}). Please try again later.",
-                )
+        Returns:
+            tuple: (track, error_message)
+        """
+        return SubtitleService._load_track(video_url, language_code)
 
-            subtitle_data = response.json()
-            text_lines = []
-            for event in subtitle_data.get("events", []):
-                for segment in event.get("segs", []):
-                    text = segment.get("utf8", "").strip()
-                    if text:
-                        text_lines.append(text)
+    @staticmethod
+    def get_content_hash(video_url: str, language_code: str = "en") -> Optional[str]:
+        """
+        Get the content hash of a stored subtitle track without loading it.
 
-            subtitle_text = " ".join(text_lines)
-            subtitle_text = re.sub(
-                r"Transcriber:.*?\n|Reviewer:.*?\n", "", subtitle_text
-            )
-            subtitle_text = re.sub(r"\n", " ", subtitle_text)
-            subtitle_text = re.sub(r"\s{2,}", " ", subtitle_text)
+        Args:
+            video_url: URL of the YouTube video
+            language_code: Language code for subtitles
 
-            return (
-                subtitle_text.strip(),
-                None,
-            )
+        Returns:
+            str: The hash of the track get_track() would return, or None if it is not stored
+        """
+        return subtitle_store.get_content_hash(
+            SubtitleService.get_video_id(video_url), language_code
+        )
+
+    @staticmethod
+    def get_cues(video_url: str, language_code: str = "en") -> tuple[CueTrack, str]:
+        """
+        Get the timed cues of a video's subtitles in the specified language.
 
+        Args:
+            video_url: URL of the YouTube video
+            language_code: Language code for subtitles (default: "en" for English)
+
+        Returns:
+            tuple: (cue_track, error_message)
+        """
+        track, error_message = SubtitleService._load_track(video_url, language_code)
+        return (track.cues if track else None), error_message
+
+    @staticmethod
+    def iter_track(
+        video_url: str, language_code: str = "en", batch_size: int = 200, with_info: bool = True
+    ):
+        """
+        Load a subtitle track like get_track(), reporting each stage as it completes.
+
+        Args:
+            video_url: URL of the YouTube video
+            language_code: Language code for subtitles
+            batch_size: Cues per "cues" item
+            with_info: Fetch the video info even when the track is stored
+
+        Yields:
+            tuple: (event, data), in this order:
+                ("info", {"title": ..., "languages": {...}}) once the video info is known
+                ("cues", [(start_ms, duration_ms, text), ...]) for every batch of parsed cues
+                ("track", StoredTrack) when the track is complete, or ("error", message)
+        """
+        yield from SubtitleService._iter_load(video_url, language_code, with_info, batch_size)
+
+    @staticmethod
+    def _load_track(video_url: str, language_code: str) -> tuple[StoredTrack, str]:
+        """
+        Load a subtitle track from the store, or download, parse and store it.
+
+        Returns:
+            tuple: (track, error_message)
+        """
+        for event, data in SubtitleService._iter_load(video_url, language_code):
+            if event == "track":
+                return data, None
+            if event == "error":
+                return None, data
+        return None, "An unexpected error occurred. Please try again later or contact support."
+
+    @staticmethod
+    def _info_summary(info: dict) -> dict:
+        return {
+            "title": info.get("title"),
+            "languages": SubtitleService._language_names(SubtitleService._list_tracks(info)),
+        }
+
+    @staticmethod
+    def _iter_load(
+        video_url: str, language_code: str, with_info: bool = False, batch_size: int = 0
+    ):
+        """
+        The stages of _load_track() as a generator (see iter_track()).
+
+        Without with_info, a stored track is returned without fetching the video
+        info. Without batch_size, no "cues" items are produced.
+        """
+        try:
+            video_id = SubtitleService.get_video_id(video_url)
+            info = None
+            if with_info:
+                info = SubtitleService._get_video_info(video_url)
+                yield "info", SubtitleService._info_summary(info)
+
+            with stage("store_read"):
+                stored = subtitle_store.get(video_id, language_code, "manual") or subtitle_store.get(
+                    video_id, language_code, "auto"
+                )
+            if stored is not None:
+                # Stored tracks were indexed when they were put
+                if batch_size:
+                    cues = stored.cues
+                    for first in range(0, len(cues), batch_size):
+                        yield "cues", [
+                            (cues.starts[i], cues.durations[i], cues.text(i))
+                            for i in range(first, min(first + batch_size, len(cues)))
+                        ]
+                yield "track", stored
+                return
+
+            if info is None:
+                info = SubtitleService._get_video_info(video_url)
+                yield "info", SubtitleService._info_summary(info)
+
+            kind, formats = SubtitleService._select_track(info, language_code)
+            if not formats:
+                yield (
+                    "error",
+                    f"No subtitles in {language_code} are available for this video. Please try another language.",
+                )
+                return
+
+            # The parser reads json3; the other formats are only a fallback for odd listings
+            subtitle_url = next((f for f in formats if f.get("ext") == "json3"), formats[0])["url"]
+            # Download and parsing are interleaved; the time spent waiting for
+            # the network is split out as caption_download, the rest is caption_parse
+            network = [0.0]
+            fetch_started = time.perf_counter()
+            with ExitStack() as connection, stage("caption_fetch"):
+                # The extraction slot is held while the request is sent and the body
+                # is read, never while cues are handed to the caller
+                slot = _DownloadSlot()
+                connection.callback(slot.release)
+                slot.hold(resume=False)
+                response = connection.enter_context(http_client.stream(subtitle_url))
+                network[0] = time.perf_counter() - fetch_started
+                if response.status_code != 200:
+                    slot.release()
+                    yield (
+                        "error",
+                        f"Failed to retrieve subtitles (HTTP {response.status_code}). Please try again later.",
+                    )
+                    return
+
+                # Cues are normalized one at a time while the track is parsed
+                normalize = default_pipeline.start(kind)
+                events = []
+                reported = 0
+                for event in iter_json3_events(
+                    _gated(_timed(response.iter_content(chunk_size=SUBTITLE_CHUNK_SIZE), network), slot)
+                ):
+                    segments = event.get("segs")
+                    if not segments:
+                        continue
+                    text = normalize("".join(segment.get("utf8", "") for segment in segments))
+                    if text:
+                        events.append(
+                            (event.get("tStartMs", 0), event.get("dDurationMs", 0), text)
+                        )
+                        if batch_size and len(events) - reported >= batch_size:
+                            slot.release()
+                            yield "cues", events[reported:]
+                            reported = len(events)
+                slot.release()
+                if batch_size and len(events) > reported:
+                    yield "cues", events[reported:]
+
+                cues = CueTrack.from_events(events)
+            observe_stage("caption_download", network[0])
+            observe_stage("caption_parse", time.perf_counter() - fetch_started - network[0])
+
+            subtitle_text = cues.transcript()
+            with stage("store_write"):
+                track = subtitle_store.put(
+                    video_id, language_code, kind, subtitle_text, cues
+                ) or StoredTrack.create(subtitle_text, cues)
+            with stage("search_index"):
+                search_index.index_track(
+                    video_id, language_code, cues, track.content_hash, info.get("title")
+                )
+
+            yield "track", track
+
+        except UpstreamBusyError:
+            # Answered with 429 and Retry-After by the app
+            raise
         except yt_dlp.DownloadError as e:
-            return (
-                None,
+            yield (
+                "error",
                 f"An error occurred while extracting the video info: {str(e)}. Please check the video URL and try again.",
             )
 
         except requests.exceptions.RequestException as e:
-            return (
-                None,
+            yield (
+                "error",
                 f"An issue occurred while retrieving the subtitle file: {str(e)}. Please check your internet connection and try again.",
             )
 
         except KeyError as e:
-            return (
-                None,
+            yield (
+                "error",
                 f"Unexpected response format while processing subtitles. It seems like some data is missing or corrupted: {str(e)}.",
             )
 
         except Exception as e:
-            return (
-                None,
+            yield (
+                "error",
                 f"An unexpected error occurred: {str(e)}. Please try again later or contact support.",
             )
 
     @staticmethod
-    def create_subtitles_file(
-        subtitle_text: str, video_url: str, language_code: str = "en"
-    ) -> tuple[str, str]:
+    def search_transcripts(
+        query: str, language_code: str = None, page: int = 1, page_size: int = 10
+    ) -> tuple[dict, str]:
         """
-        Create a temporary subtitle file and return its path
+        Search all extracted transcripts.
 
         Args:
-            subtitle_text: The subtitle text content
-            video_url: Original video URL for naming
-            language_code: Language code for naming the file
+            query: Words to find; double-quoted parts are matched as phrases
+            language_code: Only search transcripts in this language (default: all)
+            page: 1-based page number
+            page_size: Number of videos per page
 
         Returns:
-            tuple: (file_path, filename)
-        """
-        # Create a temporary file
-        fd, path = tempfile.mkstemp(suffix=".txt")
-        with os.fdopen(fd, "w") as tmp:
-            tmp.write(subtitle_text)
-
-        # Extract video ID or use a default name
-        video_id = (
-            video_url.split("v=")[-1].split("&")[0]
-            if "v=" in video_url
-            else "subtitles"
-        )
-        filename = f"{video_id}_{language_code}_subtitles.txt"
+            tuple: (search_results, error_message)
+        """
+        if not search_index.enabled:
+            return None, "Search is disabled on this server."
+
+        match_query = to_match_query(query)
+        if match_query is None:
+            return None, "Please enter at least one word to search for."
 
-        return path, filename
+        try:
+            # One extra row tells whether another page exists
+            results = search_index.search(
+                match_query,
+                language_code=language_code,
+                limit=page_size + 1,
+                offset=(page - 1) * page_size,
+            )
+        except SQLAlchemyError as e:
+            return None, f"An error occurred while searching: {str(e)}. Please try again later."
+
+        return {
+            "query": query,
+            "page": page,
+            "page_size": page_size,
+            "has_more": len(results) > page_size,
+            "results": results[:page_size],
+        }, None
+
+    @staticmethod
+    def get_vocabulary(
+        video_url: str,
+        language_code: str = "en",
+        limit: int = 50,
+        max_zipf: float = 5.0,
+        min_count: int = 2,
+        include_unknown: bool = False,
+        phrase_limit: int = 20,
+    ) -> tuple[dict, str]:
+        """
+        Rank the words and key phrases of a video's transcript that are worth learning.
+
+        Args:
+            video_url: URL of the YouTube video
+            language_code: Language code for subtitles
+            limit: Number of words to return
+            max_zipf: Leave out words at least this common in the language
+            min_count: Leave out words used fewer times in the video
+            include_unknown: Also rank words missing from the frequency table
+            phrase_limit: Number of key phrases to return
+
+        Returns:
+            tuple: (vocabulary, error_message)
+        """
+        try:
+            table = get_frequency_table(language_code)
+        except (OSError, ValueError) as e:
+            return None, f"The word frequency table could not be read: {str(e)}"
+        if table is None:
+            return None, (
+                f"Vocabulary analysis is not available for {language_name(language_code)}: "
+                "no word frequency table was built for it."
+            )
+
+        track, error_message = SubtitleService._load_track(video_url, language_code)
+        if error_message:
+            return None, error_message
+
+        with stage("vocabulary_analysis"):
+            vocabulary = analyze(track.text, table, limit, max_zipf, min_count, include_unknown, phrase_limit)
+        return {
+            "video_id": SubtitleService.get_video_id(video_url),
+            "language_code": language_code,
+            "content_hash": track.content_hash,
+            **vocabulary,
+        }, None
 
     @staticmethod
     def get_video_title(video_url: str) -> str:
@@ -213,16 +643,8 @@ class SubtitleService:
                 video_id = video_url
                 url_to_use = f"https://www.youtube.com/watch?v={video_id}"
 
-            # Use yt-dlp to get video info including title
-            ydl_opts = {
-                "quiet": True,
-                "no_warnings": True,
-                "skip_download": True,
-                "extract_flat": True,
-            }
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url_to_use, download=False)
+            # Use the shared metadata cache to get video info including title
+            info = SubtitleService._get_video_info(url_to_use)
 
             # Return the video title
             video_title = info.get("title", f"YouTube Video ({video_id})")
@@ -241,3 +663,60 @@ class SubtitleService:
         except Exception as e:
             # For any other errors, return a generic title
             return f"YouTube Video ({video_id})"
+
+    @staticmethod
+    def expand_playlist(playlist_url: str) -> tuple[list, str]:
+        """
+        List the videos of a YouTube playlist or channel without resolving each one.
+
+        Args:
+            playlist_url: URL of the playlist or channel
+
+        Returns:
+            tuple: (video_urls, error_message)
+        """
+        try:
+            ydl_opts = {
+                "quiet": True,
+                "no_warnings": True,
+                "skip_download": True,
+                "extract_flat": "in_playlist",
+                "socket_timeout": YTDLP_SOCKET_TIMEOUT,
+            }
+
+            with extraction_gate.slot(), stage("playlist_expansion"), SubtitleService.ydl_factory(ydl_opts) as ydl:
+                info = ydl.extract_info(playlist_url, download=False)
+
+            video_urls = []
+            pending = list(info.get("entries") or [])
+            while pending:
+                entry = pending.pop(0)
+                if not entry:
+                    continue
+                # Channels list their tabs (videos, shorts, ...) as nested playlists
+                if entry.get("_type") == "playlist":
+                    pending.extend(entry.get("entries") or [])
+                    continue
+                if entry.get("id"):
+                    video_urls.append(f"https://www.youtube.com/watch?v={entry['id']}")
+                elif entry.get("url"):
+                    video_urls.append(entry["url"])
+
+            if not video_urls:
+                return [], "No videos were found in this playlist or channel."
+
+            return video_urls, None
+
+        except UpstreamBusyError:
+            # Answered with 429 and Retry-After by the app
+            raise
+        except yt_dlp.DownloadError as e:
+            return (
+                [],
+                f"An error occurred while extracting the playlist: {str(e)}. Please check the playlist URL.",
+            )
+        except Exception as e:
+            return (
+                [],
+                f"An unexpected error occurred: {str(e)}. Please try again later.",
+            )
@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import inspect, select, text as sql
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import DATABASE_URL, SUBTITLE_STORE_ENABLED, SUBTITLE_STORE_MAX_AGE
+from app.models.database import get_engine, create_session_factory
+from app.models.subtitle_track import SubtitleTrack
+from app.services.cue_track import CueTrack
+from app.services.normalization import default_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredTrack:
+    text: str
+    cues: CueTrack
+    content_hash: str
+    fetched_at: float
+
+    @classmethod
+    def create(cls, text: str, cues: CueTrack) -> "StoredTrack":
+        """Build a freshly fetched track, hashing its text"""
+        return cls(
+            text=text,
+            cues=cues,
+            content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            fetched_at=time.time(),
+        )
+
+
+class SubtitleStore:
+    """
+    Persistent store of downloaded subtitle tracks, keyed by
+    (video_id, language_code, kind).
+
+    Text and timed cues are stored zlib-compressed. Database errors are
+    logged and treated as a miss, so the store never breaks an extraction.
+    A track cleaned by another normalization pipeline than this store's is
+    stale, like one older than max_age.
+    """
+
+    def __init__(self, database_url: str, max_age: float = 0, normalization: str = ""):
+        self.database_url = database_url
+        self.max_age = max_age
+        self.normalization = normalization
+        self._session_factory = None
+        self._lock = threading.Lock()
+
+    def get(self, video_id: str, language_code: str, kind: str = "manual") -> Optional[StoredTrack]:
+        """
+        Get a stored track, or None if it is missing or stale.
+        """
+        try:
+            with self._session() as session:
+                row = session.get(SubtitleTrack, (video_id, language_code, kind))
+                if row is None or not self._is_fresh(row.fetched_at, row.normalization):
+                    return None
+                return StoredTrack(
+                    text=zlib.decompress(row.text).decode("utf-8"),
+                    cues=CueTrack.from_bytes(zlib.decompress(row.events)),
+                    content_hash=row.content_hash,
+                    fetched_at=row.fetched_at,
+                )
+        except (SQLAlchemyError, zlib.error, ValueError, struct.error) as e:
+            logger.warning("Subtitle store read failed for %s/%s: %s", video_id, language_code, e)
+            return None
+
+    def get_content_hash(self, video_id: str, language_code: str, kinds: tuple = ("manual", "auto")) -> Optional[str]:
+        """
+        Get the content hash of the first fresh stored track of the given
+        kinds, without reading the track itself.
+        """
+        try:
+            with self._session() as session:
+                rows = session.execute(
+                    select(
+                        SubtitleTrack.kind,
+                        SubtitleTrack.content_hash,
+                        SubtitleTrack.fetched_at,
+                        SubtitleTrack.normalization,
+                    ).where(
+                        SubtitleTrack.video_id == video_id,
+                        SubtitleTrack.language_code == language_code,
+                        SubtitleTrack.kind.in_(kinds),
+                    )
+                ).all()
+        except SQLAlchemyError as e:
+            logger.warning("Subtitle store read failed for %s/%s: %s", video_id, language_code, e)
+            return None
+
+        fresh = {
+            kind: content_hash
+            for kind, content_hash, fetched_at, normalization in rows
+            if self._is_fresh(fetched_at, normalization)
+        }
+        return next((fresh[kind] for kind in kinds if kind in fresh), None)
+
+    def iter_texts(self, language_code: str):
+        """
+        Yield the text of every stored track in a language, including its
+        regional variants ("en" also yields "en-GB" tracks).
+        """
+        with self._session() as session:
+            rows = session.execute(
+                select(SubtitleTrack.text).where(
+                    (SubtitleTrack.language_code == language_code)
+                    | SubtitleTrack.language_code.like(f"{language_code}-%")
+                )
+            )
+            for (text,) in rows:
+                yield zlib.decompress(text).decode("utf-8")
+
+    def put(
+        self, video_id: str, language_code: str, kind: str, text: str, cues: CueTrack
+    ) -> Optional[StoredTrack]:
+        """
+        Insert or replace a stored track.
+
+        Returns:
+            StoredTrack: The stored track, or None if the write failed
+        """
+        track = StoredTrack.create(text, cues)
+        try:
+            with self._session() as session:
+                session.merge(
+                    SubtitleTrack(
+                        video_id=video_id,
+                        language_code=language_code,
+                        kind=kind,
+                        text=zlib.compress(text.encode("utf-8")),
+                        events=zlib.compress(cues.to_bytes()),
+                        content_hash=track.content_hash,
+                        fetched_at=track.fetched_at,
+                        normalization=self.normalization,
+                    )
+                )
+                session.commit()
+            return track
+        except SQLAlchemyError as e:
+            logger.warning("Subtitle store write failed for %s/%s: %s", video_id, language_code, e)
+            return None
+
+    def _is_fresh(self, fetched_at: float, normalization: str) -> bool:
+        if normalization != self.normalization:
+            return False
+        return not self.max_age or time.time() - fetched_at <= self.max_age
+
+    def _session(self):
+        # Connect lazily so importing the service never touches the database
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    engine = get_engine(self.database_url)
+                    session_factory = create_session_factory(engine, SubtitleTrack)
+                    _add_normalization_column(engine)
+                    self._session_factory = session_factory
+        return self._session_factory()
+
+
+def _add_normalization_column(engine) -> None:
+    # Tables created before tracks recorded their normalization get the
+    # column; their tracks have an empty signature, so they read as stale
+    columns = {column["name"] for column in inspect(engine).get_columns(SubtitleTrack.__tablename__)}
+    if "normalization" not in columns:
+        with engine.begin() as connection:
+            connection.execute(
+                sql(
+                    f"ALTER TABLE {SubtitleTrack.__tablename__} "
+                    "ADD COLUMN normalization VARCHAR(255) NOT NULL DEFAULT ''"
+                )
+            )
+
+
+class _DisabledStore:
+    def get(self, video_id: str, language_code: str, kind: str = "manual") -> None:
+        return None
+
+    def get_content_hash(self, video_id: str, language_code: str, kinds: tuple = ("manual", "auto")) -> None:
+        return None
+
+    def iter_texts(self, language_code: str):
+        return iter(())
+
+    def put(self, video_id: str, language_code: str, kind: str, text: str, cues: CueTrack) -> None:
+        return None
+
+
+subtitle_store = (
+    SubtitleStore(DATABASE_URL, max_age=SUBTITLE_STORE_MAX_AGE, normalization=default_pipeline.signature)
+    if SUBTITLE_STORE_ENABLED
+    else _DisabledStore()
+)
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import (
+    DATABASE_URL,
+    TRANSLATION_CACHE_SIZE,
+    TRANSLATION_CACHE_PERSISTENT,
+)
+from app.models.database import get_engine, create_session_factory
+from app.models.translation_entry import TranslationEntry
+from app.services.metrics import register_stats
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookups: NFC, collapsed whitespace, stripped"""
+    return _WHITESPACE_RUN.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache keyed by (source_lang, target_lang, normalized-text hash).
+
+    An in-memory LRU tier sits in front of an optional persistent tier stored
+    in the application database. Database errors are logged and treated as a miss.
+    """
+
+    def __init__(self, max_size: int = 10000, database_url: Optional[str] = None):
+        self.max_size = max_size
+        self.database_url = database_url
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._session_factory = None
+        self._hits = 0
+        self._persistent_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(source_lang: str, target_lang: str, text: str) -> str:
+        normalized = normalize_text(text)
+        return hashlib.sha256(
+            f"{source_lang}\0{target_lang}\0{normalized}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, source_lang: str, target_lang: str, text: str) -> Optional[str]:
+        """Return the cached translation of text, or None on a miss"""
+        key = self.make_key(source_lang, target_lang, text)
+        with self._lock:
+            translated = self._entries.get(key)
+            if translated is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return translated
+
+        translated = self._load(key)
+        with self._lock:
+            if translated is None:
+                self._misses += 1
+                return None
+            self._persistent_hits += 1
+            self._remember(key, translated)
+        return translated
+
+    def put(self, source_lang: str, target_lang: str, text: str, translated: str) -> None:
+        """Cache the translation of text in every tier"""
+        key = self.make_key(source_lang, target_lang, text)
+        with self._lock:
+            self._remember(key, translated)
+        self._save(key, source_lang, target_lang, translated)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the size of the in-memory tier"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "persistent_hits": self._persistent_hits,
+                "misses": self._misses,
+            }
+
+    def _remember(self, key: str, translated: str) -> None:
+        # Caller must hold self._lock
+        if self.max_size <= 0:
+            return
+        self._entries[key] = translated
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[str]:
+        if self.database_url is None:
+            return None
+        try:
+            with self._session() as session:
+                row = session.get(TranslationEntry, key)
+                return row.translated if row is not None else None
+        except SQLAlchemyError as e:
+            logger.warning("Translation cache read failed: %s", e)
+            return None
+
+    def _save(self, key: str, source_lang: str, target_lang: str, translated: str) -> None:
+        if self.database_url is None:
+            return
+        try:
+            with self._session() as session:
+                session.merge(
+                    TranslationEntry(
+                        key=key,
+                        source_lang=source_lang,
+                        target_lang=target_lang,
+                        translated=translated,
+                        created_at=time.time(),
+                    )
+                )
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Translation cache write failed: %s", e)
+
+    def _session(self):
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    self._session_factory = create_session_factory(
+                        get_engine(self.database_url), TranslationEntry
+                    )
+        return self._session_factory()
+
+
+translation_cache = TranslationCache(
+    max_size=TRANSLATION_CACHE_SIZE,
+    database_url=DATABASE_URL if TRANSLATION_CACHE_PERSISTENT else None,
+)
+register_stats(
+    "translation_cache", translation_cache.stats, counters=("hits", "persistent_hits", "misses")
+)
@@ -1,10 +1,149 @@
-from fastapi import HTTPException
-from googletrans import Translator, LANGUAGES
+import contextvars
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from app.config import (
+    TRANSCRIPT_PARALLELISM,
+    TRANSCRIPT_RATE_LIMIT,
+    TRANSCRIPT_CHUNK_RETRIES,
+    TRANSLATOR_SERVICE_URLS,
+    TRANSLATOR_TIMEOUT,
+    TRANSLATOR_MAX_CONCURRENCY,
+    TRANSLATION_TIMEOUT,
+)
+from app.services.dictionary import get_dictionary
+from app.services.executor import run_blocking
+from app.services.lazy_import import lazy_import
+from app.services.metrics import stage
+from app.services.translation_cache import TranslationCache, translation_cache
+
+# Imported on first use, or by the warm-up hook
+googletrans = lazy_import("googletrans")
+
+# googletrans rejects longer inputs
+MAX_TEXT_LENGTH = 5000
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…。！？])\s+")
+
+# Chunks of every request run on one pool. Translator calls are bounded by
+# TRANSLATOR_MAX_CONCURRENCY anyway, so more threads would only wait
+_chunk_pool = ThreadPoolExecutor(
+    max_workers=max(1, TRANSLATOR_MAX_CONCURRENCY), thread_name_prefix="translator"
+)
+
+
+def split_into_segments(text: str, limit: int = MAX_TEXT_LENGTH) -> list:
+    """
+    Split text into sentences of at most limit characters; longer sentences
+    are broken on whitespace, then anywhere.
+
+    Args:
+        text: Text to split
+        limit: Maximum segment length
+
+    Returns:
+        list: Non-empty segments in order
+    """
+    segments = []
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        # Newlines separate segments when chunks are sent to the translator
+        sentence = sentence.replace("\n", " ")
+        if len(sentence) <= limit:
+            if sentence:
+                segments.append(sentence)
+            continue
+        for word in sentence.split():
+            while len(word) > limit:
+                segments.append(word[:limit])
+                word = word[limit:]
+            if word:
+                segments.append(word)
+    return segments
+
+
+def pack_chunks(segments: list, limit: int = MAX_TEXT_LENGTH, separator: str = " ") -> list:
+    """
+    Pack consecutive segments into chunks of at most limit characters.
+
+    Args:
+        segments: Segments no longer than limit
+        limit: Maximum chunk length, separators included
+        separator: String placed between segments of a chunk
+
+    Returns:
+        list: Lists of segments, one list per chunk
+    """
+    chunks = []
+    current = []
+    length = 0
+    for segment in segments:
+        if current and length + len(separator) + len(segment) > limit:
+            chunks.append(current)
+            current = []
+            length = 0
+        length += len(segment) + (len(separator) if current else 0)
+        current.append(segment)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads (rate <= 0 disables it)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
 
 
 class TranslationService:
-    def __init__(self):
-        self.translator = Translator()
+    def __init__(
+        self,
+        translator=None,
+        cache: TranslationCache = translation_cache,
+        max_concurrency: int = TRANSLATOR_MAX_CONCURRENCY,
+    ):
+        self.translator = (
+            translator
+            if translator is not None
+            else googletrans.Translator(service_urls=TRANSLATOR_SERVICE_URLS, timeout=TRANSLATOR_TIMEOUT)
+        )
+        self.cache = cache
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+
+    async def translate_async(
+        self,
+        text: str,
+        source_language: str = "en",
+        target_language: str = "uk",
+        request: Optional[Request] = None,
+    ) -> dict:
+        """Run translate() on the shared executor so the event loop is never blocked"""
+        return await run_blocking(
+            self.translate,
+            text,
+            source_language,
+            target_language,
+            stage="translation",
+            timeout=TRANSLATION_TIMEOUT,
+            request=request,
+        )
 
     def translate(
         self, text: str, source_language: str = "en", target_language: str = "uk"
@@ -27,33 +166,25 @@ class TranslationService:
                 )
 
             # Check text length
-            if len(text) > 5000:
+            if len(text) > MAX_TEXT_LENGTH:
                 raise HTTPException(
                     status_code=400,
                     detail="Please, try to enter fewer words - the translator limits are 5000 characters.",
                 )
 
-            # Check if source language code is valid
-            if source_language not in LANGUAGES:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Source language '{source_language}' is not supported.",
-                )
+            self._check_languages(source_language, target_language)
 
-            # Check if target language code is valid
-            if target_language not in LANGUAGES:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Target language '{target_language}' is not supported.",
-                )
+            cached = self.cache.get(source_language, target_language, text)
+            if cached is not None:
+                return {"original": text, "translated": cached}
 
-            translation = self.translator.translate(
-                text, src=source_language, dest=target_language
-            )
+            translation = self._call_translator(text, source_language, target_language)
 
             if not translation or not translation.text:
                 raise HTTPException(status_code=500, detail="Translation failed.")
 
+            self.cache.put(source_language, target_language, text, translation.text)
+
             return {"original": text, "translated": translation.text}
 
         except TypeError as e:
@@ -66,3 +197,248 @@ class TranslationService:
             raise HTTPException(status_code=500, detail=f"Error translating text: {e}")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error translating text: {e}")
+
+    def translate_transcript(
+        self,
+        text: str,
+        source_language: str = "en",
+        target_language: str = "uk",
+        parallelism: int = TRANSCRIPT_PARALLELISM,
+        rate_limit: float = TRANSCRIPT_RATE_LIMIT,
+    ) -> dict:
+        """
+        Translate a text of any length by splitting it on sentence boundaries and
+        translating it in chunks under the translator limit, concurrently.
+
+        Sentences are translated once per request no matter how often they repeat,
+        and sentences already in the translation cache are not sent at all.
+
+        Args:
+            text: Text to translate
+            source_language: Language code for the source language
+            target_language: Language code for the target language
+            parallelism: Maximum number of chunks translated at the same time
+            rate_limit: Maximum translator calls per second (0 for no limit)
+
+        Returns:
+            dict: Dictionary with original and translated text and the number of chunks sent
+        """
+        if not text.strip():
+            raise HTTPException(status_code=400, detail="Input text cannot be empty.")
+        self._check_languages(source_language, target_language)
+
+        segments = split_into_segments(text)
+        translations, chunks = self._translate_segments(
+            segments, source_language, target_language, parallelism, rate_limit, "transcript_translation"
+        )
+
+        return {
+            "original": text,
+            "translated": " ".join(translations[segment] for segment in segments),
+            "chunks": chunks,
+        }
+
+    def translate_words(
+        self,
+        words: list,
+        source_language: str = "en",
+        target_language: str = "uk",
+        parallelism: int = TRANSCRIPT_PARALLELISM,
+        rate_limit: float = TRANSCRIPT_RATE_LIMIT,
+    ) -> dict:
+        """
+        Translate a list of words or short phrases in one go.
+
+        Words are looked up in the local dictionary of the language pair
+        first. The rest are translated like transcript sentences: from the
+        cache when possible, otherwise one per line in as few translator
+        calls as the length limit allows.
+
+        Args:
+            words: Words to translate
+            source_language: Language code for the source language
+            target_language: Language code for the target language
+            parallelism: Maximum number of translator calls at the same time
+            rate_limit: Maximum translator calls per second (0 for no limit)
+
+        Returns:
+            dict: The translation of every word in order, each marked with
+            where it came from, and the number of translator calls made
+        """
+        words = [" ".join(word.split()) for word in words]
+        if not words or not all(words):
+            raise HTTPException(status_code=400, detail="Words cannot be empty.")
+        if any(len(word) > MAX_TEXT_LENGTH for word in words):
+            raise HTTPException(
+                status_code=400,
+                detail="Please, try to enter fewer words - the translator limits are 5000 characters.",
+            )
+        # Once for the whole list, not once per word
+        self._check_languages(source_language, target_language)
+
+        distinct = list(dict.fromkeys(words))
+        dictionary = get_dictionary(source_language, target_language)
+        with stage("dictionary_lookup"):
+            found = dictionary.lookup(distinct) if dictionary is not None else [None] * len(distinct)
+        translations = {word: translated for word, translated in zip(distinct, found) if translated is not None}
+        from_dictionary = set(translations)
+
+        remote, chunks = self._translate_segments(
+            [word for word in distinct if word not in from_dictionary],
+            source_language,
+            target_language,
+            parallelism,
+            rate_limit,
+            "word_translation",
+        )
+        translations.update(remote)
+
+        return {
+            "translations": [
+                {
+                    "original": word,
+                    "translated": translations[word],
+                    "source": "dictionary" if word in from_dictionary else "translator",
+                }
+                for word in words
+            ],
+            "dictionary_hits": len(from_dictionary),
+            "chunks": chunks,
+        }
+
+    def _translate_segments(
+        self,
+        segments: list,
+        source_language: str,
+        target_language: str,
+        parallelism: int,
+        rate_limit: float,
+        stage_name: str,
+    ) -> tuple[dict, int]:
+        """
+        Translate segments no longer than the translator limit, each distinct
+        one once: from the cache, or in chunks of newline-separated segments.
+
+        Returns:
+            tuple: (translation by segment, number of chunks sent to the translator)
+        """
+        translations = {}
+        missing = []
+        for segment in dict.fromkeys(segments):
+            cached = self.cache.get(source_language, target_language, segment)
+            if cached is not None:
+                translations[segment] = cached
+            else:
+                missing.append(segment)
+
+        limiter = _RateLimiter(rate_limit)
+
+        def call_translator(chunk_text: str) -> str:
+            # Each chunk is retried on its own so one failure does not redo the others
+            for attempt in range(TRANSCRIPT_CHUNK_RETRIES + 1):
+                limiter.acquire()
+                try:
+                    translation = self._call_translator(
+                        chunk_text, source_language, target_language
+                    )
+                    if translation and translation.text:
+                        return translation.text
+                    error = "empty translation"
+                except Exception as e:
+                    error = str(e)
+                if attempt < TRANSCRIPT_CHUNK_RETRIES:
+                    time.sleep(0.5 * 2**attempt)
+            raise HTTPException(
+                status_code=500, detail=f"Error translating text: {error}"
+            )
+
+        def translate_chunk(chunk: list) -> list:
+            # Segments travel one per line so they can be cached individually
+            translated_text = call_translator("\n".join(chunk))
+            lines = [translated_text] if len(chunk) == 1 else translated_text.split("\n")
+            if len(lines) != len(chunk):
+                # The translator merged lines (googletrans joins its result parts
+                # with spaces): both halves go back to the pool instead
+                middle = len(chunk) // 2
+                return [chunk[:middle], chunk[middle:]]
+            for segment, translated in zip(chunk, lines):
+                translated = translated.strip()
+                translations[segment] = translated
+                self.cache.put(source_language, target_language, segment, translated)
+            return []
+
+        queued = pack_chunks(missing, separator="\n")[::-1]
+        sent = len(queued)
+
+        def submit(chunk: list) -> Future:
+            # Each chunk runs in a copy of this context so its stage timings reach the request
+            return _chunk_pool.submit(contextvars.copy_context().run, translate_chunk, chunk)
+
+        pending = set()
+        with stage(stage_name):
+            try:
+                while queued or pending:
+                    while queued and len(pending) < max(1, parallelism):
+                        pending.add(submit(queued.pop()))
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        parts = future.result()
+                        queued.extend(reversed(parts))
+                        sent += len(parts)
+            finally:
+                # After a failure, chunks that have not started are dropped
+                # instead of being waited for
+                for future in pending:
+                    future.cancel()
+
+        return translations, sent
+
+    def close(self) -> None:
+        """Close the translator's HTTP client"""
+        client = getattr(self.translator, "client", None)
+        if client is not None:
+            client.close()
+
+    def _call_translator(self, text: str, source_language: str, target_language: str):
+        # Bound concurrent calls through the shared translator client
+        with self._slots, stage("translator_call"):
+            return self.translator.translate(text, src=source_language, dest=target_language)
+
+    @staticmethod
+    def _check_languages(source_language: str, target_language: str) -> None:
+        # Check if source language code is valid
+        if source_language not in googletrans.LANGUAGES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Source language '{source_language}' is not supported.",
+            )
+
+        # Check if target language code is valid
+        if target_language not in googletrans.LANGUAGES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Target language '{target_language}' is not supported.",
+            )
+
+
+_shared_service: Optional[TranslationService] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_translation_service() -> TranslationService:
+    """Get the application-wide TranslationService, creating it on first use"""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_lock:
+            if _shared_service is None:
+                _shared_service = TranslationService()
+    return _shared_service
+
+
+def close_shared_translation_service() -> None:
+    """Close the application-wide TranslationService (used on application shutdown)"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is not None:
+            _shared_service.close()
+            _shared_service = None
@@ -0,0 +1,339 @@
+"""
+Vocabulary analysis: the words of a transcript worth learning.
+
+A transcript is split into lower-cased words, and every distinct word is
+scored against a frequency table of its language. The score is how much more
+often the video uses the word than the language at large (the log-likelihood
+keyness of corpus linguistics). Words too common to be worth studying are
+left out, so the top of the list is the video's own vocabulary: frequent
+here, rare elsewhere.
+
+Key phrases ("neural network", "supply chain") are ranked with RAKE (rake-nltk):
+runs of words between stopwords and punctuation, scored by how often their
+words occur together. The stopwords are the table's most common words, so
+no NLTK data has to be downloaded and every language with a table is covered.
+
+Frequency tables are built with scripts/build_word_frequencies.py into
+VOCABULARY_TABLES_DIR/<language>/ as two .npy files: the words, sorted, and
+their Zipf frequencies (log10 of occurrences per billion words; "the" is
+about 7.7, "embedding" about 2.5). A table is memory-mapped on first use and
+shared by every request afterwards, so a lookup only reads the pages its
+binary search touches. All scoring is done on NumPy arrays.
+"""
+
+import json
+import math
+import os
+import re
+import string
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+
+from app.config import VOCABULARY_TABLES_DIR
+from app.services.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+rake_nltk = lazy_import("rake_nltk")
+
+WORDS_FILE = "words.npy"
+ZIPF_FILE = "zipf.npy"
+INFO_FILE = "info.json"
+
+# Longest word kept in a frequency table; longer tokens are noise in captions
+MAX_WORD_LENGTH = 32
+
+# Runs of letters, with inner apostrophes ("don't", "l'homme")
+_WORD = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+# Words, or anything else that is not a space, which ends a key phrase
+_PHRASE_TOKEN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*|[^\w\s]+|\d+|_+")
+_SENTENCE_END = re.compile(r"(?<=[.!?…。！？])\s+|\n+")
+# Words at least this common end a key phrase, like the stopwords of a stopword list
+# (for English about the 150 most common words)
+STOPWORD_ZIPF = 6.0
+# Longest key phrase, in words
+MAX_PHRASE_WORDS = 3
+
+
+def tokenize(text: str) -> list:
+    """
+    Split a text into lower-cased words, dropping numbers and punctuation.
+
+    Args:
+        text: The text to split
+
+    Returns:
+        list: The words, in order
+    """
+    return _WORD.findall(text.lower().replace("’", "'"))
+
+
+class FrequencyTable:
+    """Corpus word frequencies of one language, looked up in bulk"""
+
+    def __init__(self, words, zipf, info: dict = None):
+        # words: sorted fixed-width unicode array; zipf: float32 array of the same length
+        self.words = words
+        self.zipf = zipf
+        self.info = info or {}
+        # Words missing from the table are scored as if they were this rare
+        self.floor = float(zipf.min()) if len(zipf) else 0.0
+        self._stopwords = None
+
+    @classmethod
+    def load(cls, directory: str) -> "FrequencyTable":
+        """Memory-map a table written by build()"""
+        words = np.load(os.path.join(directory, WORDS_FILE), mmap_mode="r")
+        zipf = np.load(os.path.join(directory, ZIPF_FILE), mmap_mode="r")
+        if words.shape != zipf.shape:
+            raise ValueError(f"{directory}: {WORDS_FILE} and {ZIPF_FILE} differ in length")
+        info = {}
+        info_path = os.path.join(directory, INFO_FILE)
+        if os.path.exists(info_path):
+            with open(info_path, encoding="utf-8") as file:
+                info = json.load(file)
+        return cls(words, zipf, info)
+
+    @staticmethod
+    def build(counts: dict, directory: str, total: int = None, source: str = "") -> "FrequencyTable":
+        """
+        Write a table from word counts and load it.
+
+        The files are replaced atomically, so running servers keep reading
+        the table they mapped until they restart.
+
+        Args:
+            counts: Occurrences by word; words are used as given
+            directory: Where to write the table
+            total: Size of the corpus in words (default: the sum of the counts)
+            source: Description of the corpus, kept in info.json
+
+        Returns:
+            FrequencyTable: The table just written
+        """
+        counts = {word: count for word, count in counts.items() if 0 < len(word) <= MAX_WORD_LENGTH and count > 0}
+        if not counts:
+            raise ValueError("No words to write")
+        total = total or sum(counts.values())
+
+        words = np.array(sorted(counts))
+        occurrences = np.fromiter((counts[word] for word in words.tolist()), dtype=np.float64, count=len(words))
+        zipf = (np.log10(occurrences / total) + 9).astype(np.float32)
+
+        os.makedirs(directory, exist_ok=True)
+        info = {"words": len(words), "corpus_words": int(total), "source": source, "built_at": time.time()}
+        for name, write in (
+            (WORDS_FILE, lambda file: np.save(file, words)),
+            (ZIPF_FILE, lambda file: np.save(file, zipf)),
+            (INFO_FILE, lambda file: file.write(json.dumps(info).encode("utf-8"))),
+        ):
+            partial = os.path.join(directory, name + ".part")
+            with open(partial, "wb") as file:
+                write(file)
+            os.replace(partial, os.path.join(directory, name))
+        return FrequencyTable.load(directory)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def stopwords(self) -> frozenset:
+        """The words at least STOPWORD_ZIPF common, computed on first use"""
+        if self._stopwords is None:
+            self._stopwords = frozenset(self.words[np.flatnonzero(self.zipf >= STOPWORD_ZIPF)].tolist())
+        return self._stopwords
+
+    def lookup(self, words, lengths):
+        """
+        Get the Zipf frequency of many words at once.
+
+        Args:
+            words: Unicode array of words
+            lengths: Integer array of their lengths in characters
+
+        Returns:
+            ndarray: float32 Zipf frequencies, NaN for words missing from the table
+        """
+        zipf = np.full(len(words), np.nan, dtype=np.float32)
+        if not len(self.words) or not len(words):
+            return zipf
+        # Searching in the table's own dtype avoids copying the table to a wider one
+        candidates = words.astype(self.words.dtype)
+        positions = np.minimum(np.searchsorted(self.words, candidates), len(self.words) - 1)
+        # Words wider than the table were truncated by the cast and cannot be in it
+        found = (self.words[positions] == candidates) & (lengths <= self.words.dtype.itemsize // 4)
+        zipf[found] = self.zipf[positions[found]]
+        return zipf
+
+
+def _table_codes(language_code: str) -> list:
+    """Table directories to try for a caption language, most specific first"""
+    code = language_code.lower()
+    return [code] if "-" not in code else [code, code.split("-")[0]]
+
+
+def has_frequency_table(language_code: str) -> bool:
+    """Check whether a frequency table was built for a language, without loading it"""
+    return any(
+        os.path.exists(os.path.join(VOCABULARY_TABLES_DIR, code, WORDS_FILE))
+        for code in _table_codes(language_code)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_frequency_table(language_code: str) -> Optional[FrequencyTable]:
+    """
+    Get the frequency table of a language, mapping it on first use.
+
+    Regional variants without a table of their own ("en-GB") use their base
+    language's. A table built while the server runs is picked up on restart.
+
+    Returns:
+        FrequencyTable: The table, or None if none was built for the language
+    """
+    for code in _table_codes(language_code):
+        directory = os.path.join(VOCABULARY_TABLES_DIR, code)
+        if os.path.exists(os.path.join(directory, WORDS_FILE)):
+            return FrequencyTable.load(directory)
+    return None
+
+
+def analyze(
+    text: str,
+    table: FrequencyTable,
+    limit: int = 50,
+    max_zipf: float = 5.0,
+    min_count: int = 2,
+    include_unknown: bool = False,
+    phrase_limit: int = 20,
+) -> dict:
+    """
+    Rank the words and key phrases of a text by how characteristic they are of it.
+
+    Keyness is the log-likelihood of the word's count given its corpus
+    frequency, 2 * count * ln(observed / expected), which favours words that
+    are both frequent in the text and rare in the language.
+
+    Args:
+        text: The transcript
+        table: Frequency table of the transcript's language
+        limit: Number of words to return
+        max_zipf: Leave out words at least this common in the corpus
+            (5 is roughly the 3000 most common words of English)
+        min_count: Leave out words used fewer times in the text
+        include_unknown: Also rank words missing from the table (names,
+            jargon and captioning errors), scored as the rarest table words
+        phrase_limit: Number of key phrases to return (see key_phrases())
+
+    Returns:
+        dict: Token counts; the ranked words, each with its count in the
+        text, its corpus Zipf frequency (None if unknown) and its keyness;
+        and the ranked key phrases
+    """
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    result = {"tokens": len(tokens), "distinct_words": len(counts), "words": [], "phrases": []}
+    if not counts:
+        return result
+    if phrase_limit:
+        result["phrases"] = key_phrases(text, table, phrase_limit, max_zipf, min_count, include_unknown)
+
+    distinct = [word for word in counts if len(word) <= MAX_WORD_LENGTH]
+    if not distinct:
+        return result
+    words = np.array(distinct)
+    lengths = np.fromiter(map(len, distinct), dtype=np.int64, count=len(distinct))
+    count = np.fromiter(map(counts.__getitem__, distinct), dtype=np.float64, count=len(distinct))
+
+    zipf = table.lookup(words, lengths)
+    known = ~np.isnan(zipf)
+    corpus_zipf = np.where(known, zipf, table.floor)
+    # Zipf frequency of each word within the text itself
+    text_zipf = np.log10(count / len(tokens)) + 9
+    keyness = 2 * math.log(10) * count * (text_zipf - corpus_zipf)
+
+    eligible = (count >= min_count) & (corpus_zipf < max_zipf) & (keyness > 0)
+    if not include_unknown:
+        eligible &= known
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) > limit:
+        # Only the top words need a full sort
+        candidates = candidates[np.argpartition(-keyness[candidates], limit - 1)[:limit]]
+    ranked = candidates[np.argsort(-keyness[candidates], kind="stable")]
+
+    result["words"] = [
+        {
+            "word": distinct[index],
+            "count": int(count[index]),
+            "zipf": round(float(zipf[index]), 2) if known[index] else None,
+            "keyness": round(float(keyness[index]), 1),
+        }
+        for index in ranked.tolist()
+    ]
+    return result
+
+
+def _phrase_words(sentence: str) -> list:
+    # Punctuation and numbers all become "," so that RAKE ends the phrase there
+    return [token if token[0].isalpha() else "," for token in _PHRASE_TOKEN.findall(sentence)]
+
+
+def key_phrases(
+    text: str,
+    table: FrequencyTable,
+    limit: int = 20,
+    max_zipf: float = 5.0,
+    min_count: int = 2,
+    include_unknown: bool = False,
+) -> list:
+    """
+    Rank the multi-word key phrases of a text with RAKE.
+
+    Args:
+        text: The transcript
+        table: Frequency table of the transcript's language, which supplies the stopwords
+        limit: Number of phrases to return
+        max_zipf: Leave out phrases whose words are all at least this common
+        min_count: Leave out phrases used fewer times in the text
+        include_unknown: Let words missing from the table qualify a phrase
+
+    Returns:
+        list: The phrases, best first, each with its count in the text and its RAKE score
+    """
+    rake = rake_nltk.Rake(
+        stopwords=set(table.stopwords) or {","},
+        punctuations=set(string.punctuation),
+        min_length=2,
+        max_length=MAX_PHRASE_WORDS,
+        sentence_tokenizer=_SENTENCE_END.split,
+        word_tokenizer=_phrase_words,
+    )
+    rake.extract_keywords_from_text(text.replace("’", "'"))
+
+    counts = Counter(phrase for _, phrase in rake.get_ranked_phrases_with_scores())
+    scores = {}
+    for score, phrase in rake.get_ranked_phrases_with_scores():
+        if counts[phrase] >= min_count:
+            scores.setdefault(phrase, score)
+    if not scores:
+        return []
+
+    # A phrase is worth learning when at least one of its words is
+    words = sorted({word for phrase in scores for word in phrase.split()})
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    zipf = dict(zip(words, table.lookup(np.array(words), lengths).tolist()))
+
+    def qualifies(word: str) -> bool:
+        frequency = zipf[word]
+        return include_unknown if math.isnan(frequency) else frequency < max_zipf
+
+    ranked = [
+        phrase for phrase in scores if any(qualifies(word) for word in phrase.split())
+    ]
+    # Phrases are listed best first; ties go to the more frequent phrase
+    ranked.sort(key=lambda phrase: (-scores[phrase], -counts[phrase]))
+    return [
+        {"phrase": phrase, "count": counts[phrase], "score": round(scores[phrase], 2)}
+        for phrase in ranked[:limit]
+    ]
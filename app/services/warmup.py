@@ -0,0 +1,63 @@
+"""
+Start-up warm-up of the lazily imported dependencies.
+
+A worker starts serving before yt-dlp and googletrans are imported (see
+lazy_import.py); warming up loads them, builds a yt-dlp client and the
+shared translator and maps the word dictionaries, so the first extraction
+or translation does not pay for it.
+"""
+
+import logging
+import threading
+import time
+
+from app.services.lazy_import import load_all
+from app.services.metrics import stage
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODES = ("background", "startup", "off")
+
+
+def warm_up() -> float:
+    """
+    Load the heavy dependencies now.
+
+    Returns:
+        float: Seconds spent
+    """
+    # Imported here so this module stays cheap to import
+    from app.services.dictionary import preload_dictionaries
+    from app.services.subtitle_service import SubtitleService
+    from app.services.translation_service import get_shared_translation_service
+
+    started = time.perf_counter()
+    try:
+        with stage("warmup"):
+            modules = load_all()
+            # The first client loads yt-dlp's extractor list
+            with SubtitleService.ydl_factory({"quiet": True, "no_warnings": True}):
+                pass
+            get_shared_translation_service()
+            preload_dictionaries()
+    except Exception as e:
+        # Nothing is lost: every step runs again on first use
+        logger.warning("Warm-up failed: %s", e)
+    else:
+        logger.info("Warmed up %s in %.2f s", ", ".join(modules), time.perf_counter() - started)
+    return time.perf_counter() - started
+
+
+def start_warm_up(mode: str) -> None:
+    """
+    Run the warm-up as configured by WARMUP.
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Unknown WARMUP {mode!r}, expected one of {', '.join(WARMUP_MODES)}")
+    if mode == "startup":
+        warm_up()
+    elif mode == "background":
+        threading.Thread(target=warm_up, name="warmup", daemon=True).start()
@@ -0,0 +1,184 @@
+"""
+Cold start of a worker: import time and time to first response.
+
+Every measurement runs in a fresh interpreter:
+
+- import: seconds to import app.main (the work every worker does before it
+  can serve), with the slowest top-level packages from -X importtime.
+- ready: seconds from spawning a server process until GET / answers.
+- first/second extraction: GET /tracks/ right after the server is ready,
+  then for another video. The server runs a real yt_dlp.YoutubeDL with a
+  local extractor answering from the offline fixture payload, so the first
+  call pays for importing and setting up yt-dlp unless the warm-up did.
+
+Each WARMUP mode is measured in turn. --json appends the results, with the
+Python version and platform, to a file so they can be tracked over time.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--repeat 5] [--modes off background startup]
+    python benchmarks/bench_cold_start.py --json benchmarks/baselines/cold_start.jsonl
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+import offline
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def child_env(**extra) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, HERE]), **extra)
+    # Nothing persisted between runs, nothing throttled
+    env.update(
+        DATABASE_URL=f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_cold_start.db')}",
+        SUBTITLE_STORE_ENABLED="0",
+        SEARCH_INDEX_ENABLED="0",
+        RATE_LIMIT_ENABLED="0",
+    )
+    return env
+
+
+def measure_import(repeat: int) -> float:
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True
+        ).stdout
+        results.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(results)
+
+
+def slowest_imports(top: int) -> list:
+    """Packages imported by app.main, by cumulative import time"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True,
+    ).stderr
+    packages = {}
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            root = match.group(4).split(".")[0]
+            if root != "app":
+                packages[root] = max(packages.get(root, 0), int(match.group(2)))
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def measure_server(mode: str) -> dict:
+    port = offline.free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", str(port)],
+        cwd=ROOT, env=child_env(WARMUP=mode), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                if requests.get(base_url + "/", timeout=1).status_code == 200:
+                    break
+            except requests.ConnectionError:
+                pass
+            if process.poll() is not None:
+                raise RuntimeError(f"the server exited with status {process.returncode}")
+            time.sleep(0.01)
+        ready = time.perf_counter() - started
+
+        timings = []
+        for variant in (1, 2):
+            call_started = time.perf_counter()
+            response = requests.get(
+                base_url + "/tracks/", params={"video_url": offline.video_url("10m", variant)}, timeout=60
+            )
+            response.raise_for_status()
+            timings.append((time.perf_counter() - call_started) * 1000)
+        return {"ready_s": ready, "first_extraction_ms": timings[0], "second_extraction_ms": timings[1]}
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def serve(port: int) -> None:
+    """Run the app with YouTube answered by a local yt-dlp extractor (child process)"""
+    import uvicorn
+
+    from app.main import app
+    from app.services.subtitle_service import SubtitleService, yt_dlp
+
+    extractors = []
+
+    def fixture_ydl(options: dict):
+        if not extractors:
+            # Defined on first use: the base class is what importing yt-dlp provides
+            class FixtureYoutubeIE(yt_dlp.extractor.common.InfoExtractor):
+                _VALID_URL = r"https?://www\.youtube\.com/watch\?v=(?P<id>[\w-]{11})"
+
+                def _real_extract(self, url):
+                    return offline.fixture_info(url, "https://www.youtube.com")
+
+            extractors.append(FixtureYoutubeIE)
+        ydl = yt_dlp.YoutubeDL(options, auto_init=False)
+        # Added first so it wins over the real YouTube extractor; the rest load as in production
+        ydl.add_info_extractor(extractors[0]())
+        ydl.add_default_info_extractors()
+        return ydl
+
+    SubtitleService.ydl_factory = staticmethod(fixture_ydl)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["off", "background", "startup"])
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    parser.add_argument("--json", help="append the results as one JSON line to this file")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    result = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "import_s": round(measure_import(args.repeat), 3),
+        "modes": {},
+    }
+    print(f"import app.main: {result['import_s']:.3f} s (median of {args.repeat})")
+    for name, microseconds in slowest_imports(args.top):
+        print(f"  {name:<36} {microseconds / 1000:>8.1f} ms")
+
+    print(f"\n{'WARMUP':<11} {'ready s':>8} {'1st extraction ms':>18} {'2nd extraction ms':>18}")
+    for mode in args.modes:
+        runs = [measure_server(mode) for _ in range(args.repeat)]
+        summary = {key: round(statistics.median(run[key] for run in runs), 3) for key in runs[0]}
+        result["modes"][mode] = summary
+        print(
+            f"{mode:<11} {summary['ready_s']:>8.3f} {summary['first_extraction_ms']:>18.1f} "
+            f"{summary['second_extraction_ms']:>18.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as file:
+            file.write(json.dumps(dict(result, recorded_at=time.strftime("%Y-%m-%dT%H:%M:%S")) + "\n"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Memory and window-query time of timed cues: list of dicts vs CueTrack.
+
+Synthetic tracks have one cue every two seconds. Memory is measured with
+tracemalloc while each representation is built from the same event triples;
+window queries look up random one-minute ranges, by linear scan over the
+dicts and by binary search over the track. Both must return the same cues.
+
+Usage:
+    python benchmarks/bench_cue_memory.py [--hours 1 4 10] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.cue_track import CueTrack  # noqa: E402
+
+WORDS = "the quick brown fox jumps over a lazy dog while we talk about lectures".split()
+
+
+def synthetic_events(hours: float) -> list:
+    return [
+        (i * 2000, 2500, " ".join(WORDS[(i + j) % len(WORDS)] for j in range(8)))
+        for i in range(int(hours * 3600 / 2))
+    ]
+
+
+def build_dicts(events: list) -> list:
+    return [
+        {"start_ms": start, "duration_ms": duration, "text": " ".join(text.split())}
+        for start, duration, text in events
+    ]
+
+
+def measure(build, events: list):
+    tracemalloc.start()
+    result = build(events)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def scan_window(cues: list, start_ms: int, end_ms: int) -> list:
+    return [
+        cue
+        for cue in cues
+        if cue["start_ms"] < end_ms and cue["start_ms"] + cue["duration_ms"] > start_ms
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 10])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"{'hours':>6} {'cues':>7} {'dicts MiB':>10} {'track MiB':>10} "
+        f"{'scan us/q':>10} {'bisect us/q':>12}"
+    )
+    for hours in args.hours:
+        events = synthetic_events(hours)
+        dicts, dicts_size = measure(build_dicts, events)
+        track, track_size = measure(CueTrack.from_events, events)
+
+        rng = random.Random(0)
+        span = int(hours * 3600 * 1000)
+        windows = [(start, start + 60000) for start in (rng.randrange(span) for _ in range(args.queries))]
+
+        started = time.perf_counter()
+        scanned = [scan_window(dicts, start, end) for start, end in windows]
+        scan_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        found = [[track.cue(i) for i in track.window(start, end)] for start, end in windows]
+        bisect_time = time.perf_counter() - started
+
+        if scanned != found:
+            raise SystemExit("window results differ")
+
+        print(
+            f"{hours:>6g} {len(events):>7} {dicts_size / 2**20:>10.2f} {track_size / 2**20:>10.2f} "
+            f"{scan_time / len(windows) * 1e6:>10.1f} {bisect_time / len(windows) * 1e6:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
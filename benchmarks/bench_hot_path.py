@@ -0,0 +1,264 @@
+"""
+Offline regression benchmark of the subtitle and translation hot paths.
+
+YouTube and Google Translate are replaced by the stand-ins in offline.py
+(recorded-shape extract_info payload, json3 fixtures from one minute to ten
+hours, a local HTTP stub), so the numbers only depend on this code base.
+Each scenario runs its requests under concurrent load and reports p50/p95
+latency, throughput and the peak memory traced while one wave of concurrent
+requests runs.
+
+Results are compared with benchmarks/baselines/hot_path.json and the script
+exits with status 1 when a metric regresses past the tolerance. Baselines
+are machine-specific: record them with --update-baselines on the machine
+that runs the check.
+
+Usage:
+    python benchmarks/bench_hot_path.py [--only extract] [--tolerance 0.5]
+    python benchmarks/bench_hot_path.py --update-baselines
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Measure the work itself: no stored tracks, no search indexing, no translation cache,
+# no rate limits
+os.environ.update(
+    SUBTITLE_STORE_ENABLED="0",
+    SEARCH_INDEX_ENABLED="0",
+    TRANSLATION_CACHE_SIZE="0",
+    TRANSLATION_CACHE_PERSISTENT="0",
+    RATE_LIMIT_ENABLED="0",
+)
+
+import requests  # noqa: E402
+
+import offline  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routes.translation_routes import get_translation_service  # noqa: E402
+from app.services.subtitle_formats import write_srt  # noqa: E402
+from app.services.subtitle_service import SubtitleService  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "hot_path.json")
+
+# Differences below these floors are treated as noise
+LATENCY_FLOOR_MS = 2.0
+MEMORY_FLOOR_MIB = 1.0
+
+
+def service_scenarios() -> list:
+    cues_1h, _ = SubtitleService.get_cues(offline.video_url("1h"))
+
+    def format_srt(i):
+        for _ in write_srt(cues_1h, offline.video_id("1h"), "en"):
+            pass
+
+    def checked(result):
+        value, error_message = result
+        if error_message:
+            raise RuntimeError(error_message)
+
+    return [
+        # (name, call(i), requests, concurrency)
+        (
+            "service.get_available_languages[cold]",
+            lambda i: checked(SubtitleService.get_available_languages(offline.video_url("1h", i + 1))),
+            300,
+            8,
+        ),
+        (
+            "service.get_available_languages[cached]",
+            lambda i: checked(SubtitleService.get_available_languages(offline.video_url("1h"))),
+            3000,
+            8,
+        ),
+        (
+            "service.extract_subtitles[1m]",
+            lambda i: checked(SubtitleService.extract_subtitles(offline.video_url("1m"))),
+            300,
+            8,
+        ),
+        (
+            "service.extract_subtitles[1h]",
+            lambda i: checked(SubtitleService.extract_subtitles(offline.video_url("1h"))),
+            16,
+            4,
+        ),
+        (
+            "service.extract_subtitles[10h]",
+            lambda i: checked(SubtitleService.extract_subtitles(offline.video_url("10h"))),
+            2,
+            1,
+        ),
+        ("service.write_srt[1h]", format_srt, 300, 8),
+    ]
+
+
+def route_scenarios(base_url: str) -> list:
+    local = threading.local()
+
+    def session() -> requests.Session:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def checked(response):
+        response.raise_for_status()
+
+    def process_video(track):
+        return lambda i: checked(
+            session().post(
+                f"{base_url}/process_video/",
+                json={"video_url": offline.video_url(track), "language_code": "en"},
+                headers={"Accept": "application/json"},
+            )
+        )
+
+    text = "Attention lets each token look at every other token in the sequence. " * 7
+
+    return [
+        ("route./process_video/[1m]", process_video("1m"), 300, 8),
+        ("route./process_video/[1h]", process_video("1h"), 16, 4),
+        (
+            "route./download_subtitles/[1h]",
+            lambda i: checked(
+                session().post(
+                    f"{base_url}/download_subtitles/",
+                    data={"video_url": offline.video_url("1h"), "language_code": "en", "format": "srt"},
+                )
+            ),
+            16,
+            4,
+        ),
+        (
+            "route./translate/",
+            lambda i: checked(
+                session().post(
+                    f"{base_url}/translate/",
+                    json={"text": f"{i} {text}", "source_lang": "en", "target_lang": "uk"},
+                )
+            ),
+            300,
+            8,
+        ),
+    ]
+
+
+def run_scenario(call, total: int, concurrency: int) -> dict:
+    call(-1)  # Warm up connections, fixtures and caches
+
+    def timed(i):
+        started = time.perf_counter()
+        call(i)
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(timed, range(total)))
+    elapsed = time.perf_counter() - started
+
+    # One wave of concurrent requests under tracemalloc, which slows them down
+    tracemalloc.start()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(total, total + concurrency)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        "rps": round(total / elapsed, 2),
+        "peak_mib": round(peak / 2**20, 3),
+    }
+
+
+def regressions(name: str, result: dict, baseline: dict, tolerance: float) -> list:
+    found = []
+    limit = 1 + tolerance
+    for metric, floor in (("p50_ms", LATENCY_FLOOR_MS), ("p95_ms", LATENCY_FLOOR_MS), ("peak_mib", MEMORY_FLOOR_MIB)):
+        if metric in baseline and result[metric] > max(baseline[metric] * limit, baseline[metric] + floor):
+            found.append(f"{name}: {metric} {result[metric]} > baseline {baseline[metric]}")
+    # Throughput of sub-floor operations is dominated by noise
+    if (
+        "rps" in baseline
+        and baseline.get("p50_ms", 0) >= LATENCY_FLOOR_MS
+        and result["rps"] < baseline["rps"] / limit
+    ):
+        found.append(f"{name}: rps {result['rps']} < baseline {baseline['rps']}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", help="run only scenarios whose name contains this text")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression")
+    parser.add_argument("--extract-latency", type=float, default=0.0, help="simulated yt-dlp seconds")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="simulated HTTP stub seconds")
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    stub = offline.StubServer(latency=args.stub_latency)
+    translation_service = offline.install(stub, extract_latency=args.extract_latency)
+    app.dependency_overrides[get_translation_service] = lambda: translation_service
+    server, base_url = offline.start_app_server(app)
+
+    for minutes in offline.TRACKS.values():
+        offline.json3_path(minutes)
+
+    results = {}
+    print(f"{'scenario':<40} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>9} {'peak MiB':>9}")
+    for name, call, total, concurrency in service_scenarios() + route_scenarios(base_url):
+        if args.only and args.only not in name:
+            continue
+        result = run_scenario(call, total, concurrency)
+        results[name] = result
+        print(
+            f"{name:<40} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+            f"{result['rps']:>9.1f} {result['peak_mib']:>9.2f}"
+        )
+
+    server.should_exit = True
+    stub.close()
+
+    stored = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, encoding="utf-8") as file:
+            stored = json.load(file)
+
+    if args.update_baselines:
+        stored.setdefault("scenarios", {}).update(results)
+        stored["machine"] = f"{platform.python_implementation()} {platform.python_version()} on {platform.machine()}"
+        os.makedirs(os.path.dirname(BASELINES), exist_ok=True)
+        with open(BASELINES, "w", encoding="utf-8") as file:
+            json.dump(stored, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baselines written to {os.path.relpath(BASELINES, ROOT)}")
+        return
+
+    found = []
+    for name, result in results.items():
+        baseline = stored.get("scenarios", {}).get(name)
+        if baseline is not None:
+            found.extend(regressions(name, result, baseline, args.tolerance))
+    if found:
+        print("\nRegressions:")
+        for line in found:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regressions against the stored baselines.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Peak memory of json3 subtitle parsing: buffered response.json() vs streaming.
+
+Synthetic tracks (one caption event every two seconds) are generated lazily
+in 64 KiB chunks, the way the HTTP response delivers them. The buffered path
+first joins the whole body, as requests does for response.json(). Both paths
+run the same normalization pipeline and must produce identical text.
+
+Usage:
+    python benchmarks/bench_json3_memory.py [--hours 1 4 10]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.json3_parser import iter_json3_events  # noqa: E402
+from app.services.normalization import default_pipeline  # noqa: E402
+
+CHUNK_SIZE = 65536
+WORDS = "the quick brown fox jumps over a lazy dog while we talk about lectures".split()
+
+
+def synthetic_track(hours: float):
+    """Yield a json3 document as byte chunks without materialising it"""
+    events = int(hours * 3600 / 2)
+    pending = [b'{"wireMagic":"pb3","pens":[{}],"events":[']
+    size = len(pending[0])
+    for i in range(events):
+        words = [WORDS[(i + j) % len(WORDS)] for j in range(8)]
+        event = {
+            "tStartMs": i * 2000,
+            "dDurationMs": 2500,
+            "wWinId": 1,
+            "segs": [{"utf8": words[0]}] + [{"utf8": " " + w, "tOffsetMs": k * 200} for k, w in enumerate(words[1:], 1)],
+        }
+        if i % 50 == 0:
+            event["segs"].append({"utf8": "\nTranscriber: someone\n"})
+        piece = (b"," if i else b"") + json.dumps(event).encode("utf-8")
+        pending.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            body = b"".join(pending)
+            pending, size = [body[CHUNK_SIZE:]], len(body) - CHUNK_SIZE
+            yield body[:CHUNK_SIZE]
+    pending.append(b"]}")
+    yield b"".join(pending)
+
+
+def event_texts(events):
+    for event in events:
+        segments = event.get("segs")
+        if segments:
+            yield "".join(segment.get("utf8", "") for segment in segments)
+
+
+def buffered(chunks) -> str:
+    subtitle_data = json.loads(b"".join(chunks))
+    return " ".join(default_pipeline.normalize(event_texts(subtitle_data.get("events", []))))
+
+
+def streaming(chunks) -> str:
+    return " ".join(default_pipeline.normalize(event_texts(iter_json3_events(chunks))))
+
+
+def measure(parser, hours: float):
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = parser(synthetic_track(hours))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return text, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 10])
+    args = parser.parse_args()
+
+    print(f"{'track':>8} {'text MiB':>9} {'buffered peak':>14} {'streaming peak':>15} {'buffered s':>11} {'streaming s':>12}")
+    for hours in args.hours:
+        old_text, old_peak, old_time = measure(buffered, hours)
+        new_text, new_peak, new_time = measure(streaming, hours)
+        if old_text != new_text:
+            raise SystemExit(f"Output mismatch for the {hours}h track")
+        print(
+            f"{hours:>7g}h {len(new_text.encode()) / 2**20:>9.1f} "
+            f"{old_peak / 2**20:>10.1f} MiB {new_peak / 2**20:>11.1f} MiB "
+            f"{old_time:>11.2f} {new_time:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Multi-language bundle versus one extraction request per language.
+
+Runs the app in-process against the offline stand-ins (benchmarks/offline.py)
+with simulated yt-dlp and download latency, and fetches N languages of a
+fresh video either with N /process_video/ calls in a row or with one
+/process_bundle/ call (JSON and ZIP). The bundle should take about one
+extraction plus the slowest track, the per-language loop about N tracks.
+
+Usage:
+    python benchmarks/bench_language_bundle.py [--languages 1 4 12] [--stub-latency 0.2]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import zipfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Every run downloads its tracks: no stored tracks, no search indexing, no rate limits
+os.environ.update(SUBTITLE_STORE_ENABLED="0", SEARCH_INDEX_ENABLED="0", RATE_LIMIT_ENABLED="0")
+
+import requests  # noqa: E402
+
+import offline  # noqa: E402
+from app.main import app  # noqa: E402
+
+# Manual tracks of the fixture payload
+LANGUAGES = ["en", "de", "es", "fr", "it", "ja", "ko", "pt", "ru", "uk", "zh-cn", "pl"]
+
+
+def per_language(session: requests.Session, base_url: str, video_url: str, languages: list) -> None:
+    for language_code in languages:
+        session.post(
+            f"{base_url}/process_video/",
+            json={"video_url": video_url, "language_code": language_code},
+            headers={"Accept": "application/json"},
+        ).raise_for_status()
+
+
+def bundle(session: requests.Session, base_url: str, video_url: str, languages: list, output: str) -> None:
+    response = session.post(
+        f"{base_url}/process_bundle/",
+        json={"video_url": video_url, "language_codes": languages, "output": output, "format": "srt"},
+    )
+    response.raise_for_status()
+    if output == "zip":
+        assert len(zipfile.ZipFile(io.BytesIO(response.content)).namelist()) == len(languages)
+    else:
+        assert len(response.json()["tracks"]) == len(languages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--languages", type=int, nargs="+", default=[1, 4, 12])
+    parser.add_argument("--track", default="10m", choices=offline.TRACKS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--extract-latency", type=float, default=0.3, help="simulated yt-dlp seconds")
+    parser.add_argument("--stub-latency", type=float, default=0.2, help="simulated seconds per track download")
+    args = parser.parse_args()
+
+    stub = offline.StubServer(latency=args.stub_latency)
+    offline.install(stub, extract_latency=args.extract_latency)
+    server, base_url = offline.start_app_server(app)
+    session = requests.Session()
+    variant = iter(range(1, 100000))
+
+    def timed(call, languages) -> float:
+        results = []
+        for _ in range(args.repeat):
+            # A new video each time, so the metadata cache starts cold
+            video_url = offline.video_url(args.track, next(variant))
+            started = time.perf_counter()
+            call(session, base_url, video_url, languages)
+            results.append(time.perf_counter() - started)
+        return statistics.median(results)
+
+    print(f"{'languages':>9} {'per-language s':>15} {'bundle json s':>14} {'bundle zip s':>13}")
+    for count in args.languages:
+        languages = LANGUAGES[:count]
+        print(
+            f"{count:>9} {timed(per_language, languages):>15.2f} "
+            f"{timed(lambda *a: bundle(*a, 'json'), languages):>14.2f} "
+            f"{timed(lambda *a: bundle(*a, 'zip'), languages):>13.2f}"
+        )
+
+    server.should_exit = True
+    stub.close()
+
+
+if __name__ == "__main__":
+    main()
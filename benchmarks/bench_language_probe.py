@@ -0,0 +1,110 @@
+"""
+Full yt-dlp extraction versus the lightweight language probe.
+
+Both calls run a real yt_dlp.YoutubeDL over the recorded-shape
+extract_info fixture, served by a local extractor instead of YouTube:
+
+- full: extract_info(url, download=False), the call language lookups used
+  before, which resolves the formats (sorting, format selection, subtitle
+  processing).
+- probe: extract_info(url, download=False, process=False) with the DASH,
+  HLS and player JS requests skipped, as SubtitleService._get_video_info does.
+
+Offline, only the CPU cost of processing is measured. --round-trip adds a
+simulated network round trip for each request the probe skips (the player
+JS, the DASH and HLS manifests), to show their weight on a real connection.
+
+Usage:
+    python benchmarks/bench_language_probe.py [--calls 200] [--round-trip 0.05]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import yt_dlp  # noqa: E402
+from yt_dlp.extractor.common import InfoExtractor  # noqa: E402
+
+import offline  # noqa: E402
+from app.services.subtitle_service import SubtitleService  # noqa: E402
+
+PROBE_ARGS = {"youtube": {"skip": ["dash", "hls"], "player_skip": ["js"]}}
+
+
+class FixtureYoutubeIE(InfoExtractor):
+    """Answers YouTube watch URLs from the fixture payload"""
+
+    _VALID_URL = r"https?://www\.youtube\.com/watch\?v=(?P<id>[\w-]{11})"
+    round_trip = 0.0
+
+    def _real_extract(self, url):
+        skip = self._configuration_arg("skip", ie_key="youtube")
+        player_skip = self._configuration_arg("player_skip", ie_key="youtube")
+        skipped = ("js" in player_skip) + ("dash" in skip) + ("hls" in skip)
+        time.sleep(self.round_trip * (3 - skipped))
+        return offline.fixture_info(url, "https://www.youtube.com")
+
+
+def make_ydl(options: dict) -> yt_dlp.YoutubeDL:
+    ydl = yt_dlp.YoutubeDL(
+        dict(options, quiet=True, no_warnings=True, skip_download=True), auto_init=False
+    )
+    ydl.add_info_extractor(FixtureYoutubeIE())
+    return ydl
+
+
+def full_call(url: str) -> dict:
+    with make_ydl({}) as ydl:
+        return ydl.extract_info(url, download=False)
+
+
+def probe_call(url: str) -> dict:
+    with make_ydl({"extractor_args": PROBE_ARGS}) as ydl:
+        return ydl.extract_info(url, download=False, process=False)
+
+
+def measure(call, calls: int) -> list:
+    latencies = []
+    for i in range(calls):
+        url = offline.video_url("1h", i)
+        started = time.perf_counter()
+        info = call(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert info.get("subtitles") and info.get("automatic_captions")
+    return sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--round-trip", type=float, default=0.0, help="simulated seconds per skipped request")
+    args = parser.parse_args()
+    FixtureYoutubeIE.round_trip = args.round_trip
+
+    # Both payloads list the same tracks
+    url = offline.video_url("1h")
+    full_tracks = SubtitleService._list_tracks(full_call(url))
+    probe_tracks = SubtitleService._list_tracks(probe_call(url))
+    assert full_tracks == probe_tracks, "the probe lists different tracks"
+    print(f"{len(probe_tracks)} caption tracks per video\n")
+
+    print(f"{'call':<8} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    results = {}
+    for name, call in (("full", full_call), ("probe", probe_call)):
+        call(url)  # Warm up imports and compiled regexes
+        latencies = measure(call, args.calls)
+        results[name] = statistics.median(latencies)
+        print(
+            f"{name:<8} {results[name]:>9.3f} "
+            f"{latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:>9.3f} "
+            f"{statistics.fmean(latencies):>9.3f}"
+        )
+    print(f"\nprobe speedup (p50): {results['full'] / results['probe']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
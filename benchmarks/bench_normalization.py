@@ -0,0 +1,72 @@
+"""
+Cost of each transcript normalization stage in characters per second.
+
+Synthetic tracks mix plain caption lines with the things the stages remove:
+[Music]-style tags, credit lines and roll-up captions that repeat the
+previous line. Every registered stage is timed on its own over the raw
+segments, then the configured pipeline is timed as a whole. Throughput is
+input characters per second, best of --repeat runs.
+
+Usage:
+    python benchmarks/bench_normalization.py [--hours 1 10] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.normalization import STAGES, default_pipeline  # noqa: E402
+
+WORDS = "the quick brown fox jumps over a lazy dog while we talk about lectures".split()
+
+
+def synthetic_segments(hours: float) -> list:
+    segments = []
+    previous = ""
+    for i in range(int(hours * 3600 / 2)):
+        line = " ".join(WORDS[(i + j) % len(WORDS)] for j in range(8))
+        if i % 40 == 0:
+            segments.append("[Music]  \n" + line)
+        elif i % 500 == 0:
+            segments.append(line + "\nTranscriber: someone\n")
+        elif i % 3 == 0:
+            segments.append(previous + "\n" + line)  # roll-up caption
+        else:
+            segments.append(" " + line + "\n")
+        previous = line
+    return segments
+
+
+def best_time(run, segments: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        apply = run()
+        started = time.perf_counter()
+        for text in segments:
+            apply(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'track':>6} {'stage':>16} {'MiB':>6} {'Mchars/s':>9}")
+    for hours in args.hours:
+        segments = synthetic_segments(hours)
+        chars = sum(len(text) for text in segments)
+        runs = {name: STAGES[name]().start for name in STAGES}
+        runs["pipeline"] = default_pipeline.start
+        for name, run in runs.items():
+            elapsed = best_time(run, segments, args.repeat)
+            print(f"{hours:>5g}h {name:>16} {chars / 2**20:>6.1f} {chars / elapsed / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
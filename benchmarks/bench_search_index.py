@@ -0,0 +1,86 @@
+"""
+Query latency of the transcript search index at 10k and 100k transcripts.
+
+Synthetic transcripts (one cue every two seconds, words drawn from a Zipf-like
+vocabulary) are indexed through SearchIndex.index_track() into a temporary
+SQLite database. Queries mix rare, medium and common terms plus a phrase and
+are timed through SubtitleService-style paging (page_size + 1 videos).
+
+Usage:
+    python benchmarks/bench_search_index.py [--transcripts 10000 100000] [--minutes 5]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.cue_track import CueTrack  # noqa: E402
+from app.services.search_index import SearchIndex, to_match_query  # noqa: E402
+
+VOCABULARY = [f"w{i}" for i in range(20000)]
+WEIGHTS = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+QUERIES = {
+    "common": "w0",
+    "medium": "w150",
+    "rare": "w15000",
+    "two terms": "w3 w400",
+    "phrase": '"w1 w2"',
+}
+
+
+def synthetic_cues(rng: random.Random, minutes: float) -> CueTrack:
+    count = int(minutes * 30)
+    words = rng.choices(VOCABULARY, WEIGHTS, k=count * 8)
+    return CueTrack.from_events(
+        (i * 2000, 2500, " ".join(words[i * 8 : i * 8 + 8])) for i in range(count)
+    )
+
+
+def build(index: SearchIndex, start: int, stop: int, minutes: float) -> None:
+    rng = random.Random(start)
+    for number in range(start, stop):
+        cues = synthetic_cues(rng, minutes)
+        content_hash = hashlib.sha256(cues.to_bytes()).hexdigest()
+        index.index_track(f"v{number:010d}", "en", cues, content_hash, f"Lecture {number}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transcripts", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--minutes", type=float, default=5, help="length of each transcript")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = SearchIndex(f"sqlite:///{os.path.join(directory, 'search.db')}")
+        indexed = 0
+        print(f"{'transcripts':>11} {'query':>10} {'p50 ms':>8} {'p95 ms':>8} {'videos':>7}")
+        for target in sorted(args.transcripts):
+            started = time.perf_counter()
+            build(index, indexed, target, args.minutes)
+            print(f"# indexed {target - indexed} transcripts in {time.perf_counter() - started:.1f}s")
+            indexed = target
+
+            for name, query in QUERIES.items():
+                match_query = to_match_query(query)
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    results = index.search(match_query, limit=11)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(
+                    f"{target:>11} {name:>10} {statistics.median(timings):>8.2f} {p95:>8.2f} {len(results):>7}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Time to first content: /process_video/ versus the /stream_subtitles/ event stream.
+
+Runs the app in-process against the offline stand-ins (benchmarks/offline.py)
+with simulated yt-dlp and download latency. For each track length it
+measures when a fresh video's /process_video/ response is complete, and when
+the stream delivers its title, its first cues and its done event.
+
+Usage:
+    python benchmarks/bench_time_to_first_content.py [--tracks 10m 1h 10h] [--extract-latency 0.5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Every run downloads its track: no stored tracks, no search indexing, no rate limits
+os.environ.update(SUBTITLE_STORE_ENABLED="0", SEARCH_INDEX_ENABLED="0", RATE_LIMIT_ENABLED="0")
+
+import requests  # noqa: E402
+
+import offline  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def process_video(session: requests.Session, base_url: str, video_url: str) -> dict:
+    started = time.perf_counter()
+    session.post(
+        f"{base_url}/process_video/",
+        json={"video_url": video_url, "language_code": "en"},
+        headers={"Accept": "application/json"},
+    ).raise_for_status()
+    return {"complete": time.perf_counter() - started}
+
+
+def stream(session: requests.Session, base_url: str, video_url: str) -> dict:
+    started = time.perf_counter()
+    seen = {}
+    with session.get(
+        f"{base_url}/stream_subtitles/",
+        params={"video_url": video_url, "language_code": "en"},
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                seen.setdefault(line[7:], time.perf_counter() - started)
+    assert "done" in seen, f"the stream ended without done: {sorted(seen)}"
+    return {"title": seen["title"], "first cues": seen["cues"], "complete": seen["done"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tracks", nargs="+", default=["10m", "1h", "10h"], choices=offline.TRACKS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--extract-latency", type=float, default=0.5, help="simulated yt-dlp seconds")
+    parser.add_argument("--stub-latency", type=float, default=0.3, help="simulated seconds per track download")
+    args = parser.parse_args()
+
+    stub = offline.StubServer(latency=args.stub_latency)
+    offline.install(stub, extract_latency=args.extract_latency)
+    server, base_url = offline.start_app_server(app)
+    session = requests.Session()
+    variant = iter(range(1, 100000))
+
+    print(f"{'track':<6} {'endpoint':<20} {'title s':>8} {'first cues s':>13} {'complete s':>11}")
+    for track in args.tracks:
+        for name, call in (("/process_video/", process_video), ("/stream_subtitles/", stream)):
+            # A new video each time, so the metadata cache starts cold
+            runs = [call(session, base_url, offline.video_url(track, next(variant))) for _ in range(args.repeat)]
+            cells = [
+                f"{statistics.median(run[key] for run in runs):.2f}" if key in runs[0] else "-"
+                for key in ("title", "first cues", "complete")
+            ]
+            print(f"{track:<6} {name:<20} {cells[0]:>8} {cells[1]:>13} {cells[2]:>11}")
+
+    server.should_exit = True
+    stub.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Throughput of chunked transcript translation against a stub translator backend.
+
+The stub sleeps for a fixed latency per call instead of calling Google, so
+the numbers show how chunk parallelism hides per-call latency.
+
+Usage:
+    python benchmarks/bench_transcript_translation.py [--words 50000] [--latency 0.2]
+"""
+
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.translation_cache import TranslationCache  # noqa: E402
+from app.services.translation_service import TranslationService  # noqa: E402
+
+
+class StubTranslator:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def translate(self, text, src="en", dest="uk"):
+        self.calls += 1
+        time.sleep(self.latency)
+        return SimpleNamespace(text=text.upper())
+
+
+def synthetic_transcript(words: int, repeat_every: int) -> str:
+    # Every repeat_every-th sentence is an identical filler line, like "[Music]"
+    sentences = []
+    for i in range(words // 12 + 1):
+        if repeat_every and i % repeat_every == 0:
+            sentences.append("Thanks for watching.")
+        else:
+            sentences.append(f"So in part {i} we look at how the cache works in practice.")
+    return " ".join(sentences)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=50000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--parallelism", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--repeat-every", type=int, default=5)
+    args = parser.parse_args()
+
+    text = synthetic_transcript(args.words, args.repeat_every)
+
+    print(f"transcript: {len(text)} chars, stub latency {args.latency * 1000:.0f} ms/call")
+    print(f"{'parallelism':>11} {'chunks':>7} {'seconds':>8} {'chars/s':>10}")
+    for parallelism in args.parallelism:
+        # A fresh, disabled cache so every run translates the same work
+        service = TranslationService(
+            translator=StubTranslator(args.latency), cache=TranslationCache(max_size=0)
+        )
+        start = time.perf_counter()
+        result = service.translate_transcript(
+            text, "en", "uk", parallelism=parallelism, rate_limit=0
+        )
+        elapsed = time.perf_counter() - start
+        assert result["translated"] == text.upper()
+        print(f"{parallelism:>11} {result['chunks']:>7} {elapsed:>8.2f} {len(text) / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Requests per second of POST /translate/ with a per-request Translator versus the
+shared application-scoped client, against a local stub translation server.
+
+googletrans talks to its RPC endpoint over HTTPS; for the benchmark its URL
+template is pointed at a plain-HTTP stub that answers in the same format.
+The translation cache is disabled so every request reaches the stub.
+
+Usage:
+    python benchmarks/bench_translation_client.py [--requests 300] [--concurrency 16]
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+import uvicorn
+from googletrans import urls
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from app.main import app  # noqa: E402
+from app.routes.translation_routes import get_translation_service  # noqa: E402
+from app.services.translation_cache import TranslationCache  # noqa: E402
+from app.services.translation_service import TranslationService  # noqa: E402
+
+
+class StubTranslateHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        request = json.loads(parse_qs(body.decode())["f.req"][0])
+        text, src, dest = json.loads(request[0][0][1])[0][:3]
+        time.sleep(self.latency)
+        parsed = [[None, None, src], [[[None, None, None, True, None, [[text[::-1], []]]]]], src]
+        payload = json.dumps([["wrb.fr", "MkEWBc", json.dumps(parsed)]])
+        data = f")]}}'\n\n{len(payload)}\n{payload}\n".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run(base_url: str, total: int, concurrency: int) -> float:
+    def call(i):
+        with requests.Session() as session:
+            response = session.post(
+                f"{base_url}/translate/",
+                json={"text": f"phrase number {i}", "source_lang": "en", "target_lang": "uk"},
+            )
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    StubTranslateHandler.latency = args.latency
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), StubTranslateHandler)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    urls.TRANSLATE_RPC = "http://{host}/_/TranslateWebserverUi/data/batchexecute"
+    stub_host = f"127.0.0.1:{stub.server_port}"
+
+    def new_service() -> TranslationService:
+        from googletrans import Translator
+
+        return TranslationService(
+            translator=Translator(service_urls=[stub_host], http2=False),
+            cache=TranslationCache(max_size=0),
+        )
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    base_url = f"http://127.0.0.1:{port}"
+
+    # Before: a new TranslationService (and Translator HTTP client) per request
+    app.dependency_overrides[get_translation_service] = new_service
+    per_request = run(base_url, args.requests, args.concurrency)
+
+    # After: one shared, pooled client
+    shared = new_service()
+    app.dependency_overrides[get_translation_service] = lambda: shared
+    shared_rps = run(base_url, args.requests, args.concurrency)
+
+    print(f"per-request client: {per_request:8.1f} req/s")
+    print(f"shared client:      {shared_rps:8.1f} req/s")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Vocabulary analysis time (words and key phrases) on transcripts from 1 minute to 10 hours.
+
+Builds a synthetic frequency table (--table-words words with Zipf-distributed
+counts) in a temporary directory, then analyses synthetic transcripts of
+about 150 words per minute drawn from the same vocabulary with a different
+ranking, so each one has a realistic number of distinct words. Reports the
+first analysis, which maps the table, and the median of the following ones.
+
+Usage:
+    python benchmarks/bench_vocabulary.py [--tracks 1m 10m 1h 10h] [--table-words 200000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+
+import offline  # noqa: E402
+from app.services.vocabulary import FrequencyTable, analyze  # noqa: E402
+
+WORDS_PER_MINUTE = 150
+
+
+def synthetic_words(rng, count: int) -> list:
+    words = set()
+    while len(words) < count:
+        letters = rng.integers(ord("a"), ord("z") + 1, size=(count, 13), dtype=np.uint8)
+        for row, length in zip(letters, rng.integers(2, 14, size=count).tolist()):
+            words.add(row[:length].tobytes().decode("ascii"))
+    return sorted(words)[:count]
+
+
+def zipf_sample(rng, vocabulary: list, size: int) -> list:
+    ranks = np.minimum(rng.zipf(1.15, size=size), len(vocabulary)) - 1
+    return [vocabulary[rank] for rank in ranks.tolist()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tracks", nargs="+", default=["1m", "10m", "1h", "10h"], choices=offline.TRACKS)
+    parser.add_argument("--table-words", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vocabulary = synthetic_words(rng, args.table_words)
+    corpus_ranking = list(rng.permutation(vocabulary))
+    counts = {word: int(1e9 / (rank + 1) ** 1.1) + 1 for rank, word in enumerate(corpus_ranking)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        FrequencyTable.build(counts, directory)
+        print(f"table: {args.table_words} words built in {time.perf_counter() - started:.2f} s")
+
+        # Transcripts favour other words than the corpus does
+        transcript_ranking = list(rng.permutation(vocabulary))
+        table = None
+        print(f"{'track':<6} {'tokens':>8} {'distinct':>9} {'phrases':>8} {'first ms':>9} {'median ms':>10}")
+        for track in args.tracks:
+            tokens = zipf_sample(rng, transcript_ranking, offline.TRACKS[track] * WORDS_PER_MINUTE)
+            text = " ".join(tokens)
+            timings = []
+            for _ in range(args.repeat + 1):
+                started = time.perf_counter()
+                if table is None:
+                    table = FrequencyTable.load(directory)
+                result = analyze(text, table)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(
+                f"{track:<6} {result['tokens']:>8} {result['distinct_words']:>9} {len(result['phrases']):>8} "
+                f"{timings[0]:>9.1f} {statistics.median(timings[1:]):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
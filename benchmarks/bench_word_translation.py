@@ -0,0 +1,96 @@
+"""
+Per-word latency of translating vocabulary lists of 1, 100 and 1000 words.
+
+Compares one POST /translate/ per word (what the page used to do) with one
+POST /translate_words/ per list, with and without a local dictionary for the
+language pair. Translator calls go to the offline stub (benchmarks/offline.py)
+with --latency seconds per call, and the translation cache is disabled, so
+every word the dictionary does not know is sent to the stub. The dictionary
+is built in a temporary directory and knows --coverage of the words.
+
+Usage:
+    python benchmarks/bench_word_translation.py [--sizes 1 100 1000] [--latency 0.05] [--coverage 0.8]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+DICTIONARIES = tempfile.TemporaryDirectory()
+os.environ.update(DICTIONARIES_DIR=DICTIONARIES.name, RATE_LIMIT_ENABLED="0")
+
+import requests  # noqa: E402
+
+import offline  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routes.translation_routes import get_translation_service  # noqa: E402
+from app.services.dictionary import DictionaryIndex  # noqa: E402
+from app.services.translation_cache import TranslationCache  # noqa: E402
+
+
+def per_word(session: requests.Session, base_url: str, words: list) -> float:
+    started = time.perf_counter()
+    for word in words:
+        session.post(
+            f"{base_url}/translate/", json={"text": word, "source_lang": "en", "target_lang": "uk"}
+        ).raise_for_status()
+    return (time.perf_counter() - started) / len(words)
+
+
+def batch(session: requests.Session, base_url: str, words: list, target_lang: str) -> float:
+    started = time.perf_counter()
+    session.post(
+        f"{base_url}/translate_words/", json={"words": words, "source_lang": "en", "target_lang": target_lang}
+    ).raise_for_status()
+    return (time.perf_counter() - started) / len(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 100, 1000])
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per translator call")
+    parser.add_argument("--coverage", type=float, default=0.8, help="share of the words in the dictionary")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--per-word-limit", type=int, default=50, help="words timed with one request each")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = list({"".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(20000)})
+    known = rng.sample(vocabulary, int(len(vocabulary) * args.coverage))
+    DictionaryIndex.build({word: word[::-1] for word in known}, os.path.join(DICTIONARIES.name, "en-uk"))
+
+    stub = offline.StubServer(latency=args.latency)
+    service = offline.install(stub)
+    service.cache = TranslationCache(max_size=0)
+    app.dependency_overrides[get_translation_service] = lambda: service
+    server, base_url = offline.start_app_server(app)
+    session = requests.Session()
+
+    scenarios = (
+        ("/translate/ per word", lambda words: per_word(session, base_url, words[: args.per_word_limit])),
+        # No dictionary is built for en-de: every word goes to the translator
+        ("/translate_words/", lambda words: batch(session, base_url, words, "de")),
+        (f"/translate_words/ + {args.coverage:.0%} dictionary", lambda words: batch(session, base_url, words, "uk")),
+    )
+    print(f"{'words':>6}  {'endpoint':<36} {'ms per word':>12}")
+    for size in args.sizes:
+        for name, call in scenarios:
+            timings = [call(rng.sample(vocabulary, size)) * 1000 for _ in range(args.repeat)]
+            print(f"{size:>6}  {name:<36} {statistics.median(timings):>12.2f}")
+
+    server.should_exit = True
+    stub.close()
+    DICTIONARIES.cleanup()
+
+
+if __name__ == "__main__":
+    main()
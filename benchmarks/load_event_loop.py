@@ -0,0 +1,120 @@
+"""
+Load test: latency of cheap endpoints while slow extractions are in flight.
+
+yt-dlp and the subtitle download are replaced by a sleep, so the test runs
+offline. The server runs in-process on a random port.
+
+Usage:
+    python benchmarks/load_event_loop.py [--slow-requests 8] [--slow-seconds 3]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import uvicorn
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Every slow request comes from the same client
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+from app.main import app  # noqa: E402
+from app.services.cue_track import CueTrack  # noqa: E402
+from app.services.subtitle_service import SubtitleService  # noqa: E402
+from app.services.subtitle_store import StoredTrack  # noqa: E402
+
+
+def install_slow_service(slow_seconds: float) -> None:
+    def get_track(video_url, language_code="en"):
+        time.sleep(slow_seconds)
+        cues = CueTrack.from_events([(0, 1000, "lorem ipsum")])
+        return StoredTrack.create("lorem ipsum " * 100, cues), None
+
+    def get_available_languages(video_url):
+        return {"en": "English"}, None
+
+    SubtitleService.get_track = staticmethod(get_track)
+    SubtitleService.get_available_languages = staticmethod(get_available_languages)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def measure_cheap(base_url: str, samples: int) -> list:
+    latencies = []
+    with requests.Session() as session:
+        for _ in range(samples):
+            start = time.perf_counter()
+            session.get(f"{base_url}/static/styles.css").raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, latencies: list) -> None:
+    print(
+        f"{label:<28} p50={statistics.median(latencies):7.2f} ms  "
+        f"p99={percentile(latencies, 99):7.2f} ms  max={max(latencies):7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slow-requests", type=int, default=8)
+    parser.add_argument("--slow-seconds", type=float, default=3.0)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    install_slow_service(args.slow_seconds)
+    port = free_port()
+    server = start_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+
+    measure_cheap(base_url, 10)  # warm up connections and caches
+    report("idle", measure_cheap(base_url, args.samples))
+
+    def slow_call(_):
+        return requests.post(
+            f"{base_url}/process_video/",
+            json={"video_url": "https://youtu.be/aaaaaaaaaaa", "language_code": "en"},
+            headers={"Accept": "application/json"},
+        ).status_code
+
+    with ThreadPoolExecutor(max_workers=args.slow_requests) as pool:
+        slow = [pool.submit(slow_call, i) for i in range(args.slow_requests)]
+        time.sleep(0.2)  # let the slow extractions start
+        report(f"{args.slow_requests} slow extractions", measure_cheap(base_url, args.samples))
+        statuses = [future.result() for future in slow]
+
+    print(f"slow request statuses: {statuses}")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
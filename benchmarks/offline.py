@@ -0,0 +1,220 @@
+"""
+Offline stand-ins for YouTube and Google Translate, shared by the benchmarks.
+
+- Fixtures: benchmarks/fixtures/extract_info.json is an extract_info payload
+  in the shape yt-dlp returns (trimmed, with placeholders for the video ID and
+  the stub URL). clip_1min.json3 is a one-minute json3 track; longer tracks
+  repeat its cues with shifted timestamps and are generated once into
+  benchmarks/fixtures/generated/.
+- FakeYoutubeDL: a drop-in for yt_dlp.YoutubeDL, installed through
+  SubtitleService.ydl_factory. The video ID picks the track length.
+- StubServer: a local HTTP server for subtitle downloads (/api/timedtext)
+  and for googletrans' RPC endpoint, which it answers with reversed text.
+"""
+
+import json
+import os
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+GENERATED = os.path.join(FIXTURES, "generated")
+
+# Track lengths in minutes, by name
+TRACKS = {"1m": 1, "10m": 10, "1h": 60, "10h": 600}
+# 11-character video IDs: "b", the length in minutes, "m" and a variant number,
+# so distinct variants of one track miss the metadata cache
+_VIDEO_ID = re.compile(r"b(\d{4})m\d{5}")
+_template = None
+
+
+def video_id(track: str, variant: int = 0) -> str:
+    return f"b{TRACKS[track]:04d}m{variant:05d}"
+
+
+def video_url(track: str, variant: int = 0) -> str:
+    return f"https://www.youtube.com/watch?v={video_id(track, variant)}"
+
+
+def json3_path(minutes: int) -> str:
+    """Path of a json3 track of the given length, generated from the one-minute clip on first use"""
+    if minutes == 1:
+        return os.path.join(FIXTURES, "clip_1min.json3")
+    path = os.path.join(GENERATED, f"track_{minutes}min.json3")
+    if os.path.exists(path):
+        return path
+
+    with open(os.path.join(FIXTURES, "clip_1min.json3"), encoding="utf-8") as file:
+        clip = json.load(file)
+    header = [event for event in clip["events"] if "segs" not in event]
+    cues = [event for event in clip["events"] if "segs" in event]
+    head = {key: value for key, value in clip.items() if key != "events"}
+
+    os.makedirs(GENERATED, exist_ok=True)
+    partial = path + ".part"
+    with open(partial, "w", encoding="utf-8") as file:
+        # Written event by event so a 10-hour track never sits in memory
+        file.write(json.dumps(head, ensure_ascii=False)[:-1] + ', "events": [')
+        first = True
+        for event in header:
+            file.write(("" if first else ",\n") + json.dumps(dict(event, dDurationMs=minutes * 60000)))
+            first = False
+        for minute in range(minutes):
+            for event in cues:
+                shifted = dict(event, tStartMs=event["tStartMs"] + minute * 60000)
+                file.write(",\n" + json.dumps(shifted, ensure_ascii=False))
+        file.write("]}\n")
+    os.replace(partial, path)
+    return path
+
+
+class FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that answers extract_info() from the fixture payload"""
+
+    base_url = ""
+    latency = 0.0
+
+    def __init__(self, options: dict = None):
+        self.options = options or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url: str, download: bool = True, process: bool = True, **kwargs) -> dict:
+        time.sleep(self.latency)
+        return fixture_info(url, self.base_url)
+
+
+def fixture_info(url: str, base_url: str = "") -> dict:
+    """
+    The fixture extract_info payload for a benchmark video URL.
+
+    Raises:
+        yt_dlp.DownloadError: If the URL has no benchmark video ID
+    """
+    global _template
+
+    match = _VIDEO_ID.search(url)
+    if match is None:
+        import yt_dlp
+
+        raise yt_dlp.DownloadError(f"ERROR: [youtube] {url}: Video unavailable")
+    minutes = int(match.group(1))
+
+    if _template is None:
+        with open(os.path.join(FIXTURES, "extract_info.json"), encoding="utf-8") as file:
+            _template = file.read()
+    payload = (
+        _template.replace("{id}", match.group(0))
+        .replace("{title}", f"Offline benchmark track ({minutes} min)")
+        .replace("{base}", base_url)
+    )
+    info = json.loads(payload)
+    info["duration"] = minutes * 60
+    return info
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        match = _VIDEO_ID.search(parse_qs(url.query).get("v", [""])[0])
+        if url.path != "/api/timedtext" or match is None:
+            self.send_error(404)
+            return
+        time.sleep(self.latency)
+        path = json3_path(int(match.group(1)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.end_headers()
+        with open(path, "rb") as file:
+            while True:
+                chunk = file.read(65536)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+
+    def do_POST(self):
+        # googletrans batchexecute RPC
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        request = json.loads(parse_qs(body.decode())["f.req"][0])
+        text, src, dest = json.loads(request[0][0][1])[0][:3]
+        time.sleep(self.latency)
+        parsed = [[None, None, src], [[[None, None, None, True, None, [[text[::-1], []]]]]], src]
+        payload = json.dumps([["wrb.fr", "MkEWBc", json.dumps(parsed)]])
+        data = f")]}}'\n\n{len(payload)}\n{payload}\n".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    """Local HTTP stub for subtitle downloads and translator calls, served on a background thread"""
+
+    def __init__(self, latency: float = 0.0):
+        handler = type("StubHandler", (_StubHandler,), {"latency": latency})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self.host = f"127.0.0.1:{self._server.server_port}"
+        self.base_url = f"http://{self.host}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def install(stub: StubServer, extract_latency: float = 0.0):
+    """
+    Route the application's YouTube and translator traffic to the stub.
+
+    Returns:
+        TranslationService: A translation service whose client talks to the stub
+    """
+    from googletrans import Translator, urls
+
+    from app.services.subtitle_service import SubtitleService
+    from app.services.translation_service import TranslationService
+
+    FakeYoutubeDL.base_url = stub.base_url
+    FakeYoutubeDL.latency = extract_latency
+    SubtitleService.ydl_factory = FakeYoutubeDL
+
+    # googletrans only speaks HTTPS to its RPC host; the stub is plain HTTP
+    urls.TRANSLATE_RPC = "http://{host}/_/TranslateWebserverUi/data/batchexecute"
+    return TranslationService(translator=Translator(service_urls=[stub.host], http2=False))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app_server(app):
+    """Serve the ASGI app in-process on a free port; returns (server, base_url)"""
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
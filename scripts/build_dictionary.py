@@ -0,0 +1,63 @@
+"""
+Build the local dictionary /translate_words/ answers from before calling the
+remote translator.
+
+Input files are tab-separated word lists, one "word<TAB>translation" pair
+per line; lines starting with # are skipped. A word listed more than once
+gets all its distinct translations, separated by "; ".
+
+The dictionary is written to DICTIONARIES_DIR/<source>-<target>/ unless
+--output is given; restart the server to pick it up.
+
+Usage:
+    python scripts/build_dictionary.py en uk en-uk.tsv [more.tsv ...]
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from app.config import DICTIONARIES_DIR  # noqa: E402
+from app.services.dictionary import DictionaryIndex, normalize_word  # noqa: E402
+
+
+def read_word_list(path: str, translations: dict) -> None:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.startswith("#") or "\t" not in line:
+                continue
+            word, translated = line.rstrip("\n").split("\t", 1)
+            word, translated = normalize_word(word), translated.strip()
+            if word and translated:
+                translations.setdefault(word, {})[translated] = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help='source language code, e.g. "en"')
+    parser.add_argument("target", help='target language code, e.g. "uk"')
+    parser.add_argument("files", nargs="+", metavar="FILE", help="tab-separated word lists")
+    parser.add_argument("--output", help="dictionary directory (default: DICTIONARIES_DIR/<source>-<target>)")
+    args = parser.parse_args()
+
+    translations = {}
+    for path in args.files:
+        read_word_list(path, translations)
+    if not translations:
+        sys.exit(f"No word<TAB>translation lines in {', '.join(args.files)}")
+
+    directory = args.output or os.path.join(DICTIONARIES_DIR, f"{args.source.lower()}-{args.target.lower()}")
+    dictionary = DictionaryIndex.build(
+        {word: "; ".join(senses) for word, senses in translations.items()},
+        directory,
+        source=", ".join(os.path.basename(path) for path in args.files),
+    )
+    print(f"{len(dictionary)} words written to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Build the word frequency table /vocabulary/ ranks a language's words against.
+
+Counts can come from any mix of:
+
+- frequency lists, one "word count" pair per line (e.g. the OpenSubtitles
+  lists of the FrequencyWords project, which match spoken language well);
+- plain text files, tokenized the way transcripts are;
+- the transcripts already in the subtitle store (--from-store).
+
+The table is written to VOCABULARY_TABLES_DIR/<language>/ unless --output is
+given; restart the server to pick it up.
+
+Usage:
+    python scripts/build_word_frequencies.py en --frequency-list en_50k.txt
+    python scripts/build_word_frequencies.py uk --text books/*.txt --from-store
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from app.config import VOCABULARY_TABLES_DIR  # noqa: E402
+from app.services.subtitle_store import subtitle_store  # noqa: E402
+from app.services.vocabulary import FrequencyTable, tokenize  # noqa: E402
+
+
+def read_frequency_list(path: str, counts: Counter) -> None:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) != 2 or not parts[1].isdigit():
+                continue
+            # Entries are normalized like transcript words; multi-word entries are skipped
+            words = tokenize(parts[0])
+            if len(words) == 1:
+                counts[words[0]] += int(parts[1])
+
+
+def read_text(path: str, counts: Counter) -> None:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            counts.update(tokenize(line))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("language", help='language code of the table, e.g. "en"')
+    parser.add_argument("--frequency-list", nargs="+", default=[], metavar="FILE")
+    parser.add_argument("--text", nargs="+", default=[], metavar="FILE")
+    parser.add_argument("--from-store", action="store_true", help="count the stored transcripts in the language")
+    parser.add_argument("--min-count", type=int, default=3, help="leave out words seen fewer times")
+    parser.add_argument("--output", help="table directory (default: VOCABULARY_TABLES_DIR/<language>)")
+    args = parser.parse_args()
+
+    counts = Counter()
+    sources = []
+    for path in args.frequency_list:
+        read_frequency_list(path, counts)
+        sources.append(os.path.basename(path))
+    for path in args.text:
+        read_text(path, counts)
+        sources.append(os.path.basename(path))
+    if args.from_store:
+        transcripts = 0
+        for text in subtitle_store.iter_texts(args.language):
+            counts.update(tokenize(text))
+            transcripts += 1
+        sources.append(f"{transcripts} stored transcripts")
+    if not sources:
+        parser.error("give at least one of --frequency-list, --text and --from-store")
+
+    # The corpus size includes the rare words left out of the table
+    total = sum(counts.values())
+    kept = {word: count for word, count in counts.items() if count >= args.min_count}
+    if not kept:
+        sys.exit(f"No word occurs at least {args.min_count} times in {', '.join(sources)}")
+
+    directory = args.output or os.path.join(VOCABULARY_TABLES_DIR, args.language.lower())
+    table = FrequencyTable.build(kept, directory, total=total, source=", ".join(sources))
+    print(f"{len(table)} words from a corpus of {total} written to {directory}")
+
+
+if __name__ == "__main__":
+    main()
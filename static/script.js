@@ -72,6 +72,28 @@ function loadVocabulary() {
     });
 }
 
+// Function to add a phrase to the vocabulary; returns false if it is already there
+function saveToVocabulary(original, translated, sourceLang, targetLang) {
+    const vocabulary = JSON.parse(localStorage.getItem('vocabulary') || '[]');
+
+    // Check if the phrase already exists to avoid duplicates
+    const exists = vocabulary.some(phrase =>
+        phrase.original === original && phrase.translated === translated
+    );
+    if (exists) return false;
+
+    vocabulary.push({
+        id: Date.now() + vocabulary.length, // Unique even when several words are saved at once
+        original: original,
+        translated: translated,
+        sourceLang: sourceLang,
+        targetLang: targetLang,
+        date: new Date().toISOString()
+    });
+    localStorage.setItem('vocabulary', JSON.stringify(vocabulary));
+    return true;
+}
+
 // Function to delete vocabulary item
 function deleteVocabularyItem(id) {
     const vocabulary = JSON.parse(localStorage.getItem('vocabulary') || '[]');
@@ -269,6 +291,182 @@ function addTask() {
     loadTasks();
 }
 
+// Function to show subtitles as they are extracted, from the /stream_subtitles/ events
+function streamSubtitles(videoUrl, languageCode, translateTo, submitBtn) {
+    const card = document.getElementById('subtitle-card');
+    const text = document.getElementById('subtitle-text');
+    const status = document.getElementById('stream-status');
+    const actions = document.getElementById('subtitle-actions');
+    const translation = document.getElementById('subtitle-translation');
+    const translationText = document.getElementById('subtitle-translation-text');
+
+    text.textContent = '';
+    translationText.textContent = '';
+    translation.style.display = 'none';
+    document.getElementById('words-to-learn').style.display = 'none';
+    actions.style.display = 'none';
+    status.textContent = 'Fetching video info...';
+    status.style.display = 'block';
+    card.style.display = 'block';
+
+    const params = new URLSearchParams({ video_url: videoUrl, language_code: languageCode });
+    if (translateTo) params.set('translate_to', translateTo);
+    const source = new EventSource('/stream_subtitles/?' + params.toString());
+    let cueCount = 0;
+
+    function finish(message) {
+        // Closing stops the browser from reconnecting and starting over
+        source.close();
+        if (message) {
+            status.textContent = message;
+        } else {
+            status.style.display = 'none';
+        }
+        if (submitBtn) {
+            submitBtn.textContent = 'Extract Subtitles';
+            submitBtn.disabled = false;
+        }
+    }
+
+    source.addEventListener('title', function(event) {
+        const data = JSON.parse(event.data);
+        if (data.title) {
+            document.getElementById('video-title').textContent = data.title;
+            document.getElementById('video-info').style.display = 'block';
+        }
+        status.textContent = 'Loading subtitles...';
+    });
+
+    source.addEventListener('cues', function(event) {
+        const data = JSON.parse(event.data);
+        const batch = data.cues.map(cue => cue.text).join(' ');
+        // Text nodes are appended, so earlier batches are not re-rendered
+        text.appendChild(document.createTextNode((cueCount ? ' ' : '') + batch));
+        cueCount += data.cues.length;
+        status.textContent = `Loading subtitles... ${cueCount} captions so far`;
+    });
+
+    source.addEventListener('translation', function(event) {
+        const data = JSON.parse(event.data);
+        translationText.appendChild(document.createTextNode((data.first ? ' ' : '') + data.text));
+        translation.style.display = 'block';
+    });
+
+    source.addEventListener('translation_failed', function(event) {
+        console.error('Translation error:', JSON.parse(event.data).error);
+    });
+
+    source.addEventListener('done', function(event) {
+        const data = JSON.parse(event.data);
+        document.getElementById('download-video-url').value = videoUrl;
+        document.getElementById('download-language-code').value = languageCode;
+        // Only languages with a word frequency table can be analysed
+        document.getElementById('words-to-learn-btn').style.display = data.vocabulary ? '' : 'none';
+        actions.style.display = '';
+        finish(cueCount ? null : 'No captions were found in this track.');
+    });
+
+    source.addEventListener('failed', function(event) {
+        finish('Error: ' + JSON.parse(event.data).error);
+    });
+
+    source.onerror = function() {
+        // The connection was lost before the stream finished
+        if (source.readyState !== EventSource.CLOSED) {
+            finish('Error connecting to the server');
+        }
+    };
+}
+
+// Function to list the words of the extracted subtitles worth learning, from /vocabulary/
+async function loadWordsToLearn(videoUrl, languageCode) {
+    const section = document.getElementById('words-to-learn');
+    const status = document.getElementById('words-to-learn-status');
+    const list = document.getElementById('words-to-learn-list');
+
+    list.innerHTML = '';
+    status.textContent = 'Finding words...';
+    status.style.display = 'block';
+    section.style.display = 'block';
+
+    try {
+        const params = new URLSearchParams({ video_url: videoUrl, language_code: languageCode });
+        const response = await fetch('/vocabulary/?' + params.toString());
+        const data = await response.json();
+        if (!response.ok) {
+            status.textContent = 'Error: ' + (data.error || 'Vocabulary analysis failed');
+            return;
+        }
+        // Key phrases are listed after the single words
+        const entries = data.words.map(entry => ({ text: entry.word, count: entry.count }))
+            .concat((data.phrases || []).map(entry => ({ text: entry.phrase, count: entry.count })));
+        if (entries.length === 0) {
+            status.textContent = 'No uncommon words are used often enough in this video.';
+            return;
+        }
+        status.style.display = 'none';
+        const chips = entries.map(entry => {
+            const chip = document.createElement('button');
+            chip.type = 'button';
+            chip.className = 'word-chip';
+            chip.textContent = entry.text;
+            chip.title = `Used ${entry.count} times`;
+            list.appendChild(chip);
+            return chip;
+        });
+        await translateWordsToLearn(entries.map(entry => entry.text), chips, languageCode);
+    } catch (error) {
+        status.textContent = 'Error connecting to the server';
+        console.error('Vocabulary error:', error);
+    }
+}
+
+// Function to translate the listed words in one /translate_words/ request
+async function translateWordsToLearn(words, chips, languageCode) {
+    const sourceLang = languageCode.split('-')[0].toLowerCase();
+    const targetLang = document.getElementById('target-language').value;
+    let translations = [];
+
+    try {
+        const response = await fetch('/translate_words/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ words: words, source_lang: sourceLang, target_lang: targetLang })
+        });
+        const data = await response.json();
+        if (response.ok) {
+            translations = data.translations;
+        } else {
+            console.error('Word translation error:', data.detail);
+        }
+    } catch (error) {
+        console.error('Word translation error:', error);
+    }
+
+    chips.forEach((chip, index) => {
+        const word = words[index];
+        const translated = translations[index] ? translations[index].translated : null;
+        if (translated) {
+            const label = document.createElement('span');
+            label.className = 'word-translation';
+            label.textContent = translated;
+            chip.appendChild(label);
+        }
+        chip.addEventListener('click', function() {
+            if (!translated) {
+                // Untranslated words go to the translator instead
+                const input = document.getElementById('english-text');
+                input.value = word;
+                input.focus();
+                return;
+            }
+            saveToVocabulary(word, translated, sourceLang, targetLang);
+            chip.classList.add('word-saved');
+            loadVocabulary();
+        });
+    });
+}
+
 // Helper function to format dates
 function formatDate(dateString) {
     if (!dateString) return '';
@@ -346,32 +544,17 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
         
-        // Get existing vocabulary from localStorage
-        const vocabulary = JSON.parse(localStorage.getItem('vocabulary') || '[]');
-        
-        // Check if the phrase already exists to avoid duplicates
-        const exists = vocabulary.some(phrase => 
-            phrase.original === originalText && phrase.translated === translatedText
+        const saved = saveToVocabulary(
+            originalText,
+            translatedText,
+            document.getElementById('input-language').value,
+            document.getElementById('target-language').value
         );
-        
-        if (exists) {
+        if (!saved) {
             alert('This phrase is already in your vocabulary');
             return;
         }
         
-        // Add new phrase
-        vocabulary.push({
-            id: Date.now(), // Use timestamp as unique ID
-            original: originalText,
-            translated: translatedText,
-            sourceLang: document.getElementById('input-language').value,
-            targetLang: document.getElementById('target-language').value,
-            date: new Date().toISOString()
-        });
-        
-        // Save back to localStorage
-        localStorage.setItem('vocabulary', JSON.stringify(vocabulary));
-        
         // Show success message
         const saveBtn = document.getElementById('save-btn');
         const originalBtnText = saveBtn.textContent;
@@ -469,6 +652,18 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    const wordsButton = document.getElementById('words-to-learn-btn');
+    if (wordsButton) {
+        wordsButton.addEventListener('click', async function() {
+            this.disabled = true;
+            await loadWordsToLearn(
+                document.getElementById('download-video-url').value,
+                document.getElementById('download-language-code').value
+            );
+            this.disabled = false;
+        });
+    }
+
     // Check for Create Note from Subtitles button
     const createNoteBtn = document.getElementById('create-note-from-subtitles');
     if (createNoteBtn) {
@@ -547,15 +742,27 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    // Language selection form - show loading state
+    // Language selection form - show loading state and stream the subtitles in
     const languageForm = document.getElementById('language-selection-form');
     if (languageForm) {
-        languageForm.addEventListener('submit', function() {
+        languageForm.addEventListener('submit', function(e) {
             const submitBtn = document.getElementById('extract-subtitles-btn');
             if (submitBtn) {
                 submitBtn.textContent = 'Extracting...';
                 submitBtn.disabled = true;
             }
+
+            // Browsers without EventSource submit the form and get the whole page back
+            if (window.EventSource) {
+                e.preventDefault();
+                const formData = new FormData(languageForm);
+                streamSubtitles(
+                    formData.get('video_url'),
+                    formData.get('language_code'),
+                    formData.get('translate_to'),
+                    submitBtn
+                );
+            }
         });
     }
     
@@ -613,9 +820,13 @@ document.addEventListener('DOMContentLoaded', function() {
                     if (!response.ok) {
                         throw new Error('Download failed');
                     }
-                    return response.blob();
+                    // The server names the file after the video, language and format
+                    const disposition = response.headers.get('Content-Disposition') || '';
+                    const match = disposition.match(/filename="([^"]+)"/);
+                    const filename = match ? match[1] : 'subtitles.' + (formData.get('format') || 'txt');
+                    return response.blob().then(blob => ({ blob, filename }));
                 })
-                .then(blob => {
+                .then(({ blob, filename }) => {
                     // Create a URL for the blob
                     const url = window.URL.createObjectURL(blob);
                     
@@ -623,10 +834,10 @@ document.addEventListener('DOMContentLoaded', function() {
                     const a = document.createElement('a');
                     a.style.display = 'none';
                     a.href = url;
-                    a.download = 'subtitles.srt'; // Default filename or get from headers
+                    a.download = filename;
                     
-                    // Add download attribute with the unique ID
-                    a.setAttribute('download', downloadId);
+                    // Tag the link with the unique download ID
+                    a.setAttribute('data-download-id', downloadId);
                     
                     // Append to document and click
                     document.body.appendChild(a);
@@ -634,7 +845,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     // Create a MutationObserver to detect when the download is added
                     const observer = new MutationObserver((mutations, obs) => {
                         // Look for the download item
-                        const downloadItem = document.querySelector(`[download="${downloadId}"]`);
+                        const downloadItem = document.querySelector(`[data-download-id="${downloadId}"]`);
                         if (downloadItem) {
                             // Download has started
                             downloadButton.textContent = 'Downloaded!';
@@ -659,7 +870,7 @@ document.addEventListener('DOMContentLoaded', function() {
                         childList: true,
                         subtree: true,
                         attributes: true,
-                        attributeFilter: ['download']
+                        attributeFilter: ['data-download-id']
                     });
                     
                     // Click to start download
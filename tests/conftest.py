@@ -0,0 +1,43 @@
+"""
+Test settings: applied before the application modules read app/config.py.
+
+Every test session gets its own SQLite database, and nothing is rate limited
+or warmed up.
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+_database = os.path.join(tempfile.mkdtemp(prefix="subtitles-tests-"), "test.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_database}")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+os.environ.setdefault("WARMUP", "off")
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    """Serve the application in-process on a free port"""
+    import uvicorn
+
+    from app.main import app
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(5)
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.middleware import RateLimitMiddleware
+from app.services import admission
+from app.services.admission import (
+    ExtractionGate,
+    MemoryBuckets,
+    RateLimiter,
+    UpstreamBusyError,
+    parse_rate_limits,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, "monotonic", clock)
+    return clock
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("/a/=30/60, /b/=2/1,") == {"/a/": (30.0, 60.0), "/b/": (2.0, 1.0)}
+    with pytest.raises(ValueError):
+        parse_rate_limits("/a/=30")
+    with pytest.raises(ValueError):
+        parse_rate_limits("/a/=0/60")
+
+
+def test_bucket_refills_at_its_rate(clock):
+    buckets = MemoryBuckets()
+    assert [buckets.take("k", burst=2, rate=0.5) for _ in range(2)] == [0, 0]
+    assert buckets.take("k", burst=2, rate=0.5) == pytest.approx(2.0)
+
+    clock.now += 1
+    assert buckets.take("k", burst=2, rate=0.5) == pytest.approx(1.0)
+    clock.now += 1
+    assert buckets.take("k", burst=2, rate=0.5) == 0
+
+
+def test_bucket_never_holds_more_than_its_burst(clock):
+    buckets = MemoryBuckets()
+    buckets.take("k", burst=2, rate=1)
+    clock.now += 3600
+    assert [buckets.take("k", burst=2, rate=1) for _ in range(3)] == [0, 0, pytest.approx(1.0)]
+
+
+def test_least_recently_used_clients_are_forgotten(clock):
+    buckets = MemoryBuckets(max_keys=2)
+    for key in ("a", "b", "c"):
+        buckets.take(key, burst=1, rate=1)
+    # "a" was dropped, so it starts with a full bucket again
+    assert buckets.take("a", burst=1, rate=1) == 0
+    assert buckets.take("c", burst=1, rate=1) > 0
+
+
+def test_gate_rejects_when_the_queue_is_full():
+    gate = ExtractionGate(max_concurrency=1, queue_size=0, queue_timeout=1)
+    with gate.slot():
+        assert gate.saturated()
+        with pytest.raises(UpstreamBusyError) as info:
+            with gate.slot():
+                pass
+    assert info.value.retry_after >= 1
+    assert gate.stats()["rejected"] == 1
+
+
+def test_gate_times_out_queued_callers():
+    gate = ExtractionGate(max_concurrency=1, queue_size=1, queue_timeout=0.1)
+    with gate.slot():
+        with pytest.raises(UpstreamBusyError):
+            with gate.slot():
+                pass
+    assert gate.stats()["timed_out"] == 1
+
+
+def test_resumed_work_waits_even_when_the_queue_is_full():
+    gate = ExtractionGate(max_concurrency=1, queue_size=0, queue_timeout=0.1)
+    acquired = []
+
+    def resume():
+        with gate.slot(resume=True):
+            acquired.append(time.monotonic())
+
+    with gate.slot():
+        thread = threading.Thread(target=resume)
+        thread.start()
+        # Held for longer than the queue timeout, which resumed work does not have
+        time.sleep(0.3)
+        assert not acquired
+        assert gate.stats()["resuming"] == 1
+    thread.join(2)
+    assert len(acquired) == 1
+    assert gate.stats()["admitted"] == 1
+    assert gate.stats()["timed_out"] == 0
+
+
+def test_freed_slots_go_to_resumed_work_first():
+    gate = ExtractionGate(max_concurrency=1, queue_size=1, queue_timeout=2)
+    order = []
+
+    def run(resume):
+        with gate.slot(resume=resume):
+            order.append(resume)
+
+    with gate.slot():
+        new = threading.Thread(target=run, args=(False,))
+        new.start()
+        time.sleep(0.1)
+        resumed = threading.Thread(target=run, args=(True,))
+        resumed.start()
+        time.sleep(0.1)
+    new.join(2)
+    resumed.join(2)
+    assert order == [True, False]
+
+
+def request(app, path="/x/", client="1.2.3.4"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [], "client": (client, 1234)}
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    return start["status"], dict(start.get("headers", []))
+
+
+async def ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def test_middleware_answers_429_with_retry_after(clock):
+    limiter = RateLimiter({"/x/": (2, 60)}, MemoryBuckets())
+    app = RateLimitMiddleware(ok, limiter=limiter, gate=ExtractionGate(1, 1, 1))
+
+    assert [request(app)[0] for _ in range(2)] == [200, 200]
+    status, headers = request(app)
+    assert status == 429
+    assert headers[b"retry-after"] == b"30"
+    # Other clients and paths without a rule are not limited
+    assert request(app, client="5.6.7.8")[0] == 200
+    assert request(app, path="/y/")[0] == 200
+
+    clock.now += 30
+    assert request(app)[0] == 200
+
+
+def test_middleware_rejects_while_the_extraction_queue_is_full():
+    gate = ExtractionGate(max_concurrency=1, queue_size=0, queue_timeout=1)
+    app = RateLimitMiddleware(ok, limiter=RateLimiter({"/x/": (100, 60)}, MemoryBuckets()), gate=gate)
+
+    with gate.slot():
+        status, headers = request(app)
+        assert status == 429
+        assert b"retry-after" in headers
+    assert request(app)[0] == 200
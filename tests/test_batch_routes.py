@@ -0,0 +1,144 @@
+import io
+import json
+import zipfile
+
+import requests
+
+from app.routes import batch_routes
+from app.services.admission import UpstreamBusyError
+from app.services.executor import StageTimeoutError
+from app.services.cue_track import CueTrack
+from app.services.subtitle_service import SubtitleService
+from app.services.subtitle_store import StoredTrack
+
+TRACK = StoredTrack.create("Hello there.", CueTrack.from_events([(0, 1000, "Hello there.")]))
+
+
+def fetch_zip(base_url, video_url):
+    response = requests.post(
+        f"{base_url}/process_bundle/",
+        json={"video_url": video_url, "language_codes": ["en", "de"], "output": "zip", "format": "srt"},
+    )
+    response.raise_for_status()
+    return response, zipfile.ZipFile(io.BytesIO(response.content))
+
+
+def test_bundle_files_are_named_after_the_video_id(base_url, monkeypatch):
+    monkeypatch.setattr(SubtitleService, "get_track", lambda video_url, language_code: (TRACK, None))
+    response, archive = fetch_zip(base_url, "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=5")
+
+    assert response.headers["content-disposition"] == 'attachment; filename="dQw4w9WgXcQ_subtitles.zip"'
+    assert archive.namelist() == ["dQw4w9WgXcQ_en.srt", "dQw4w9WgXcQ_de.srt"]
+
+
+def test_url_without_a_video_id_stays_out_of_file_names(base_url, monkeypatch):
+    monkeypatch.setattr(SubtitleService, "get_track", lambda video_url, language_code: (TRACK, None))
+    response, archive = fetch_zip(base_url, 'https://example.com/"watch"/../clip')
+
+    assert response.headers["content-disposition"] == 'attachment; filename="subtitles_subtitles.zip"'
+    assert archive.namelist() == ["subtitles_en.srt", "subtitles_de.srt"]
+
+
+def run_batch(base_url, **body):
+    response = requests.post(f"{base_url}/process_batch/", json=body)
+    lines = [json.loads(line) for line in response.text.splitlines()] if response.ok else []
+    return response, lines
+
+
+def extract_subtitles(video_url, language_code):
+    video_id = SubtitleService.get_video_id(video_url)
+    if video_id == "privateVid0":
+        return None, "This video is private."
+    if video_id == "timeoutVid0":
+        raise StageTimeoutError("subtitle extraction", 1)
+    if video_id == "busyVideo00":
+        raise UpstreamBusyError(3)
+    return f"Transcript of {video_id} in {language_code}", None
+
+
+def test_batch_streams_one_line_per_video(base_url, monkeypatch):
+    monkeypatch.setattr(SubtitleService, "extract_subtitles", extract_subtitles)
+    videos = ["dQw4w9WgXcQ", "privateVid0", "timeoutVid0", "busyVideo00", "https://youtu.be/9bZkp7q19f0"]
+    response, lines = run_batch(base_url, video_urls=videos, language_code="de", concurrency=2)
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    *results, summary = lines
+    assert summary == {"done": True, "total": 5, "failed": 3}
+    by_index = {result["index"]: result for result in results}
+    assert sorted(by_index) == [0, 1, 2, 3, 4]
+    assert by_index[0]["subtitle_text"] == "Transcript of dQw4w9WgXcQ in de"
+    assert by_index[4]["video_id"] == "9bZkp7q19f0" and by_index[4]["error"] is None
+    # Failures are reported in their own lines without stopping the batch
+    assert by_index[1]["error"] == "This video is private."
+    assert "took longer than" in by_index[2]["error"]
+    assert by_index[3]["error"] and by_index[3]["subtitle_text"] is None
+
+
+def test_playlist_is_expanded_after_the_listed_videos(base_url, monkeypatch):
+    monkeypatch.setattr(SubtitleService, "extract_subtitles", extract_subtitles)
+    monkeypatch.setattr(
+        SubtitleService,
+        "expand_playlist",
+        lambda url: ([f"https://www.youtube.com/watch?v=playlist00{n}" for n in range(2)], None),
+    )
+    _, lines = run_batch(base_url, video_urls=["dQw4w9WgXcQ"], playlist_url="https://www.youtube.com/playlist?list=x")
+
+    assert sorted((line["index"], line["video_id"]) for line in lines[:-1]) == [
+        (0, "dQw4w9WgXcQ"),
+        (1, "playlist000"),
+        (2, "playlist001"),
+    ]
+
+
+def test_playlist_expansion_limit(base_url, monkeypatch):
+    monkeypatch.setattr(batch_routes, "BATCH_MAX_VIDEOS", 3)
+    monkeypatch.setattr(SubtitleService, "extract_subtitles", extract_subtitles)
+    playlist = [f"https://www.youtube.com/watch?v=playlist00{n}" for n in range(3)]
+    monkeypatch.setattr(SubtitleService, "expand_playlist", lambda url: (playlist, None))
+
+    response, lines = run_batch(base_url, playlist_url="https://www.youtube.com/playlist?list=x")
+    assert response.status_code == 200 and lines[-1]["total"] == 3
+
+    response, _ = run_batch(base_url, video_urls=["dQw4w9WgXcQ"], playlist_url="https://www.youtube.com/playlist?list=x")
+    assert response.status_code == 400
+    assert response.json() == {"error": "A batch can contain at most 3 videos"}
+
+
+def test_playlist_errors_and_empty_batches_are_rejected(base_url, monkeypatch):
+    monkeypatch.setattr(SubtitleService, "expand_playlist", lambda url: ([], "No videos were found in this playlist or channel."))
+    response, _ = run_batch(base_url, playlist_url="https://www.youtube.com/playlist?list=x")
+    assert (response.status_code, response.json()["error"]) == (400, "No videos were found in this playlist or channel.")
+
+    response, _ = run_batch(base_url)
+    assert response.status_code == 400
+
+
+def test_channel_tabs_are_expanded_into_their_videos(monkeypatch):
+    class YoutubeDL:
+        def __init__(self, options):
+            assert options["extract_flat"] == "in_playlist"
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def extract_info(self, url, download):
+            return {
+                "entries": [
+                    {"_type": "playlist", "entries": [{"id": "video000001"}, None, {"id": "video000002"}]},
+                    {"_type": "playlist", "entries": [{"url": "https://www.youtube.com/shorts/short000001"}]},
+                    {"id": "video000003"},
+                ]
+            }
+
+    monkeypatch.setattr(SubtitleService, "ydl_factory", staticmethod(YoutubeDL))
+    video_urls, error = SubtitleService.expand_playlist("https://www.youtube.com/@channel")
+    assert error is None
+    assert video_urls == [
+        "https://www.youtube.com/watch?v=video000003",
+        "https://www.youtube.com/watch?v=video000001",
+        "https://www.youtube.com/watch?v=video000002",
+        "https://www.youtube.com/shorts/short000001",
+    ]
@@ -0,0 +1,63 @@
+import random
+
+from app.services.cue_track import CueTrack
+
+CUES = CueTrack.from_events(
+    [
+        (0, 1000, "one"),
+        (1000, 1000, "two"),
+        # Spans the next cues, which end before it does
+        (2000, 10000, "long"),
+        (3000, 500, "three"),
+        (5000, 0, "empty duration"),
+        (8000, 1000, "four"),
+    ]
+)
+
+
+def window(start_ms, end_ms, track=CUES):
+    return [track.text(index) for index in track.window(start_ms, end_ms)]
+
+
+def test_cues_touching_the_window_edges_are_left_out():
+    # "one" ends and "two" starts exactly at 1000
+    assert window(1000, 1000) == []
+    assert window(0, 1000) == ["one"]
+    assert window(1000, 2000) == ["two"]
+    assert window(999, 1001) == ["one", "two"]
+
+
+def test_long_cue_is_found_after_shorter_ones_end():
+    assert window(6000, 7000) == ["long"]
+    assert window(11999, 12000) == ["long"]
+    assert window(12000, 13000) == []
+
+
+def test_window_around_every_cue():
+    assert window(-500, 20000) == ["one", "two", "long", "three", "empty duration", "four"]
+    assert window(3200, 3300) == ["long", "three"]
+
+
+def test_zero_duration_cue_only_overlaps_windows_around_it():
+    assert window(4000, 6000) == ["long", "empty duration"]
+    assert window(4000, 5000) == ["long"]
+    assert window(5000, 6000) == ["long"]
+
+
+def test_empty_track():
+    assert window(0, 1000, CueTrack.from_events([])) == []
+
+
+def test_matches_a_linear_scan():
+    rng = random.Random(0)
+    events = [(rng.randrange(0, 100000), rng.randrange(0, 5000), f"cue {n}") for n in range(500)]
+    track = CueTrack.from_events(events)
+    for _ in range(200):
+        start = rng.randrange(-1000, 101000)
+        end = start + rng.randrange(0, 10000)
+        expected = [
+            index
+            for index in range(len(track))
+            if track.starts[index] < end and track.starts[index] + track.durations[index] > start
+        ]
+        assert list(track.window(start, end)) == expected
@@ -0,0 +1,88 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import dictionary
+from app.services.dictionary import DictionaryIndex, word_hash
+from app.services.translation_cache import TranslationCache
+from app.services.translation_service import TranslationService
+
+# Hashes sharing their low bits all start probing at slot 0 of a 16-slot table
+COLLIDING = {"cat": 0x10, "dog": 0x20, "bird": 0x30, "fish": 0x40}
+
+
+@pytest.fixture
+def colliding_hashes(monkeypatch):
+    monkeypatch.setattr(dictionary, "word_hash", lambda word: COLLIDING.get(word) or word_hash(word) | 1)
+
+
+def test_round_trip(tmp_path):
+    built = DictionaryIndex.build({"Cat": "кіт", "dog ": "пес", "": "x", "empty": " "}, str(tmp_path))
+    loaded = DictionaryIndex.load(str(tmp_path))
+
+    assert len(built) == len(loaded) == 2
+    assert loaded.lookup(["cat", "DOG", "  Cat ", "cow"]) == ["кіт", "пес", "кіт", None]
+    assert loaded.lookup([]) == []
+    assert loaded.info["words"] == 2
+
+
+def test_colliding_words_are_found_along_the_probe_run(tmp_path, colliding_hashes):
+    index = DictionaryIndex.build({"cat": "кіт", "dog": "пес", "bird": "птах"}, str(tmp_path))
+    assert len(index.keys) == 16
+    assert index.keys[:3].tolist() == [0x10, 0x20, 0x30]
+
+    assert index.lookup(["bird", "cat", "dog", "bird"]) == ["птах", "кіт", "пес", "птах"]
+
+
+def test_misses_stop_at_the_first_empty_slot(tmp_path, colliding_hashes):
+    index = DictionaryIndex.build({"cat": "кіт", "dog": "пес", "bird": "птах"}, str(tmp_path))
+    # "fish" probes the whole run of colliding words; "cow" starts elsewhere
+    assert index.lookup(["fish", "cow", "dog"]) == [None, None, "пес"]
+
+
+def test_probe_wraps_around_the_end_of_the_table(tmp_path, monkeypatch):
+    wrapping = {"cat": 0x1F, "dog": 0x2F, "bird": 0x3F}
+    monkeypatch.setattr(dictionary, "word_hash", lambda word: wrapping.get(word, 0x4F))
+    index = DictionaryIndex.build({"cat": "кіт", "dog": "пес", "bird": "птах"}, str(tmp_path))
+
+    assert index.keys[[15, 0, 1]].tolist() == [0x1F, 0x2F, 0x3F]
+    assert index.lookup(["bird", "dog", "fish"]) == ["птах", "пес", None]
+
+
+def test_load_rejects_other_arrays(tmp_path):
+    DictionaryIndex.build({"cat": "кіт"}, str(tmp_path))
+    dictionary.np.save(os.path.join(tmp_path, dictionary.KEYS_FILE), dictionary.np.zeros(10, dtype="uint64"))
+    with pytest.raises(ValueError):
+        DictionaryIndex.load(str(tmp_path))
+
+
+class Translator:
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text, src, dest):
+        self.calls.append(text)
+        return SimpleNamespace(text=text.upper())
+
+
+def test_translate_words_asks_the_translator_only_for_dictionary_misses(tmp_path, monkeypatch):
+    DictionaryIndex.build({"cat": "кіт", "dog": "пес"}, str(tmp_path / "en-uk"))
+    monkeypatch.setattr(dictionary, "DICTIONARIES_DIR", str(tmp_path))
+    dictionary._load.cache_clear()
+    translator = Translator()
+    service = TranslationService(translator=translator, cache=TranslationCache(max_size=0))
+
+    try:
+        result = service.translate_words(["Cat", "cow", "dog", "cow"], "en", "uk", rate_limit=0)
+    finally:
+        dictionary._load.cache_clear()
+
+    assert [(item["translated"], item["source"]) for item in result["translations"]] == [
+        ("кіт", "dictionary"),
+        ("COW", "translator"),
+        ("пес", "dictionary"),
+        ("COW", "translator"),
+    ]
+    assert result["dictionary_hits"] == 2
+    assert translator.calls == ["cow"]
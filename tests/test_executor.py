@@ -0,0 +1,151 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+import requests
+
+from app.routes import subtitle_routes
+from app.services import executor
+from app.services.executor import (
+    ClientDisconnectedError,
+    StageTimeoutError,
+    iterate_blocking,
+    run_blocking,
+)
+from app.services.subtitle_service import SubtitleService
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class Client:
+    """Stands in for a Request; disconnects once told to"""
+
+    def __init__(self):
+        self.gone = False
+
+    async def is_disconnected(self):
+        return self.gone
+
+
+@pytest.fixture(autouse=True)
+def fast_disconnect_polls(monkeypatch):
+    monkeypatch.setattr(executor, "DISCONNECT_POLL_INTERVAL", 0.01)
+
+
+def test_result_and_context_reach_the_caller():
+    async def main():
+        request_id.set("abc")
+        return await run_blocking(lambda a, b: (a + b, request_id.get()), 1, 2)
+
+    assert asyncio.run(main()) == (3, "abc")
+
+
+def test_errors_propagate():
+    def fail():
+        raise ValueError("bad video")
+
+    with pytest.raises(ValueError, match="bad video"):
+        asyncio.run(run_blocking(fail))
+
+
+def test_slow_stage_times_out():
+    release = threading.Event()
+
+    async def main():
+        started = time.perf_counter()
+        with pytest.raises(StageTimeoutError) as info:
+            await run_blocking(release.wait, 5, stage="subtitle extraction", timeout=0.1)
+        return time.perf_counter() - started, info.value
+
+    try:
+        elapsed, error = asyncio.run(main())
+    finally:
+        release.set()
+    assert elapsed < 1
+    assert (error.stage, error.timeout) == ("subtitle extraction", 0.1)
+    assert str(error) == "The subtitle extraction step took longer than 0.1 seconds. Please try again later."
+
+
+def test_disconnect_stops_waiting():
+    release = threading.Event()
+    client = Client()
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.1, setattr, client, "gone", True)
+        with pytest.raises(ClientDisconnectedError):
+            await run_blocking(release.wait, 5, timeout=5, request=client)
+
+    started = time.perf_counter()
+    try:
+        asyncio.run(main())
+    finally:
+        release.set()
+    assert time.perf_counter() - started < 1
+
+
+def test_iterate_blocking_yields_items_in_one_thread_with_the_context():
+    def produce():
+        for n in range(3):
+            yield n, request_id.get(), threading.get_ident()
+
+    async def main():
+        request_id.set("abc")
+        return [item async for item in iterate_blocking(produce)]
+
+    items = asyncio.run(main())
+    assert [(n, context) for n, context, _ in items] == [(0, "abc"), (1, "abc"), (2, "abc")]
+    assert len({thread for _, _, thread in items}) == 1
+
+
+def test_iterate_blocking_closes_the_generator_on_disconnect():
+    closed = threading.Event()
+    client = Client()
+
+    def produce():
+        try:
+            for n in range(1000):
+                yield n
+                time.sleep(0.01)
+        finally:
+            closed.set()
+
+    async def main():
+        received = []
+        with pytest.raises(ClientDisconnectedError):
+            async for item in iterate_blocking(produce, timeout=5, request=client):
+                received.append(item)
+                if item == 2:
+                    client.gone = True
+        return received
+
+    received = asyncio.run(main())
+    assert received[:3] == [0, 1, 2]
+    assert closed.wait(2)
+
+
+def test_iterate_blocking_times_out_the_whole_iteration():
+    def produce():
+        for n in range(1000):
+            yield n
+            time.sleep(0.02)
+
+    async def main():
+        with pytest.raises(StageTimeoutError):
+            async for _ in iterate_blocking(produce, stage="stream", timeout=0.1):
+                pass
+
+    asyncio.run(main())
+
+
+def test_timeouts_are_answered_with_504(base_url, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(subtitle_routes, "EXTRACT_TIMEOUT", 0.1)
+    monkeypatch.setattr(SubtitleService, "get_track", lambda video_url, language_code: release.wait(5))
+    try:
+        response = requests.get(f"{base_url}/subtitles/", params={"video_url": "dQw4w9WgXcQ"})
+    finally:
+        release.set()
+    assert response.status_code == 504
+    assert response.json() == {"error": "The subtitle extraction step took longer than 0.1 seconds. Please try again later."}
@@ -0,0 +1,167 @@
+import asyncio
+import gzip
+
+import pytest
+import requests
+
+from app import middleware
+from app.http_cache import make_etag
+from app.middleware import CompressionMiddleware, negotiate_encoding
+from app.services.cue_track import CueTrack
+from app.services.subtitle_service import SubtitleService
+from app.services.subtitle_store import StoredTrack
+
+VIDEO = "dQw4w9WgXcQ"
+TRACK = StoredTrack.create("Hello there.", CueTrack.from_events([(0, 1000, "Hello there.")]))
+# The same text, shown a second later
+RETIMED = StoredTrack.create("Hello there.", CueTrack.from_events([(1000, 1000, "Hello there.")]))
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    def serve(track):
+        monkeypatch.setattr(SubtitleService, "get_track", lambda video_url, language_code: (track, None))
+        monkeypatch.setattr(SubtitleService, "get_content_hash", lambda video_url, language_code: track.content_hash)
+
+    return serve
+
+
+def download(base_url, etag=None, format="srt"):
+    headers = {"If-None-Match": etag} if etag else {}
+    return requests.get(
+        f"{base_url}/download_subtitles/",
+        params={"video_url": VIDEO, "language_code": "en", "format": format},
+        headers=headers,
+    )
+
+
+def test_timed_etags_change_with_the_cue_timings():
+    assert make_etag(TRACK.content_hash, "json") == make_etag(RETIMED.content_hash, "json")
+    assert make_etag(TRACK.content_hash, "srt", TRACK.cues) != make_etag(RETIMED.content_hash, "srt", RETIMED.cues)
+
+
+def test_subtitles_answer_304_to_a_matching_etag(base_url, serve):
+    serve(TRACK)
+    url = f"{base_url}/subtitles/?video_url={VIDEO}&language_code=en"
+    response = requests.get(url)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith(("public", "no-cache"))
+
+    assert requests.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert requests.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    mismatch = requests.get(url, headers={"If-None-Match": 'W/"other-json"'})
+    assert mismatch.status_code == 200
+    assert mismatch.json()["subtitle_text"] == "Hello there."
+
+
+def test_downloads_are_revalidated_against_the_cue_timings(base_url, serve):
+    serve(TRACK)
+    response = download(base_url)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.text.startswith("1\n00:00:00,000 --> 00:00:01,000\n")
+    assert download(base_url, etag).status_code == 304
+
+    serve(RETIMED)
+    response = download(base_url, etag)
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    # Plain text has no timings, so it is still fresh
+    serve(TRACK)
+    text_etag = download(base_url, format="txt").headers["etag"]
+    serve(RETIMED)
+    assert download(base_url, text_etag, format="txt").status_code == 304
+
+
+def test_post_downloads_carry_no_etag(base_url, serve):
+    serve(TRACK)
+    response = requests.post(
+        f"{base_url}/download_subtitles/", data={"video_url": VIDEO, "language_code": "en", "format": "srt"}
+    )
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.headers["content-disposition"] == f'attachment; filename="{VIDEO}_en_subtitles.srt"'
+
+
+def test_negotiate_encoding(monkeypatch):
+    monkeypatch.setattr(middleware, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("identity") == ""
+    assert negotiate_encoding("") == ""
+    monkeypatch.setattr(middleware, "brotli", None)
+    assert negotiate_encoding("br") == ""
+    assert negotiate_encoding("br, gzip") == "gzip"
+
+
+def respond(body, content_type="application/json", chunks=1):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type.encode("latin-1"))]
+        if chunks == 1:
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        size = -(-len(body) // chunks)
+        for start in range(0, len(body), size):
+            more = start + size < len(body)
+            await send({"type": "http.response.body", "body": body[start : start + size], "more_body": more})
+
+    return app
+
+
+def call(app, accept_encoding):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    headers = [(b"accept-encoding", accept_encoding.encode("latin-1"))]
+    asyncio.run(app({"type": "http", "method": "GET", "path": "/", "headers": headers}, receive, send))
+    start = messages[0]
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return {name.decode("latin-1"): value.decode("latin-1") for name, value in start["headers"]}, body
+
+
+BODY = b'{"subtitle_text": "' + b"hello there " * 200 + b'"}'
+
+
+def test_large_responses_are_gzipped():
+    headers, body = call(CompressionMiddleware(respond(BODY), minimum_size=1024), "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(body)
+    assert gzip.decompress(body) == BODY
+
+
+def test_streamed_responses_are_gzipped_chunk_by_chunk():
+    headers, body = call(CompressionMiddleware(respond(BODY, "text/vtt", chunks=5), minimum_size=1024), "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(body) == BODY
+
+
+def test_brotli_when_accepted():
+    brotli = pytest.importorskip("brotli")
+    headers, body = call(CompressionMiddleware(respond(BODY), minimum_size=1024), "br, gzip")
+    assert headers["content-encoding"] == "br"
+    assert brotli.decompress(body) == BODY
+
+
+def test_small_and_binary_responses_pass_through():
+    small = b'{"ok": true}'
+    headers, body = call(CompressionMiddleware(respond(small), minimum_size=1024), "gzip")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert body == small
+
+    headers, body = call(CompressionMiddleware(respond(BODY, "application/zip"), minimum_size=1024), "gzip")
+    assert "content-encoding" not in headers and "vary" not in headers
+    assert body == BODY
+
+    headers, body = call(CompressionMiddleware(respond(BODY), minimum_size=1024), "identity")
+    assert "content-encoding" not in headers
+    assert body == BODY
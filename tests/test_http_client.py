@@ -0,0 +1,109 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.http_client import HttpClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            attempt = server.requests
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            if attempt <= len(server.failures):
+                status, retry_after = server.failures[attempt - 1]
+                self.send_response(status)
+                if retry_after is not None:
+                    self.send_header("Retry-After", retry_after)
+                body = b"busy"
+            else:
+                self.send_response(200)
+                body = b"ok"
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = server.active = server.max_active = 0
+    server.failures = []
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def client(**options) -> HttpClient:
+    settings = dict(max_retries=3, backoff_factor=0.0, backoff_jitter=0.0, max_retry_wait=0.2)
+    settings.update(options)
+    return HttpClient(**settings)
+
+
+def url(stub) -> str:
+    return f"http://127.0.0.1:{stub.server_port}/track"
+
+
+def test_503_and_429_are_retried_until_success(stub):
+    stub.failures = [(503, None), (429, None)]
+    http = client()
+    response = http.get(url(stub))
+
+    assert response.status_code == 200
+    assert response.content == b"ok"
+    assert stub.requests == 3
+    assert http.stats()["retries"] == 2
+
+
+def test_long_retry_after_is_capped(stub):
+    stub.failures = [(503, "3600"), (429, "3600")]
+    http = client(max_retry_wait=0.2)
+    started = time.monotonic()
+    response = http.get(url(stub))
+
+    assert response.status_code == 200
+    assert time.monotonic() - started < 2
+    assert stub.requests == 3
+
+
+def test_last_error_response_is_returned_when_retries_run_out(stub):
+    stub.failures = [(503, None)] * 10
+    http = client(max_retries=2)
+    response = http.get(url(stub))
+
+    assert response.status_code == 503
+    assert stub.requests == 3
+
+
+def test_concurrent_requests_per_host_are_capped(stub):
+    stub.delay = 0.1
+    http = client(per_host_limit=2)
+    threads = [threading.Thread(target=http.get, args=(url(stub),)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert stub.requests == 6
+    assert stub.max_active == 2
+    assert http.stats()["in_flight"] == {}
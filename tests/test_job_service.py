@@ -0,0 +1,114 @@
+import threading
+import time
+
+from app.services import job_service
+from app.services.cue_track import CueTrack
+from app.services.job_service import FAILED, RUNNING, SUCCEEDED, Job, JobManager
+from app.services.subtitle_store import StoredTrack
+
+
+def test_stop_returns_while_the_queue_is_full():
+    release = threading.Event()
+    manager = JobManager(workers=1, max_queue=2, handlers={"wait": lambda job: release.wait(5)})
+    manager.start()
+    jobs = [manager.submit("wait", {"n": 0})]
+    deadline = time.time() + 2
+    while jobs[0].status != RUNNING and time.time() < deadline:
+        time.sleep(0.01)
+    # One job is running and two fill the queue
+    jobs += [manager.submit("wait", {"n": n}) for n in (1, 2)]
+
+    started = time.perf_counter()
+    manager.stop()
+    assert time.perf_counter() - started < 0.5
+
+    # Queued jobs are not left waiting for workers that are gone
+    for job in jobs[1:]:
+        assert job.done.is_set()
+        assert job.status == FAILED and "stopped" in job.error
+
+    release.set()
+    assert jobs[0].done.wait(2)
+    assert jobs[0].status == SUCCEEDED
+    # A failed job can be submitted again
+    assert manager.submit("wait", {"n": 1}) is not jobs[1]
+
+
+def test_stop_start_stop_keeps_one_pool():
+    release = threading.Event()
+
+    def run(job):
+        if job.params.get("block"):
+            release.wait(5)
+        return threading.current_thread()
+
+    manager = JobManager(workers=1, handlers={"run": run})
+    manager.start()
+    busy = manager.submit("run", {"block": True})
+    deadline = time.time() + 2
+    while busy.status != RUNNING and time.time() < deadline:
+        time.sleep(0.01)
+    old_worker = manager._threads[0]
+
+    manager.stop()
+    manager.start()
+    job = manager.submit("run", {"n": 1})
+    assert job.done.wait(2)
+    # The old worker is still busy, so the job ran on the new pool
+    assert job.result is not old_worker
+
+    release.set()
+    assert busy.done.wait(2)
+    old_worker.join(2)
+    assert not old_worker.is_alive()
+    assert manager.stats()["workers"] == 1
+
+    manager.stop()
+    new_worker = job.result
+    new_worker.join(2)
+    assert not new_worker.is_alive()
+
+
+def test_restarted_manager_skips_leftover_wake_ups():
+    manager = JobManager(workers=2, handlers={"echo": lambda job: job.params["value"]})
+    manager.start()
+    manager.stop()
+    manager.start()
+    job = manager.submit("echo", {"value": 1})
+    assert job.done.wait(2)
+    assert (job.status, job.result) == (SUCCEEDED, 1)
+    manager.stop()
+
+
+def test_extract_job_reports_each_stage(monkeypatch):
+    seen = []
+    track = StoredTrack.create("hello", CueTrack.from_events([(0, 1000, "hello")]))
+
+    def iter_track(video_url, language_code, batch_size, with_info):
+        assert not with_info
+        seen.append(job.progress)
+        yield "info", {"title": "t", "languages": {}}
+        seen.append(job.progress)
+        yield "cues", [(0, 1000, "hello")]
+        seen.append(job.progress)
+        yield "track", track
+
+    monkeypatch.setattr(job_service.SubtitleService, "iter_track", iter_track)
+    job = Job(id="1", kind="extract", params={"video_url": "u", "language_code": "en"}, key="k")
+    result = job_service._run_extract(job)
+
+    assert seen == [0.0, job_service.METADATA_FETCHED, job_service.CAPTION_DOWNLOADING]
+    assert result["subtitle_text"] == "hello"
+
+
+def test_failed_job_keeps_the_progress_it_reached():
+    def handler(job):
+        job.progress = 0.3
+        raise RuntimeError("no subtitles")
+
+    manager = JobManager(workers=1, handlers={"fail": handler})
+    manager.start()
+    job = manager.submit("fail", {})
+    assert job.done.wait(2)
+    assert (job.status, job.error, job.progress) == (FAILED, "no subtitles", 0.3)
+    manager.stop()
@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+
+from app.services.json3_parser import iter_json3_events
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures", "clip_1min.json3")
+
+
+def chunked(data: bytes, size: int) -> list:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture(scope="module")
+def fixture_bytes() -> bytes:
+    with open(FIXTURE, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096, 1 << 20])
+def test_chunked_parse_matches_whole_document(fixture_bytes, size):
+    expected = json.loads(fixture_bytes)["events"]
+    assert list(iter_json3_events(chunked(fixture_bytes, size))) == expected
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5])
+def test_multibyte_characters_split_across_chunks(size):
+    events = [{"tStartMs": 0, "segs": [{"utf8": "Привіт, 世界 🎬"}]}]
+    data = json.dumps({"events": events}, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json3_events(chunked(data, size))) == events
+
+
+def test_numbers_cut_at_a_chunk_boundary_are_read_whole():
+    data = b'{"events": [{"tStartMs": 1234567, "dDurationMs": 89}, 42]}'
+    split = data.index(b"4567")
+    assert list(iter_json3_events([data[:split], data[split:]])) == [
+        {"tStartMs": 1234567, "dDurationMs": 89},
+        42,
+    ]
+
+
+def test_other_keys_are_skipped_before_and_after_events():
+    data = b'{"wireMagic": "pb3", "pens": [{}], "events": [{"id": 1}], "tail": {"a": [1, 2]}}'
+    assert list(iter_json3_events(chunked(data, 3))) == [{"id": 1}]
+
+
+@pytest.mark.parametrize("data", [b"{}", b'{"events": []}', b'{"pens": []}'])
+def test_documents_without_events(data):
+    assert list(iter_json3_events([data])) == []
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"[]", b'{"events": [{"id": 1} {"id": 2}]}', b'{"events": [] "pens": []}', b'{"events": [{"id": 1}'],
+)
+def test_malformed_documents_raise_value_error(data):
+    with pytest.raises(ValueError):
+        list(iter_json3_events(chunked(data, 4)))
@@ -0,0 +1,39 @@
+import json
+import os
+import subprocess
+import sys
+
+from app.services.lazy_import import LazyModule, lazy_import
+
+HEAVY_MODULES = ("yt_dlp", "googletrans", "rake_nltk", "numpy")
+
+# Prints which heavy modules are imported after importing the app, and after warming up
+SCRIPT = f"""
+import json, sys
+import app.main
+loaded = [[name in sys.modules for name in {HEAVY_MODULES!r}]]
+from app.services.warmup import warm_up
+warm_up()
+loaded.append([name in sys.modules for name in {HEAVY_MODULES!r}])
+print(json.dumps(loaded))
+"""
+
+
+def test_heavy_modules_wait_for_the_warm_up(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path}/warmup.db", WARMUP="off")
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=root, env=env, capture_output=True, text=True, timeout=120, check=True
+    ).stdout
+    after_import, after_warm_up = json.loads(output.splitlines()[-1])
+
+    assert dict(zip(HEAVY_MODULES, after_import)) == dict.fromkeys(HEAVY_MODULES, False)
+    assert dict(zip(HEAVY_MODULES, after_warm_up)) == dict.fromkeys(HEAVY_MODULES, True)
+
+
+def test_stand_ins_are_shared_and_import_on_first_use():
+    module = LazyModule("colorsys")
+    assert repr(module) == "<lazy module 'colorsys' (not loaded)>"
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert repr(module) == "<lazy module 'colorsys' (loaded)>"
+    assert lazy_import("yt_dlp") is lazy_import("yt_dlp")
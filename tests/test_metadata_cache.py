@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from app.services.metadata_cache import MetadataCache
+
+
+class PrivateVideo(Exception):
+    pass
+
+
+def test_values_are_cached():
+    cache = MetadataCache()
+    calls = []
+    assert cache.get_or_load("a", lambda: calls.append(1) or "value") == "value"
+    assert cache.get_or_load("a", lambda: calls.append(1) or "other") == "value"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_negative_entry_raises_a_fresh_error_on_every_hit():
+    cache = MetadataCache()
+
+    def loader():
+        raise PrivateVideo("private")
+
+    raised = []
+    for _ in range(3):
+        with pytest.raises(PrivateVideo) as info:
+            cache.get_or_load("a", loader, is_cacheable_error=lambda e: True)
+        raised.append(info.value)
+
+    assert len({id(error) for error in raised}) == 3
+    assert all(str(error) == "private" for error in raised)
+    # A raised copy carries only its own traceback, however often the entry is hit
+    assert all(_traceback_length(error) == _traceback_length(raised[1]) for error in raised[1:])
+
+
+def test_uncacheable_errors_are_not_remembered():
+    cache = MetadataCache()
+    with pytest.raises(PrivateVideo):
+        cache.get_or_load("a", lambda: (_ for _ in ()).throw(PrivateVideo()))
+    assert cache.get_or_load("a", lambda: "value") == "value"
+
+
+def test_concurrent_lookups_share_one_load_and_get_their_own_errors():
+    cache = MetadataCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise PrivateVideo("private")
+
+    errors = []
+
+    def lookup():
+        try:
+            cache.get_or_load("a", loader)
+        except PrivateVideo as e:
+            errors.append(e)
+
+    owner = threading.Thread(target=lookup)
+    owner.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lookup) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    # Let the waiters block on the in-flight load before it fails
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    coalesced = cache.stats()["coalesced"]
+    release.set()
+    assert coalesced == 3
+    for thread in [owner, *waiters]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(errors) == 4
+    assert len({id(error) for error in errors}) == 4
+
+
+def _traceback_length(error: BaseException) -> int:
+    length = 0
+    traceback = error.__traceback__
+    while traceback is not None:
+        length += 1
+        traceback = traceback.tb_next
+    return length
@@ -0,0 +1,86 @@
+import re
+import time
+
+import requests
+
+from app.services.cue_track import CueTrack
+from app.services.metrics import MetricsRegistry, server_timing_header, stage
+from app.services.subtitle_service import SubtitleService
+from app.services.subtitle_store import StoredTrack
+
+VIDEO = "dQw4w9WgXcQ"
+TRACK = StoredTrack.create("Hello there.", CueTrack.from_events([(0, 1000, "Hello there.")]))
+
+
+def test_counters_gauges_and_labels_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("path",))
+    gauge = registry.gauge("in_flight", "Running")
+    counter.inc('/a"b\\')
+    counter.inc('/a"b\\', amount=2)
+    gauge.inc()
+    gauge.dec(amount=0.5)
+
+    assert registry.render() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/a\\"b\\\\"} 3\n'
+        "# HELP in_flight Running\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 0.5\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "fetch")
+
+    assert histogram.render() == [
+        'latency_seconds_bucket{stage="fetch",le="0.1"} 2',
+        'latency_seconds_bucket{stage="fetch",le="1.0"} 3',
+        'latency_seconds_bucket{stage="fetch",le="+Inf"} 4',
+        'latency_seconds_sum{stage="fetch"} 3.65',
+        'latency_seconds_count{stage="fetch"} 4',
+    ]
+
+
+def test_collectors_run_at_every_scrape():
+    registry = MetricsRegistry()
+    values = iter((1, 2))
+    registry.register_collector(lambda: [("queue_depth", "gauge", "Queued jobs", next(values))])
+    assert registry.render().endswith("queue_depth 1\n")
+    assert registry.render().endswith("queue_depth 2\n")
+
+
+def test_server_timing_header():
+    header = server_timing_header({"store_read": [0.0021, 1], "caption_fetch": [0.5, 3]}, 0.6)
+    assert header == 'store_read;dur=2.1, caption_fetch;dur=500.0;desc="3 calls", total;dur=600.0'
+
+
+def test_request_stages_show_up_in_server_timing_and_metrics(base_url, monkeypatch):
+    def get_track(video_url, language_code):
+        with stage("test_stage"):
+            time.sleep(0.01)
+        return TRACK, None
+
+    monkeypatch.setattr(SubtitleService, "get_track", get_track)
+    response = requests.get(f"{base_url}/subtitles/", params={"video_url": VIDEO})
+    assert response.status_code == 200
+
+    timing = dict(entry.split(";dur=") for entry in response.headers["server-timing"].split(", "))
+    assert float(timing["test_stage"]) >= 10
+    assert float(timing["total"]) >= float(timing["test_stage"])
+
+    metrics = requests.get(f"{base_url}/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain")
+    text = metrics.text
+    assert 'subtitles_stage_duration_seconds_count{stage="test_stage"} 1' in text
+    assert 'subtitles_stage_in_flight{stage="test_stage"} 0' in text
+    assert re.search(
+        r'subtitles_http_request_duration_seconds_count\{method="GET",route="/subtitles/",status="200"\} [1-9]', text
+    )
+    # Components registered through register_stats()
+    assert "# TYPE subtitles_metadata_cache_hit_ratio gauge" in text
+    assert "# TYPE subtitles_extraction_gate_admitted_total counter" in text
@@ -0,0 +1,45 @@
+import pytest
+
+from app.services.normalization import NormalizationPipeline
+
+
+def normalize(names, segments, kind=None):
+    return list(NormalizationPipeline.from_names(names).normalize(segments, kind))
+
+
+def test_credits_and_sound_tags():
+    segments = ["[Music] Hello ♪", "Transcriber: someone\nWelcome back", "[Applause]"]
+    assert normalize(["credits", "sound_tags", "whitespace"], segments) == ["Hello", "Welcome back"]
+
+
+def test_roll_up_lines_are_dropped():
+    segments = ["first line", "first line\nsecond line", "second line\nthird line"]
+    assert normalize(["rolling_dedupe"], segments, "auto") == ["first line", "second line", "third line"]
+
+
+def test_lines_grown_word_by_word_are_trimmed():
+    segments = ["Hello there", "Hello there world"]
+    assert normalize(["rolling_dedupe"], segments, "auto") == ["Hello there", "world"]
+
+
+def test_repeated_answer_is_kept():
+    assert normalize(["rolling_dedupe"], ["No.", "No."], "auto") == ["No.", "No."]
+
+
+def test_one_word_is_not_a_grown_line():
+    assert normalize(["rolling_dedupe"], ["I", "I think so"], "auto") == ["I", "I think so"]
+
+
+def test_manual_tracks_are_not_deduplicated():
+    segments = ["first line", "first line\nsecond line"]
+    assert normalize(["rolling_dedupe"], segments, "manual") == segments
+
+
+def test_signature_names_stages_and_versions():
+    pipeline = NormalizationPipeline.from_names(["credits", "rolling_dedupe", "whitespace"])
+    assert pipeline.signature == "credits.1,rolling_dedupe.2,whitespace.1"
+
+
+def test_unknown_stage():
+    with pytest.raises(ValueError):
+        NormalizationPipeline.from_names(["credits", "typos"])
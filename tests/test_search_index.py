@@ -0,0 +1,103 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app.services.cue_track import CueTrack
+from app.services.search_index import SearchIndex, build_passages, to_match_query
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SearchIndex(f"sqlite:///{os.path.join(tmp_path, 'search.db')}", passage_ms=10000)
+
+
+def track(*texts, step_ms=4000):
+    return CueTrack.from_events([(n * step_ms, step_ms, body) for n, body in enumerate(texts)])
+
+
+def search(index, words, **kwargs):
+    return index.search(to_match_query(words), **kwargs)
+
+
+def passage_count(index):
+    with index._session() as session:
+        return session.execute(text("SELECT COUNT(*) FROM search_passages")).scalar()
+
+
+def test_to_match_query_treats_operators_as_text():
+    assert to_match_query('cats AND "big dogs" NEAR(x) -y* "') == '"cats" "AND" "big dogs" "NEAR(x)" "-y*"'
+    assert to_match_query('say "hi') == '"say" "hi"'
+    assert to_match_query('  "" ') is None
+
+
+def test_operators_in_queries_do_not_break_the_search(index):
+    index.index_track("aaaaaaaaaaa", "en", track("cats OR dogs", "NEAR the end"), "h1")
+    # Operators are searched for as the words they are
+    assert [r["video_id"] for r in search(index, "OR NEAR(")] == ["aaaaaaaaaaa"]
+    assert [r["video_id"] for r in search(index, "cats NOT dogs")] == []
+    assert [r["video_id"] for r in search(index, "cats* -dogs")] == ["aaaaaaaaaaa"]
+
+
+def test_build_passages_groups_cues_by_time():
+    passages = build_passages(track("a", "b", "c", "d"), passage_ms=10000)
+    assert passages == [(0, 12000, "a b c"), (12000, 16000, "d")]
+
+
+def test_hits_carry_timestamps_and_links(index):
+    index.index_track("aaaaaaaaaaa", "en", track("hello there", "filler", "filler", "general kenobi"), "h1", "Title")
+
+    [result] = search(index, "kenobi")
+    assert (result["video_id"], result["title"], result["matches"]) == ("aaaaaaaaaaa", "Title", 1)
+    [hit] = result["hits"]
+    assert (hit["start_ms"], hit["end_ms"]) == (12000, 16000)
+    assert hit["url"] == "https://www.youtube.com/watch?v=aaaaaaaaaaa&t=12s"
+    assert "<mark>kenobi</mark>" in hit["snippet"]
+
+
+def test_snippets_escape_caption_text(index):
+    index.index_track("aaaaaaaaaaa", "en", track("<script> & kenobi </script>"), "h1")
+    [hit] = search(index, "kenobi")[0]["hits"]
+    assert hit["snippet"] == "&lt;script&gt; &amp; <mark>kenobi</mark> &lt;/script&gt;"
+
+
+def test_unchanged_transcripts_are_skipped(index):
+    cues = track("hello there")
+    assert index.index_track("aaaaaaaaaaa", "en", cues, "h1")
+    assert not index.index_track("aaaaaaaaaaa", "en", cues, "h1")
+    # A title learnt later is still stored
+    assert not index.index_track("aaaaaaaaaaa", "en", cues, "h1", "Title")
+    assert search(index, "hello")[0]["title"] == "Title"
+
+
+def test_changed_transcripts_replace_only_their_passages(index):
+    index.index_track("aaaaaaaaaaa", "en", track("old words", "x", "x", "more old words"), "h1")
+    index.index_track("bbbbbbbbbbb", "en", track("old words"), "h1")
+    assert passage_count(index) == 3
+
+    assert index.index_track("aaaaaaaaaaa", "en", track("new words"), "h2")
+    assert passage_count(index) == 2
+    assert [r["video_id"] for r in search(index, "old")] == ["bbbbbbbbbbb"]
+    assert [r["video_id"] for r in search(index, "new")] == ["aaaaaaaaaaa"]
+
+
+def test_language_filter(index):
+    index.index_track("aaaaaaaaaaa", "en", track("banana"), "h1")
+    index.index_track("aaaaaaaaaaa", "de", track("banana"), "h2")
+
+    assert sorted(r["language_code"] for r in search(index, "banana")) == ["de", "en"]
+    assert [r["language_code"] for r in search(index, "banana", language_code="de")] == ["de"]
+    assert search(index, "banana", language_code="fr") == []
+
+
+def test_paging(index):
+    for n in range(5):
+        # More mentions rank higher
+        index.index_track(f"video{n:06d}", "en", track(" ".join(["apple"] * (n + 1) + ["pie"] * 10)), f"h{n}")
+
+    first = search(index, "apple", limit=2)
+    second = search(index, "apple", limit=2, offset=2)
+    last = search(index, "apple", limit=2, offset=4)
+    ids = [r["video_id"] for r in first + second + last]
+    assert ids == [f"video{n:06d}" for n in reversed(range(5))]
+    assert search(index, "apple", limit=2, offset=6) == []
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+
+import requests
+
+from app.routes import stream_routes
+from app.services.admission import UpstreamBusyError
+from app.services.cue_track import CueTrack
+from app.services.subtitle_service import SubtitleService
+from app.services.subtitle_store import StoredTrack
+
+VIDEO = "dQw4w9WgXcQ"
+CUES = [(0, 1000, "Hello there."), (1000, 1000, "General Kenobi.")]
+TRACK = StoredTrack.create("Hello there. General Kenobi.", CueTrack.from_events(CUES))
+
+
+def stream(base_url, **params):
+    return requests.get(
+        f"{base_url}/stream_subtitles/", params={"video_url": VIDEO, "language_code": "en", **params}, stream=True
+    )
+
+
+def read_events(response):
+    """Parse a whole Server-Sent Events body into (name, data) pairs"""
+    events = []
+    for block in response.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_events_arrive_in_order(base_url, monkeypatch):
+    def iter_track(video_url, language_code, batch_size):
+        yield "info", {"title": "A video", "languages": {"en": "English"}}
+        yield "cues", CUES[:1]
+        yield "cues", CUES[1:]
+        yield "track", TRACK
+
+    monkeypatch.setattr(SubtitleService, "iter_track", iter_track)
+    response = stream(base_url)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = read_events(response)
+
+    assert [name for name, _ in events] == ["title", "languages", "cues", "cues", "done"]
+    assert events[0][1] == {"title": "A video"}
+    assert events[3][1] == {"first": 1, "cues": [{"start_ms": 1000, "duration_ms": 1000, "text": "General Kenobi."}]}
+    done = events[-1][1]
+    assert (done["video_id"], done["cues"], done["content_hash"]) == (VIDEO, 2, TRACK.content_hash)
+
+
+def test_translations_follow_their_cues(base_url, monkeypatch):
+    class Service:
+        def translate_transcript(self, text, source_language, target_language):
+            return {"translated": f"[{source_language}>{target_language}] {text}"}
+
+    def iter_track(video_url, language_code, batch_size):
+        yield "cues", CUES
+        yield "track", TRACK
+
+    monkeypatch.setattr(SubtitleService, "iter_track", iter_track)
+    monkeypatch.setattr(stream_routes, "get_shared_translation_service", Service)
+    events = read_events(stream(base_url, translate_to="uk"))
+
+    assert [name for name, _ in events] == ["cues", "translation", "done"]
+    assert events[1][1] == {"first": 0, "count": 2, "text": "[en>uk] Hello there. General Kenobi."}
+
+
+def test_errors_end_the_stream_with_a_failed_event(base_url, monkeypatch):
+    def iter_track(video_url, language_code, batch_size):
+        yield "info", {"title": "A video", "languages": {}}
+        yield "error", "No subtitles in en are available for this video."
+
+    monkeypatch.setattr(SubtitleService, "iter_track", iter_track)
+    events = read_events(stream(base_url))
+    assert events[-1] == ("failed", {"error": "No subtitles in en are available for this video."})
+    assert "done" not in [name for name, _ in events]
+
+
+def test_busy_upstream_is_reported_with_retry_after(base_url, monkeypatch):
+    def iter_track(video_url, language_code, batch_size):
+        raise UpstreamBusyError(7)
+        yield
+
+    monkeypatch.setattr(SubtitleService, "iter_track", iter_track)
+    [(name, data)] = read_events(stream(base_url))
+    assert name == "failed" and data["retry_after"] == 7
+
+
+def test_producer_stops_when_the_client_disconnects(base_url, monkeypatch):
+    closed = threading.Event()
+    produced = []
+
+    def iter_track(video_url, language_code, batch_size):
+        try:
+            for n in range(1000):
+                produced.append(n)
+                yield "cues", [(n * 1000, 1000, f"cue {n}")]
+                time.sleep(0.05)
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(SubtitleService, "iter_track", iter_track)
+    response = stream(base_url)
+    first = next(response.iter_lines())
+    assert first == b"event: cues"
+    response.close()
+
+    assert closed.wait(5)
+    count = len(produced)
+    time.sleep(0.2)
+    assert len(produced) == count < 1000
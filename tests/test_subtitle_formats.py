@@ -0,0 +1,82 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+from app.services import subtitle_formats
+from app.services.cue_track import CueTrack
+from app.services.subtitle_formats import write_json, write_srt, write_txt, write_vtt, write_zip
+
+CUES = CueTrack.from_events(
+    [
+        (0, 999, "Hello & <welcome>"),
+        (59_999, 1, "A minute"),
+        # 1 h 2 min 3.004 s, ending at 1 h 2 min 4.5 s
+        (3_723_004, 1_496, "An hour later"),
+        (360_000_000, 1000, "A hundred hours in"),
+    ]
+)
+
+
+def render(writer, cues=CUES):
+    return "".join(writer(cues, "dQw4w9WgXcQ", "en"))
+
+
+def test_srt():
+    assert render(write_srt) == (
+        "1\n00:00:00,000 --> 00:00:00,999\nHello & <welcome>\n\n"
+        "2\n00:00:59,999 --> 00:01:00,000\nA minute\n\n"
+        "3\n01:02:03,004 --> 01:02:04,500\nAn hour later\n\n"
+        "4\n100:00:00,000 --> 100:00:01,000\nA hundred hours in\n\n"
+    )
+
+
+def test_vtt():
+    assert render(write_vtt) == (
+        "WEBVTT\nKind: captions\nLanguage: en\n\n"
+        "00:00:00.000 --> 00:00:00.999\nHello &amp; &lt;welcome>\n\n"
+        "00:00:59.999 --> 00:01:00.000\nA minute\n\n"
+        "01:02:03.004 --> 01:02:04.500\nAn hour later\n\n"
+        "100:00:00.000 --> 100:00:01.000\nA hundred hours in\n\n"
+    )
+
+
+def test_txt():
+    assert render(write_txt) == "Hello & <welcome> A minute An hour later A hundred hours in"
+
+
+@pytest.mark.parametrize("per_chunk", [1, 2, 3, 4, 512])
+def test_json_is_valid_across_chunk_boundaries(monkeypatch, per_chunk):
+    monkeypatch.setattr(subtitle_formats, "CUES_PER_CHUNK", per_chunk)
+    chunks = list(write_json(CUES, "dQw4w9WgXcQ", "en"))
+    assert len(chunks) == 2 + -(-len(CUES) // per_chunk)
+
+    document = json.loads("".join(chunks))
+    assert document["video_id"] == "dQw4w9WgXcQ" and document["language_code"] == "en"
+    assert document["cues"][2] == {"start_ms": 3_723_004, "duration_ms": 1_496, "text": "An hour later"}
+    assert [cue["text"] for cue in document["cues"]] == [CUES.text(i) for i in range(len(CUES))]
+    # The SRT numbering also carries on across chunks
+    assert render(write_srt).count("\n\n") == len(CUES)
+
+
+def test_empty_track():
+    empty = CueTrack.from_events([])
+    assert json.loads(render(write_json, empty))["cues"] == []
+    assert render(write_srt, empty) == ""
+    assert render(write_vtt, empty) == "WEBVTT\nKind: captions\nLanguage: en\n\n"
+
+
+def test_zip_members_and_errors():
+    data = b"".join(write_zip({"en": CUES, "de": CUES}, "dQw4w9WgXcQ", "vtt", errors={"fr": "No subtitles"}))
+    archive = zipfile.ZipFile(io.BytesIO(data))
+
+    assert archive.namelist() == ["dQw4w9WgXcQ_en.vtt", "dQw4w9WgXcQ_de.vtt", "errors.json"]
+    assert archive.read("dQw4w9WgXcQ_de.vtt").decode("utf-8") == render(write_vtt).replace("Language: en", "Language: de")
+    assert json.loads(archive.read("errors.json")) == {"fr": "No subtitles"}
+    assert archive.testzip() is None
+
+
+def test_zip_name_prefix_and_no_errors_file():
+    data = b"".join(write_zip({"en": CUES}, "not a video", "srt", name="subtitles"))
+    assert zipfile.ZipFile(io.BytesIO(data)).namelist() == ["subtitles_en.srt"]
@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from app.services import subtitle_service
+from app.services.admission import ExtractionGate
+from app.services.subtitle_service import SubtitleService
+from app.services.subtitle_store import SubtitleStore, _DisabledStore
+
+JSON3 = {"ext": "json3", "url": "https://www.youtube.com/api/timedtext?v=abc&fmt=json3"}
+
+
+def auto(code, translated=False):
+    url = JSON3["url"] + (f"&tlang={code}" if translated else "")
+    return {"ext": "json3", "url": url}
+
+
+def test_original_language_is_listed_once_under_its_base_code():
+    info = {
+        "automatic_captions": {
+            "en-orig": [auto("en-orig")],
+            "en": [auto("en")],
+            "de": [auto("de", translated=True)],
+        }
+    }
+    languages = SubtitleService._language_names(SubtitleService._list_tracks(info))
+    assert languages == {"en": "English (auto-generated)"}
+
+
+def test_original_language_only_listed_as_orig():
+    info = {"automatic_captions": {"fr-orig": [auto("fr-orig")], "en": [auto("en", translated=True)]}}
+    languages = SubtitleService._language_names(SubtitleService._list_tracks(info))
+    assert languages == {"fr": "French (auto-generated)"}
+    assert SubtitleService._select_track(info, "fr") == ("auto", [auto("fr-orig")])
+
+
+def test_manual_track_wins_over_automatic_captions():
+    info = {"subtitles": {"en": [JSON3]}, "automatic_captions": {"en-orig": [auto("en-orig")]}}
+    languages = SubtitleService._language_names(SubtitleService._list_tracks(info))
+    assert languages == {"en": "English"}
+    assert SubtitleService._select_track(info, "en") == ("manual", [JSON3])
+
+
+def test_get_video_id():
+    assert SubtitleService.get_video_id("https://youtu.be/dQw4w9WgXcQ?t=1") == "dQw4w9WgXcQ"
+    assert SubtitleService.get_video_id(" dQw4w9WgXcQ ") == "dQw4w9WgXcQ"
+    assert SubtitleService.get_video_id("not a video") == "not a video"
+
+
+BODY = json.dumps(
+    {"events": [{"tStartMs": i * 1000, "dDurationMs": 1000, "segs": [{"utf8": f"cue {i}"}]} for i in range(5)]}
+).encode("utf-8")
+
+
+def serve_track(monkeypatch, on_read=lambda: None):
+    class Response:
+        status_code = 200
+
+        def iter_content(self, chunk_size):
+            for start in range(0, len(BODY), 16):
+                on_read()
+                yield BODY[start : start + 16]
+
+    @contextmanager
+    def stream(url):
+        on_read()
+        yield Response()
+
+    info = {"title": "t", "automatic_captions": {"en": [auto("en")]}}
+    monkeypatch.setattr(SubtitleService, "_get_video_info", staticmethod(lambda video_url: info))
+    monkeypatch.setattr(subtitle_service, "subtitle_store", _DisabledStore())
+    monkeypatch.setattr(subtitle_service.http_client, "stream", stream)
+    monkeypatch.setattr(subtitle_service.search_index, "index_track", lambda *args, **kwargs: None)
+
+
+def test_extraction_slot_is_not_held_while_cues_are_handed_on(monkeypatch):
+    gate = subtitle_service.extraction_gate
+    active_during_reads = []
+    serve_track(monkeypatch, lambda: active_during_reads.append(gate.active))
+
+    items = SubtitleService.iter_track("dQw4w9WgXcQ", "en", batch_size=1, with_info=False)
+    cues = []
+    for event, data in items:
+        if event == "cues":
+            # The caller holds on to each batch without blocking other downloads
+            assert gate.active == 0
+            cues.extend(data)
+        elif event == "track":
+            break
+
+    assert [text for _, _, text in cues] == [f"cue {i}" for i in range(5)]
+    assert active_during_reads and all(active == 1 for active in active_during_reads)
+
+
+def test_download_survives_a_saturated_gate(monkeypatch):
+    gate = ExtractionGate(max_concurrency=1, queue_size=0, queue_timeout=0.1)
+    monkeypatch.setattr(subtitle_service, "extraction_gate", gate)
+    serve_track(monkeypatch)
+    released = threading.Event()
+
+    def hog():
+        # Takes the slot while the download is paused, for longer than the queue timeout
+        with gate.slot():
+            released.wait(2)
+            time.sleep(0.3)
+
+    items = SubtitleService.iter_track("dQw4w9WgXcQ", "en", batch_size=2, with_info=False)
+    cues = []
+    thread = None
+    for event, data in items:
+        if event == "error":
+            raise AssertionError(data)
+        if event == "cues":
+            cues.extend(data)
+            if thread is None:
+                thread = threading.Thread(target=hog)
+                thread.start()
+                while not gate.active:
+                    time.sleep(0.01)
+                released.set()
+        elif event == "track":
+            break
+    thread.join(2)
+
+    assert [text for _, _, text in cues] == [f"cue {i}" for i in range(5)]
+    stats = gate.stats()
+    assert (stats["admitted"], stats["rejected"], stats["timed_out"]) == (2, 0, 0)
+
+
+def test_tracks_are_indexed_with_their_title_when_stored(monkeypatch, tmp_path):
+    serve_track(monkeypatch)
+    store = SubtitleStore(f"sqlite:///{tmp_path}/store.db")
+    monkeypatch.setattr(subtitle_service, "subtitle_store", store)
+    indexed = []
+    monkeypatch.setattr(
+        subtitle_service.search_index,
+        "index_track",
+        lambda video_id, language_code, cues, content_hash, title=None: indexed.append((video_id, title)),
+    )
+
+    first, error = SubtitleService.extract_subtitles("dQw4w9WgXcQ", "en")
+    assert error is None
+    second, error = SubtitleService.extract_subtitles("dQw4w9WgXcQ", "en")
+    assert error is None and second == first
+
+    # The second request is served from the store without touching the index
+    assert indexed == [("dQw4w9WgXcQ", "t")]
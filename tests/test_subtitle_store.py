@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import time
+import zlib
+
+import pytest
+
+from app.services.cue_track import CueTrack
+from app.services.subtitle_store import SubtitleStore
+
+CUES = CueTrack.from_events([(0, 1000, "Hello there."), (1000, 1500, "General Kenobi.")])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SubtitleStore(f"sqlite:///{os.path.join(tmp_path, 'store.db')}")
+
+
+def test_missing_track_is_a_miss(store):
+    assert store.get("abc", "en") is None
+    assert store.get_content_hash("abc", "en") is None
+
+
+def test_round_trip(store):
+    written = store.put("abc", "en", "manual", "Hello there. General Kenobi.", CUES)
+    track = store.get("abc", "en", "manual")
+
+    assert track.text == "Hello there. General Kenobi."
+    assert track.cues.to_events() == CUES.to_events()
+    assert track.content_hash == written.content_hash
+    assert store.get("abc", "en", "auto") is None
+    assert store.get("abc", "de", "manual") is None
+
+
+def test_put_replaces_the_track(store):
+    store.put("abc", "en", "manual", "old", CUES)
+    new = store.put("abc", "en", "manual", "new", CUES)
+    assert store.get("abc", "en", "manual").text == "new"
+    assert store.get_content_hash("abc", "en") == new.content_hash
+
+
+def test_content_hash_prefers_manual_tracks(store):
+    auto = store.put("abc", "en", "auto", "auto text", CUES)
+    assert store.get_content_hash("abc", "en") == auto.content_hash
+    manual = store.put("abc", "en", "manual", "manual text", CUES)
+    assert store.get_content_hash("abc", "en") == manual.content_hash
+    assert store.get_content_hash("abc", "en", kinds=("auto",)) == auto.content_hash
+
+
+def test_tracks_older_than_max_age_are_misses(store, monkeypatch):
+    store.put("abc", "en", "manual", "text", CUES)
+    store.max_age = 60
+    assert store.get("abc", "en") is not None
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert store.get("abc", "en") is None
+    assert store.get_content_hash("abc", "en") is None
+
+
+def test_tracks_cleaned_by_another_pipeline_are_misses(tmp_path):
+    url = f"sqlite:///{os.path.join(tmp_path, 'store.db')}"
+    SubtitleStore(url, normalization="credits.1").put("abc", "en", "manual", "text", CUES)
+
+    changed = SubtitleStore(url, normalization="credits.1,whitespace.1")
+    assert changed.get("abc", "en") is None
+    assert changed.get_content_hash("abc", "en") is None
+    changed.put("abc", "en", "manual", "text", CUES)
+    assert changed.get("abc", "en").text == "text"
+
+
+def test_table_without_normalization_column_is_upgraded(tmp_path):
+    path = os.path.join(tmp_path, "store.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE subtitle_tracks (video_id VARCHAR(64), language_code VARCHAR(32), kind VARCHAR(16), "
+            "text BLOB, events BLOB, content_hash VARCHAR(64), fetched_at FLOAT, "
+            "PRIMARY KEY (video_id, language_code, kind))"
+        )
+        connection.execute(
+            "INSERT INTO subtitle_tracks VALUES ('abc', 'en', 'manual', ?, ?, 'hash', ?)",
+            (zlib.compress(b"old"), zlib.compress(CUES.to_bytes()), time.time()),
+        )
+
+    store = SubtitleStore(f"sqlite:///{path}", normalization="whitespace.1")
+    # Tracks stored before the column existed were cleaned by an unknown pipeline
+    assert store.get("abc", "en") is None
+    store.put("abc", "en", "manual", "new", CUES)
+    assert store.get("abc", "en").text == "new"
+
+
+def test_database_errors_are_misses(tmp_path):
+    # A directory cannot be opened as a database
+    broken = SubtitleStore(f"sqlite:///{tmp_path}")
+    assert broken.get("abc", "en") is None
+    assert broken.put("abc", "en", "manual", "text", CUES) is None
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from app.services.translation_cache import TranslationCache, normalize_text
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{os.path.join(tmp_path, 'cache.db')}"
+
+
+def test_normalize_text():
+    assert normalize_text("  Café\n\tau  lait ") == "Café au lait"
+
+
+def test_lookups_ignore_whitespace_and_unicode_form():
+    cache = TranslationCache()
+    cache.put("en", "uk", "Good  morning\n", "Доброго ранку")
+
+    assert cache.get("en", "uk", " Good morning") == "Доброго ранку"
+    assert cache.get("en", "de", "Good morning") is None
+    assert cache.get("uk", "en", "Good morning") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "persistent_hits": 0, "misses": 2}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TranslationCache(max_size=2)
+    cache.put("en", "uk", "a", "A")
+    cache.put("en", "uk", "b", "B")
+    cache.get("en", "uk", "a")
+    cache.put("en", "uk", "c", "C")
+
+    assert cache.get("en", "uk", "b") is None
+    assert cache.get("en", "uk", "a") == "A"
+    assert cache.get("en", "uk", "c") == "C"
+
+
+def test_zero_size_keeps_nothing_in_memory():
+    cache = TranslationCache(max_size=0)
+    cache.put("en", "uk", "a", "A")
+    assert cache.get("en", "uk", "a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_persistent_tier_survives_a_new_cache(database_url):
+    TranslationCache(database_url=database_url).put("en", "uk", "cat", "кіт")
+
+    cache = TranslationCache(database_url=database_url)
+    assert cache.get("en", "uk", "cat") == "кіт"
+    assert cache.get("en", "uk", "cat") == "кіт"
+    # The first hit is read from the database and kept in memory for the second
+    stats = cache.stats()
+    assert (stats["persistent_hits"], stats["hits"]) == (1, 1)
+
+
+def test_put_replaces_a_persistent_entry(database_url):
+    TranslationCache(database_url=database_url).put("en", "uk", "cat", "кіт")
+    TranslationCache(database_url=database_url).put("en", "uk", "cat", "кицька")
+    assert TranslationCache(database_url=database_url).get("en", "uk", "cat") == "кицька"
+
+
+def test_database_errors_are_misses(tmp_path):
+    # A directory cannot be opened as a SQLite database
+    cache = TranslationCache(database_url=f"sqlite:///{tmp_path}")
+    cache.put("en", "uk", "cat", "кіт")
+    assert cache.get("en", "uk", "cat") == "кіт"
+    assert TranslationCache(database_url=f"sqlite:///{tmp_path}").get("en", "uk", "cat") is None
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+from fastapi import HTTPException
+
+from app import main
+from app.services import translation_service
+from app.services.translation_cache import TranslationCache
+from app.services.translation_service import TranslationService
+
+
+class MergingTranslator:
+    """Upper-cases text, and like googletrans joins more than max_lines lines with spaces"""
+
+    def __init__(self, max_lines: int):
+        self.max_lines = max_lines
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def translate(self, text, src, dest):
+        with self._lock:
+            self.calls.append(text)
+        lines = text.upper().split("\n")
+        separator = "\n" if len(lines) <= self.max_lines else " "
+        return SimpleNamespace(text=separator.join(lines))
+
+
+def make_service(translator) -> TranslationService:
+    return TranslationService(translator=translator, cache=TranslationCache(max_size=1000))
+
+
+def test_transcript_with_merged_lines_is_translated_in_halves():
+    translator = MergingTranslator(max_lines=2)
+    service = make_service(translator)
+    sentences = [f"Sentence number {n}." for n in range(8)]
+
+    result = service.translate_transcript(" ".join(sentences), "en", "uk", parallelism=4, rate_limit=0)
+
+    assert result["translated"] == " ".join(sentence.upper() for sentence in sentences)
+    # 8 lines are merged, then 4 twice; the four pairs line up
+    assert len(translator.calls) == 1 + 2 + 4
+    assert result["chunks"] == len(translator.calls)
+    assert all(service.cache.get("en", "uk", sentence) == sentence.upper() for sentence in sentences)
+
+
+def test_chunks_are_halved_down_to_single_words():
+    translator = MergingTranslator(max_lines=0)
+    service = make_service(translator)
+
+    result = service.translate_words(["one", "two", "three"], "en", "uk", rate_limit=0)
+
+    assert [item["translated"] for item in result["translations"]] == ["ONE", "TWO", "THREE"]
+    assert len(translator.calls) == 1 + 2 + 2
+
+
+def test_lines_that_line_up_take_one_call():
+    translator = MergingTranslator(max_lines=100)
+    service = make_service(translator)
+
+    result = service.translate_words(["cat", "dog", "cat"], "en", "ru", rate_limit=0)
+
+    assert [item["translated"] for item in result["translations"]] == ["CAT", "DOG", "CAT"]
+    assert translator.calls == ["cat\ndog"]
+    assert result["chunks"] == 1
+
+
+class FakeGoogletrans:
+    """Stands in for the googletrans module, counting the clients it creates"""
+
+    LANGUAGES = {"en": "english", "uk": "ukrainian"}
+
+    def __init__(self):
+        self.clients = []
+        module = self
+
+        class Translator:
+            def __init__(self, **options):
+                self.client = SimpleNamespace(closed=False, close=lambda: setattr(self.client, "closed", True))
+                module.clients.append(self)
+
+            def translate(self, text, src, dest):
+                return SimpleNamespace(text=f"{dest}:{text}")
+
+        self.Translator = Translator
+
+
+def test_requests_share_one_translator_client_until_shutdown(base_url, monkeypatch):
+    fake = FakeGoogletrans()
+    monkeypatch.setattr(translation_service, "googletrans", fake)
+    monkeypatch.setattr(translation_service, "_shared_service", None)
+
+    for text in ("shared client one", "shared client two"):
+        response = requests.post(f"{base_url}/translate/", json={"text": text, "source_lang": "en", "target_lang": "uk"})
+        assert response.json()["translated"] == f"uk:{text}"
+    [client] = fake.clients
+
+    # What the application's shutdown does once the server stops
+    monkeypatch.setattr(main, "job_manager", SimpleNamespace(start=lambda: None, stop=lambda: None))
+    monkeypatch.setattr(main, "shutdown_executor", lambda: None)
+    monkeypatch.setattr(main, "http_client", SimpleNamespace(close=lambda: None))
+
+    async def run_lifespan():
+        async with main.lifespan(main.app):
+            pass
+
+    asyncio.run(run_lifespan())
+    assert client.client.closed
+    assert translation_service._shared_service is None
+    # A later request gets a new client
+    assert translation_service.get_shared_translation_service().translator is not client
+
+
+def test_a_failed_chunk_is_reported_without_waiting_for_the_rest(monkeypatch):
+    monkeypatch.setattr(translation_service, "TRANSCRIPT_CHUNK_RETRIES", 0)
+
+    class FailingTranslator:
+        def __init__(self):
+            self.calls = 0
+
+        def translate(self, text, src, dest):
+            self.calls += 1
+            if text.startswith("0 "):
+                raise ValueError("quota exceeded")
+            time.sleep(0.2)
+            return SimpleNamespace(text=text)
+
+    translator = FailingTranslator()
+    service = make_service(translator)
+    # One chunk per segment
+    segments = [f"{n} " + "word " * 900 + "." for n in range(10)]
+
+    started = time.perf_counter()
+    with pytest.raises(HTTPException) as info:
+        service.translate_transcript(" ".join(segments), "en", "uk", parallelism=2, rate_limit=0)
+    assert time.perf_counter() - started < 0.5
+    assert "quota exceeded" in info.value.detail
+    # Only the chunks already running were sent; the queued ones were dropped
+    time.sleep(0.3)
+    assert translator.calls <= 3
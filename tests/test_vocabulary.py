@@ -0,0 +1,78 @@
+import pytest
+
+from app.services import vocabulary
+from app.services.vocabulary import FrequencyTable, analyze, has_frequency_table, key_phrases, tokenize
+
+COMMON = "the a of and to in is it that you i we this for on with be are was so what".split()
+TEXT = (
+    "So the neural network is deep. We train the neural network with gradient descent, "
+    "and gradient descent is what you learn. I think so. Deep neural networks learn."
+)
+
+
+@pytest.fixture
+def table(tmp_path):
+    counts = {word: 10**9 // (rank + 2) for rank, word in enumerate(COMMON)}
+    counts.update(
+        {"neural": 5000, "network": 40000, "networks": 20000, "gradient": 3000, "learn": 100000, "deep": 150000}
+    )
+    return FrequencyTable.build(counts, str(tmp_path / "en"), total=10**9)
+
+
+def test_tokenize():
+    assert tokenize("Don’t stop: 3 times, l'homme!") == ["don't", "stop", "times", "l'homme"]
+
+
+def test_lookup(table):
+    words = ["neural", "unknown", "the", "x" * 40]
+    zipf = table.lookup(vocabulary.np.array(words), vocabulary.np.array([len(word) for word in words]))
+    assert zipf[0] == pytest.approx(3.7, abs=0.01)
+    assert zipf[1] != zipf[1] and zipf[3] != zipf[3]
+    assert zipf[2] > 8
+
+
+def test_words_are_ranked_by_keyness(table):
+    result = analyze(TEXT, table, phrase_limit=0)
+    assert [entry["word"] for entry in result["words"]] == ["neural", "gradient", "network"]
+    assert result["words"][0]["count"] == 3
+    assert result["phrases"] == []
+
+    unknown = analyze(TEXT, table, include_unknown=True, phrase_limit=0)
+    assert [entry["word"] for entry in unknown["words"]] == ["neural", "gradient", "descent", "network"]
+    assert unknown["words"][2]["zipf"] is None
+
+
+def test_key_phrases(table):
+    phrases = key_phrases(TEXT, table, include_unknown=True)
+    assert [(entry["phrase"], entry["count"]) for entry in phrases] == [
+        ("neural network", 2),
+        ("gradient descent", 2),
+    ]
+    # "descent" is not in the table, but "gradient" qualifies the phrase
+    assert [entry["phrase"] for entry in key_phrases(TEXT, table)] == ["neural network", "gradient descent"]
+    # "deep neural networks learn" is longer than MAX_PHRASE_WORDS
+    assert [entry["phrase"] for entry in key_phrases(TEXT, table, min_count=1)] == [
+        "neural network",
+        "gradient descent",
+    ]
+
+
+def test_phrases_of_common_words_are_left_out(table):
+    text = "deep learn. deep learn. neural learn. neural learn."
+    assert [entry["phrase"] for entry in key_phrases(text, table)] == ["neural learn"]
+
+
+def test_phrases_end_at_punctuation_and_common_words(table):
+    text = "neural, network. neural network! deep; learn"
+    assert [entry["phrase"] for entry in key_phrases(text, table, min_count=1)] == ["neural network"]
+
+
+def test_analyze_includes_phrases(table):
+    assert [entry["phrase"] for entry in analyze(TEXT, table)["phrases"]] == ["neural network", "gradient descent"]
+
+
+def test_has_frequency_table(table, tmp_path, monkeypatch):
+    monkeypatch.setattr(vocabulary, "VOCABULARY_TABLES_DIR", str(tmp_path))
+    assert has_frequency_table("en")
+    assert has_frequency_table("en-GB")
+    assert not has_frequency_table("uk")